@@ -0,0 +1,33 @@
+"""agent inventory_updated_at
+
+Revision ID: 3c1f0a7d2b61
+Revises: 
+Create Date: 2026-10-19 04:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3c1f0a7d2b61'
+down_revision: Union[str, None] = None
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # New tables come from init_db's create_all; migrations only change
+    # tables that already exist, so a fresh database has nothing to do.
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('agent'):
+        return
+    columns = {column['name'] for column in inspector.get_columns('agent')}
+    if 'inventory_updated_at' not in columns:
+        op.add_column('agent', sa.Column('inventory_updated_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('agent', 'inventory_updated_at')
@@ -0,0 +1,51 @@
+"""asset reconciliation columns
+
+Revision ID: 8e4b9d25f0c3
+Revises: 3c1f0a7d2b61
+Create Date: 2026-10-19 04:10:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8e4b9d25f0c3'
+down_revision: Union[str, None] = '3c1f0a7d2b61'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('asset'):
+        return
+
+    asset_columns = {column['name'] for column in inspector.get_columns('asset')}
+    if 'hostname' not in asset_columns:
+        op.add_column('asset', sa.Column('hostname', sa.String(), nullable=True))
+        op.create_index('ix_asset_hostname', 'asset', ['hostname'])
+    if 'mac_address' not in asset_columns:
+        op.add_column('asset', sa.Column('mac_address', sa.String(), nullable=True))
+        op.create_index('ix_asset_mac_address', 'asset', ['mac_address'])
+
+    agent_columns = {column['name'] for column in inspector.get_columns('agent')}
+    if 'asset_id' not in agent_columns:
+        op.add_column('agent', sa.Column('asset_id', sa.Integer(), nullable=True))
+        op.create_foreign_key(
+            'agent_asset_id_fkey', 'agent', 'asset', ['asset_id'], ['id'], ondelete='SET NULL'
+        )
+    if 'asset_reconciled_at' not in agent_columns:
+        op.add_column('agent', sa.Column('asset_reconciled_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('agent', 'asset_reconciled_at')
+    op.drop_constraint('agent_asset_id_fkey', 'agent', type_='foreignkey')
+    op.drop_column('agent', 'asset_id')
+    op.drop_index('ix_asset_mac_address', table_name='asset')
+    op.drop_column('asset', 'mac_address')
+    op.drop_index('ix_asset_hostname', table_name='asset')
+    op.drop_column('asset', 'hostname')
@@ -0,0 +1,33 @@
+"""agent inventory_data jsonb
+
+Revision ID: 5a7c3e91d4b8
+Revises: 8e4b9d25f0c3
+Create Date: 2026-10-19 04:20:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5a7c3e91d4b8'
+down_revision: Union[str, None] = '8e4b9d25f0c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('agent'):
+        return
+    column = next(c for c in inspector.get_columns('agent') if c['name'] == 'inventory_data')
+    if not isinstance(column['type'], postgresql.JSONB):
+        # Rewrites the table; run it in a maintenance window on large fleets
+        op.execute('ALTER TABLE agent ALTER COLUMN inventory_data TYPE jsonb USING inventory_data::jsonb')
+
+
+def downgrade() -> None:
+    op.execute('ALTER TABLE agent ALTER COLUMN inventory_data TYPE json USING inventory_data::json')
@@ -0,0 +1,31 @@
+"""agent command token
+
+Revision ID: d9e2f6a1c7b4
+Revises: 5a7c3e91d4b8
+Create Date: 2026-10-19 04:30:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd9e2f6a1c7b4'
+down_revision: Union[str, None] = '5a7c3e91d4b8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('agent'):
+        return
+    columns = {column['name'] for column in inspector.get_columns('agent')}
+    if 'command_token_hash' not in columns:
+        op.add_column('agent', sa.Column('command_token_hash', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('agent', 'command_token_hash')
@@ -0,0 +1,36 @@
+"""id updated_at indexes
+
+Revision ID: 7b3d5f8e2a90
+Revises: d9e2f6a1c7b4
+Create Date: 2026-10-19 04:40:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b3d5f8e2a90'
+down_revision: Union[str, None] = 'd9e2f6a1c7b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# (id, updated_at) indexes that let list ETags be answered index-only
+TABLES = ('asset', 'ticket', 'site')
+
+
+def upgrade() -> None:
+    inspector = sa.inspect(op.get_bind())
+    for table in TABLES:
+        if not inspector.has_table(table):
+            continue
+        indexes = {index['name'] for index in inspector.get_indexes(table)}
+        if f'ix_{table}_id_updated_at' not in indexes:
+            op.create_index(f'ix_{table}_id_updated_at', table, ['id', 'updated_at'])
+
+
+def downgrade() -> None:
+    for table in reversed(TABLES):
+        op.drop_index(f'ix_{table}_id_updated_at', table_name=table)
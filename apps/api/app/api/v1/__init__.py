@@ -1 +1,15 @@
 # API v1 routes
+
+from fastapi import APIRouter
+
+from app.api.v1 import agents, assets, auth, jobs, profiling, sites, tickets, users
+
+api_router = APIRouter()
+api_router.include_router(auth.router, prefix="/auth", tags=["auth"])
+api_router.include_router(users.router, prefix="/users", tags=["users"])
+api_router.include_router(assets.router, prefix="/assets", tags=["assets"])
+api_router.include_router(tickets.router, prefix="/tickets", tags=["tickets"])
+api_router.include_router(sites.router, prefix="/sites", tags=["sites"])
+api_router.include_router(agents.router, prefix="/agents", tags=["agents"])
+api_router.include_router(jobs.router, prefix="/jobs", tags=["jobs"])
+api_router.include_router(profiling.router, prefix="/admin/profile", tags=["profiling"])
@@ -2,15 +2,33 @@
 Agent Communication Endpoints
 """
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+import asyncio
+import json
+from typing import List, Optional
+from fastapi import (
+    APIRouter,
+    Depends,
+    HTTPException,
+    status,
+    Query,
+    Request,
+    WebSocket,
+    WebSocketDisconnect,
+)
+from sqlalchemy import update
+from sqlalchemy.orm import defer
 from sqlmodel import Session, select
 from slowapi import Limiter
 from slowapi.util import get_remote_address
+import structlog
 
-from app.core.database import get_session
+from app.core.content import negotiated_body, negotiated_openapi, negotiated_response
+from app.core.database import get_session, pool_saturation
+from app.core.metrics import AGENT_INGEST
 from app.core.dependencies import get_current_user, create_audit_log
 from app.core.permissions import Permission, has_permission
+from app.core.responses import projected_response
+from app.core.singleflight import coalesce, flight_key
 from app.core.config import settings
 from app.models.agent import (
     Agent,
@@ -20,13 +38,58 @@ from app.models.agent import (
     AgentHeartbeat,
     AgentInventory,
     AgentStatus,
+    AgentCommandCreate,
+    AgentCommandBroadcast,
+    AgentCommandResult,
+    AgentCommandResponse,
+    AgentCommandBroadcastResponse,
+    AgentCommandTokenResponse,
+)
+from app.models.fleet_counter import FleetSummaryResponse
+from app.models.inventory import (
+    AgentInventoryResponse,
+    AgentSoftware,
+    AgentSoftwareResponse,
+    InventoryVersion,
+    InventoryVersionSection,
+    InventoryVersionResponse,
+    InventoryDiffResponse,
 )
 from app.models.user import User
 from app.models.audit_log import AuditAction
+from app.services.inventory import (
+    normalize_software_name,
+    project_inventory,
+    version_sort_key,
+)
+from app.services.agent_channel import agent_channel_hub
+from app.services.agent_credentials import (
+    AGENT_TOKEN_HEADER,
+    issue_command_token,
+    verify_command_token,
+)
+from app.services.fleet_registry import (
+    fleet_registry,
+    resolve_agent,
+    resolve_agent_detached,
+)
+from app.services.fleet_summary import apply_deltas, read_summary, transition_deltas
+from app.services.heartbeat_pacing import HeartbeatPacer
+from app.services.inventory_query import read_inventory
+from app.services.inventory_history import (
+    record_inventory_version,
+    diff_inventory_versions,
+)
 from datetime import datetime
 
+logger = structlog.get_logger()
 router = APIRouter()
 limiter = Limiter(key_func=get_remote_address)
+heartbeat_pacer = HeartbeatPacer(
+    base_interval=settings.AGENT_HEARTBEAT_INTERVAL,
+    max_interval=settings.AGENT_HEARTBEAT_MAX_INTERVAL,
+    ingest_ceiling=settings.AGENT_INGEST_MAX_PER_SECOND,
+)
 
 
 @router.get("", response_model=List[AgentResponse])
@@ -43,76 +106,388 @@ async def list_agents(
             detail="Permission denied",
         )
     
-    statement = select(Agent).offset(skip).limit(limit)
+    statement = (
+        select(Agent)
+        .options(defer(Agent.inventory_data))
+        .offset(skip)
+        .limit(limit)
+    )
     agents = session.exec(statement).all()
-    return agents
+    return projected_response(AgentResponse, agents)
 
 
-@router.post("/heartbeat")
+@router.post("/heartbeat", openapi_extra=negotiated_openapi(AgentHeartbeat))
 @limiter.limit("300/minute")  # Allow more frequent heartbeats
 async def agent_heartbeat(
-    heartbeat_data: AgentHeartbeat,
     request: Request,
+    heartbeat_data: AgentHeartbeat = Depends(negotiated_body(AgentHeartbeat)),
     session: Session = Depends(get_session),
 ):
-    """Agent heartbeat endpoint (no authentication required for agents)."""
-    # Find or create agent
-    statement = select(Agent).where(Agent.hostname == heartbeat_data.hostname)
-    agent = session.exec(statement).first()
+    """Agent heartbeat endpoint (no authentication required for agents).
     
-    if not agent:
-        # Create new agent
-        agent = Agent(
-            name=heartbeat_data.hostname,
-            hostname=heartbeat_data.hostname,
-            os_type=heartbeat_data.os_type,
-            os_version=heartbeat_data.os_version,
-            ip_address=heartbeat_data.ip_address or request.client.host if request.client else None,
-            status=AgentStatus.ONLINE,
-            last_heartbeat=datetime.utcnow(),
-        )
-        session.add(agent)
-    else:
-        # Update existing agent
-        agent.os_type = heartbeat_data.os_type
-        agent.os_version = heartbeat_data.os_version or agent.os_version
-        agent.ip_address = heartbeat_data.ip_address or request.client.host if request.client else agent.ip_address
-        agent.status = AgentStatus.ONLINE
-        agent.last_heartbeat = datetime.utcnow()
-        agent.updated_at = datetime.utcnow()
+    The response tells the agent when to report next (``next_heartbeat_in``)
+    and how much random spread to add when reconnecting (``jitter``). The
+    heartbeat that registers an agent also returns its ``command_token``,
+    needed to receive commands; it is not returned again.
+    Accepts and returns JSON, MessagePack or CBOR.
+    """
+    AGENT_INGEST.labels("heartbeat").inc()
+    now = datetime.utcnow()
+    ip_address = heartbeat_data.ip_address or (request.client.host if request.client else None)
     
+    # Resolve agent from the fleet registry
+    entry = resolve_agent(session, heartbeat_data.hostname)
+    
+    if entry:
+        # Update existing agent without loading it
+        values = {
+            "os_type": heartbeat_data.os_type,
+            "status": AgentStatus.ONLINE,
+            "last_heartbeat": now,
+            "updated_at": now,
+        }
+        if heartbeat_data.os_version:
+            values["os_version"] = heartbeat_data.os_version
+        if ip_address:
+            values["ip_address"] = ip_address
+        
+        # The previous values come back from the same statement so the
+        # fleet counters see the real transition; the row lock makes a
+        # concurrent heartbeat wait and then read this one's values rather
+        # than applying the same transition again
+        previous = (
+            select(Agent.id, Agent.status, Agent.os_type)
+            .where(Agent.id == entry.agent_id)
+            .with_for_update()
+            .subquery()
+        )
+        row = session.execute(
+            update(Agent)
+            .where(Agent.id == previous.c.id)
+            .values(**values)
+            .returning(previous.c.status, previous.c.os_type, Agent.site_id)
+        ).first()
+        if row:
+            previous_status, previous_os_type, site_id = row
+            apply_deltas(session, transition_deltas(
+                (previous_status, previous_os_type, site_id),
+                (AgentStatus.ONLINE, heartbeat_data.os_type, site_id),
+            ))
+            session.commit()
+            fleet_registry.upsert(
+                entry.agent_id,
+                entry.hostname,
+                AgentStatus.ONLINE,
+                heartbeat_data.os_type,
+                site_id,
+            )
+            logger.info("Agent heartbeat", agent_id=entry.agent_id, hostname=entry.hostname)
+            return negotiated_response(request, {
+                "status": "ok",
+                "agent_id": entry.agent_id,
+                **heartbeat_pacer.schedule(len(fleet_registry), pool_saturation()),
+            })
+        
+        # Agent was removed since it was cached
+        fleet_registry.discard(heartbeat_data.hostname)
+    
+    # Create new agent
+    agent = Agent(
+        name=heartbeat_data.hostname,
+        hostname=heartbeat_data.hostname,
+        os_type=heartbeat_data.os_type,
+        os_version=heartbeat_data.os_version,
+        ip_address=ip_address,
+        status=AgentStatus.ONLINE,
+        last_heartbeat=now,
+    )
+    command_token = issue_command_token(session, agent)
+    session.flush()
+    agent_id = agent.id
+    apply_deltas(session, transition_deltas(
+        None, (AgentStatus.ONLINE, heartbeat_data.os_type, None)
+    ))
     session.commit()
-    session.refresh(agent)
     
-    return {"status": "ok", "agent_id": agent.id}
+    fleet_registry.upsert(agent_id, heartbeat_data.hostname, AgentStatus.ONLINE, heartbeat_data.os_type)
+    logger.info("Agent registered", agent_id=agent_id, hostname=heartbeat_data.hostname)
+    
+    return negotiated_response(request, {
+        "status": "ok",
+        "agent_id": agent_id,
+        "command_token": command_token,
+        **heartbeat_pacer.schedule(len(fleet_registry), pool_saturation()),
+    })
 
 
-@router.post("/inventory")
+@router.post("/inventory", openapi_extra=negotiated_openapi(AgentInventory))
 @limiter.limit("10/minute")  # Limit inventory submissions
 async def agent_inventory(
-    inventory_data: AgentInventory,
     request: Request,
+    inventory_data: AgentInventory = Depends(negotiated_body(AgentInventory)),
     session: Session = Depends(get_session),
 ):
-    """Agent inventory submission endpoint (no authentication required for agents)."""
-    # Find agent
-    statement = select(Agent).where(Agent.hostname == inventory_data.hostname)
-    agent = session.exec(statement).first()
+    """Agent inventory submission endpoint (no authentication required for agents).
     
-    if not agent:
+    Accepts and returns JSON, MessagePack or CBOR.
+    """
+    # Resolve agent from the fleet registry
+    entry = resolve_agent(session, inventory_data.hostname)
+    
+    if not entry:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Agent not found. Please send heartbeat first.",
         )
     
+    AGENT_INGEST.labels("inventory").inc()
+    
     # Update inventory
-    agent.inventory_data = inventory_data.inventory
-    agent.updated_at = datetime.utcnow()
+    now = datetime.utcnow()
+    values = {"inventory_data": inventory_data.inventory, "updated_at": now}
     
-    session.add(agent)
-    session.commit()
+    # Project into normalized tables (only changed rows are written)
+    if project_inventory(session, entry.agent_id, inventory_data.inventory):
+        values["inventory_updated_at"] = now
+    
+    # Keep a deduplicated history of snapshots
+    record_inventory_version(session, entry.agent_id, inventory_data.inventory)
+    
+    session.execute(update(Agent).where(Agent.id == entry.agent_id).values(**values))
+    
+    return negotiated_response(request, {"status": "ok", "message": "Inventory updated"})
+
+
+@router.get("/summary", response_model=FleetSummaryResponse)
+async def fleet_summary(
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """Agent counts by status, OS type and site (requires AGENT_VIEW permission)."""
+    if not has_permission(current_user, Permission.AGENT_VIEW):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Permission denied",
+        )
+    
+    return await coalesce(request, session, flight_key(request, current_user), read_summary)
+
+
+@router.get("/software", response_model=List[AgentSoftwareResponse])
+async def query_software(
+    name: str = Query(..., min_length=1),
+    version: Optional[str] = Query(None, description="Exact version match"),
+    version_gte: Optional[str] = Query(None, description="Minimum version (inclusive)"),
+    version_lt: Optional[str] = Query(None, description="Maximum version (exclusive)"),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(1000, ge=1, le=10000),
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """Find agents with a software product installed (requires AGENT_VIEW permission)."""
+    if not has_permission(current_user, Permission.AGENT_VIEW):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Permission denied",
+        )
+    
+    statement = (
+        select(Agent.id.label("agent_id"), Agent.hostname, AgentSoftware.name, AgentSoftware.version)
+        .join(Agent, Agent.id == AgentSoftware.agent_id)
+        .where(AgentSoftware.name == normalize_software_name(name))
+    )
+    if version is not None:
+        statement = statement.where(AgentSoftware.version == version)
+    if version_gte is not None:
+        statement = statement.where(AgentSoftware.version_key >= version_sort_key(version_gte))
+    if version_lt is not None:
+        statement = statement.where(AgentSoftware.version_key < version_sort_key(version_lt))
+    statement = statement.order_by(AgentSoftware.agent_id).offset(skip).limit(limit)
+    
+    return projected_response(AgentSoftwareResponse, session.exec(statement).all())
+
+
+async def _receive_results(websocket: WebSocket, agent_id: int):
+    """Read results and pings sent by an agent until it disconnects.
+    
+    Frames may be text or binary JSON; anything that is not a JSON object
+    is ignored.
+    """
+    while True:
+        frame = await websocket.receive()
+        if frame["type"] == "websocket.disconnect":
+            return
+        try:
+            message = json.loads(frame.get("text") or frame.get("bytes") or b"")
+        except ValueError:
+            continue
+        if not isinstance(message, dict):
+            continue
+        
+        if message.get("type") == "result":
+            agent_channel_hub.complete(
+                message.get("id"), agent_id, message.get("status", "ok"), message.get("result")
+            )
+        elif message.get("type") == "ping":
+            await websocket.send_json({"type": "pong"})
+
+
+@router.websocket("/channel")
+async def agent_channel(
+    websocket: WebSocket,
+    hostname: str = Query(...),
+):
+    """Agent command channel (requires the agent's ``X-Agent-Token``).
+    
+    The server sends ``{"type": "command", "id", "action", "payload"}``;
+    the agent answers with ``{"type": "result", "id", "status", "result"}``
+    and should send ``{"type": "ping"}`` at least every 50 seconds.
+    """
+    entry = resolve_agent_detached(hostname)
+    if not entry:
+        await websocket.close(code=4404, reason="Agent not found. Please send heartbeat first.")
+        return
+    if not verify_command_token(entry.agent_id, websocket.headers.get(AGENT_TOKEN_HEADER)):
+        await websocket.close(code=4401, reason="Invalid agent token")
+        return
+    
+    await websocket.accept()
+    queue = agent_channel_hub.connect(entry.agent_id)
+    receiver = asyncio.create_task(_receive_results(websocket, entry.agent_id))
+    getter = None
+    try:
+        while True:
+            getter = asyncio.create_task(queue.get())
+            done, _ = await asyncio.wait(
+                {getter, receiver}, return_when=asyncio.FIRST_COMPLETED
+            )
+            if getter not in done:
+                break
+            command = getter.result()
+            agent_channel_hub.mark_delivered(command["id"])
+            await websocket.send_json({"type": "command", **command})
+            if receiver in done:
+                break
+    except WebSocketDisconnect:
+        pass
+    finally:
+        if getter and not getter.done():
+            getter.cancel()
+        receiver.cancel()
+        agent_channel_hub.disconnect(entry.agent_id)
+
+
+@router.get("/commands/poll")
+async def poll_commands(
+    request: Request,
+    hostname: str = Query(...),
+    timeout: int = Query(25, ge=0, le=50),
+):
+    """Long-poll fallback for the command channel (requires the agent's ``X-Agent-Token``)."""
+    entry = resolve_agent_detached(hostname)
+    if not entry:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Agent not found. Please send heartbeat first.",
+        )
+    if not verify_command_token(entry.agent_id, request.headers.get(AGENT_TOKEN_HEADER)):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid agent token",
+        )
+    
+    commands = await agent_channel_hub.poll(entry.agent_id, timeout)
+    return {"commands": commands}
+
+
+@router.post("/commands/{command_id}/result")
+@limiter.limit("300/minute")
+async def submit_command_result(
+    command_id: str,
+    result_data: AgentCommandResult,
+    request: Request,
+):
+    """Command result submission for long-polling agents (requires the agent's ``X-Agent-Token``)."""
+    entry = resolve_agent_detached(result_data.hostname)
+    if entry and not verify_command_token(entry.agent_id, request.headers.get(AGENT_TOKEN_HEADER)):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid agent token",
+        )
+    if not entry or not agent_channel_hub.complete(
+        command_id, entry.agent_id, result_data.status, result_data.result
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Command not found",
+        )
     
-    return {"status": "ok", "message": "Inventory updated"}
+    return {"status": "ok"}
+
+
+@router.post("/commands/broadcast", response_model=AgentCommandBroadcastResponse)
+async def broadcast_command(
+    command_data: AgentCommandBroadcast,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """Send a command to many agents (requires AGENT_MANAGE permission)."""
+    if not has_permission(current_user, Permission.AGENT_MANAGE):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Permission denied",
+        )
+    
+    if command_data.agent_ids is not None:
+        agent_ids = command_data.agent_ids
+    else:
+        agent_ids = fleet_registry.agent_ids(site_id=command_data.site_id)
+    
+    command_ids, skipped = agent_channel_hub.fan_out(
+        agent_ids, command_data.action, command_data.payload
+    )
+    
+    # Audit log
+    create_audit_log(
+        session,
+        current_user.id,
+        AuditAction.CREATE,
+        "agent_command",
+        None,
+        f"Broadcast command {command_data.action} to {len(command_ids)} agents",
+        request.client.host if request.client else None,
+        request.headers.get("user-agent"),
+    )
+    
+    return AgentCommandBroadcastResponse(
+        dispatched=len(command_ids),
+        skipped=skipped,
+        command_ids=command_ids,
+    )
+
+
+@router.get("/commands/{command_id}", response_model=AgentCommandResponse)
+async def get_command(
+    command_id: str,
+    current_user: User = Depends(get_current_user),
+):
+    """Get command status and result (requires AGENT_VIEW permission)."""
+    if not has_permission(current_user, Permission.AGENT_VIEW):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Permission denied",
+        )
+    
+    command = agent_channel_hub.get(command_id)
+    if not command:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Command not found",
+        )
+    
+    return command
 
 
 @router.get("/{agent_id}", response_model=AgentResponse)
@@ -128,7 +503,7 @@ async def get_agent(
             detail="Permission denied",
         )
     
-    agent = session.get(Agent, agent_id)
+    agent = session.get(Agent, agent_id, options=[defer(Agent.inventory_data)])
     if not agent:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -153,7 +528,7 @@ async def update_agent(
             detail="Permission denied",
         )
     
-    agent = session.get(Agent, agent_id)
+    agent = session.get(Agent, agent_id, options=[defer(Agent.inventory_data)])
     if not agent:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
@@ -161,15 +536,14 @@ async def update_agent(
         )
     
     # Update fields
+    before = (agent.status, agent.os_type, agent.site_id)
     update_data = agent_data.dict(exclude_unset=True)
     for field, value in update_data.items():
         setattr(agent, field, value)
     
     agent.updated_at = datetime.utcnow()
     
-    session.add(agent)
-    session.commit()
-    session.refresh(agent)
+    apply_deltas(session, transition_deltas(before, (agent.status, agent.os_type, agent.site_id)))
     
     # Audit log
     create_audit_log(
@@ -183,5 +557,200 @@ async def update_agent(
         request.headers.get("user-agent"),
     )
     
+    # Commit before the registry sees the change
+    session.commit()
+    fleet_registry.upsert(agent.id, agent.hostname, agent.status, agent.os_type, agent.site_id)
+    
     return agent
 
+
+
+@router.get("/{agent_id}/inventory", response_model=AgentInventoryResponse)
+async def get_agent_inventory(
+    agent_id: int,
+    path: Optional[List[str]] = Query(
+        None,
+        description="Dotted path to return, e.g. software.*.name; repeatable",
+    ),
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """Get an agent's inventory or selected paths of it (requires AGENT_VIEW permission)."""
+    if not has_permission(current_user, Permission.AGENT_VIEW):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Permission denied",
+        )
+    
+    if path and len(path) > 20:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Too many paths requested",
+        )
+    
+    try:
+        inventory = read_inventory(session, agent_id, path)
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e),
+        )
+    
+    if inventory is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Agent not found",
+        )
+    
+    return inventory
+
+
+@router.get("/{agent_id}/inventory/history", response_model=List[InventoryVersionResponse])
+async def list_inventory_versions(
+    agent_id: int,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """List recorded inventory versions, newest first (requires AGENT_VIEW permission)."""
+    if not has_permission(current_user, Permission.AGENT_VIEW):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Permission denied",
+        )
+    
+    statement = (
+        select(InventoryVersion)
+        .where(InventoryVersion.agent_id == agent_id)
+        .order_by(InventoryVersion.version.desc())
+        .offset(skip)
+        .limit(limit)
+    )
+    versions = session.exec(statement).all()
+    
+    sections = {}
+    if versions:
+        section_statement = select(
+            InventoryVersionSection.version_id, InventoryVersionSection.section
+        ).where(InventoryVersionSection.version_id.in_([v.id for v in versions]))
+        for version_id, section in session.exec(section_statement).all():
+            sections.setdefault(version_id, []).append(section)
+    
+    return [
+        InventoryVersionResponse(
+            version=v.version,
+            created_at=v.created_at,
+            sections=sorted(sections.get(v.id, [])),
+        )
+        for v in versions
+    ]
+
+
+@router.get("/{agent_id}/inventory/diff", response_model=InventoryDiffResponse)
+async def diff_inventory(
+    agent_id: int,
+    from_version: int = Query(..., ge=1),
+    to_version: int = Query(..., ge=1),
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """Diff two inventory versions (requires AGENT_VIEW permission)."""
+    if not has_permission(current_user, Permission.AGENT_VIEW):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Permission denied",
+        )
+    
+    diff = diff_inventory_versions(session, agent_id, from_version, to_version)
+    if diff is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Inventory version not found",
+        )
+    
+    return diff
+
+
+@router.post("/{agent_id}/commands", response_model=AgentCommandResponse)
+async def send_command(
+    agent_id: int,
+    command_data: AgentCommandCreate,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """Send a command to an agent (requires AGENT_MANAGE permission)."""
+    if not has_permission(current_user, Permission.AGENT_MANAGE):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Permission denied",
+        )
+    
+    if not session.exec(select(Agent.id).where(Agent.id == agent_id)).first():
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Agent not found",
+        )
+    
+    try:
+        command = agent_channel_hub.dispatch(agent_id, command_data.action, command_data.payload)
+    except asyncio.QueueFull:
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail="Too many pending commands for agent",
+        )
+    
+    # Audit log
+    create_audit_log(
+        session,
+        current_user.id,
+        AuditAction.CREATE,
+        "agent_command",
+        agent_id,
+        f"Sent command {command_data.action} to agent {agent_id}",
+        request.client.host if request.client else None,
+        request.headers.get("user-agent"),
+    )
+    
+    return command
+
+
+@router.post("/{agent_id}/command-token", response_model=AgentCommandTokenResponse)
+async def reissue_command_token(
+    agent_id: int,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """Issue a new command token for an agent, revoking the old one (requires AGENT_MANAGE permission)."""
+    if not has_permission(current_user, Permission.AGENT_MANAGE):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Permission denied",
+        )
+    
+    agent = session.exec(
+        select(Agent).options(defer(Agent.inventory_data)).where(Agent.id == agent_id)
+    ).first()
+    if not agent:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Agent not found",
+        )
+    
+    command_token = issue_command_token(session, agent)
+    
+    # Audit log
+    create_audit_log(
+        session,
+        current_user.id,
+        AuditAction.UPDATE,
+        "agent",
+        agent_id,
+        f"Issued command token for agent {agent.hostname}",
+        request.client.host if request.client else None,
+        request.headers.get("user-agent"),
+    )
+    
+    return {"agent_id": agent_id, "command_token": command_token}
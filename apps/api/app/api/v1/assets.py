@@ -2,19 +2,79 @@
 Asset Management Endpoints
 """
 
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from typing import List, Optional
+import os
+from fastapi import (
+    APIRouter,
+    Depends,
+    File,
+    HTTPException,
+    Query,
+    Request,
+    Response,
+    UploadFile,
+    status,
+)
+from fastapi.responses import FileResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import delete
 from sqlmodel import Session, select
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
 from app.core.database import get_session
 from app.core.dependencies import get_current_user, create_audit_log
+from app.core.etags import (
+    check_if_match,
+    current_etag,
+    entity_etag,
+    if_match_lock,
+    not_modified,
+    page_etag,
+)
 from app.core.permissions import Permission, has_permission
+from app.core.response_cache import (
+    cache_response,
+    cached_response,
+    first_pages,
+    invalidate_after_commit,
+    response_key,
+)
+from app.core.responses import FastJSONResponse, projected_json
+from app.core.singleflight import coalesce, flight_key
 from app.core.config import settings
-from app.models.asset import Asset, AssetCreate, AssetUpdate, AssetResponse
+from app.models.asset import (
+    Asset,
+    AssetBulkUpdate,
+    AssetCreate,
+    AssetUpdate,
+    AssetResponse,
+    LicenseComplianceResponse,
+)
+from app.models.asset_import import AssetImport, AssetImportResponse
+from app.models.bulk import BulkDeleteRequest, BulkResponse
+from app.models.site import Site
+from app.models.ticket import Ticket
 from app.models.user import User
 from app.models.audit_log import AuditAction
+from app.services.asset_import import (
+    detect_format,
+    error_report_path,
+    save_upload,
+    upload_path,
+)
+from app.services.bulk_operations import (
+    add_audit_rows,
+    bulk_response,
+    check_batch,
+    find_duplicates,
+    insert_rows,
+    missing_references,
+    reject_invalid,
+    update_rows,
+)
+from app.services.jobs import enqueue
+from app.services.license_compliance import get_compliance_report
 from datetime import datetime
 
 router = APIRouter()
@@ -23,6 +83,7 @@ limiter = Limiter(key_func=get_remote_address)
 
 @router.get("", response_model=List[AssetResponse])
 async def list_assets(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     current_user: User = Depends(get_current_user),
@@ -35,9 +96,23 @@ async def list_assets(
             detail="Permission denied",
         )
     
-    statement = select(Asset).offset(skip).limit(limit)
-    assets = session.exec(statement).all()
-    return assets
+    cache_key = response_key(request, current_user, "assets") if first_pages(skip, limit) else None
+    hit = cached_response(request, cache_key)
+    if hit:
+        return hit
+    
+    statement = select(Asset).order_by(Asset.id).offset(skip).limit(limit)
+    etag = page_etag(session, statement)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    body = await coalesce(
+        request,
+        session,
+        flight_key(request, current_user, etag),
+        lambda flight_session: projected_json(AssetResponse, flight_session.exec(statement).all()),
+    )
+    return cache_response(cache_key, FastJSONResponse(body, headers={"ETag": etag}))
 
 
 @router.post("", response_model=AssetResponse)
@@ -60,8 +135,9 @@ async def create_asset(
         created_by_id=current_user.id,
     )
     session.add(asset)
-    session.commit()
-    session.refresh(asset)
+    session.flush()
+    
+    invalidate_after_commit(session, "assets")
     
     # Audit log
     create_audit_log(
@@ -78,9 +154,255 @@ async def create_asset(
     return asset
 
 
+@router.post("/bulk", response_model=BulkResponse)
+async def bulk_create_assets(
+    items: List[AssetCreate],
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """Create many assets in one transaction (requires ASSET_CREATE permission)."""
+    if not has_permission(current_user, Permission.ASSET_CREATE):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Permission denied",
+        )
+    
+    check_batch(current_user, items)
+    reject_invalid(missing_references(session, Site, [item.site_id for item in items], "Site"))
+    
+    now = datetime.utcnow()
+    asset_ids = insert_rows(session, Asset, [
+        {**item.dict(), "created_by_id": current_user.id, "created_at": now, "updated_at": now}
+        for item in items
+    ])
+    
+    invalidate_after_commit(session, "assets")
+    
+    # Audit log
+    add_audit_rows(session, request, current_user.id, AuditAction.CREATE, "asset", (
+        (asset_id, f"Created asset: {item.name}") for asset_id, item in zip(asset_ids, items)
+    ))
+    
+    return bulk_response(asset_ids, "created")
+
+
+@router.put("/bulk", response_model=BulkResponse)
+async def bulk_update_assets(
+    items: List[AssetBulkUpdate],
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """Update many assets in one transaction (requires ASSET_EDIT permission)."""
+    if not has_permission(current_user, Permission.ASSET_EDIT):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Permission denied",
+        )
+    
+    check_batch(current_user, items)
+    asset_ids = [item.id for item in items]
+    reject_invalid(
+        find_duplicates(asset_ids, "asset id")
+        + missing_references(session, Asset, asset_ids, "Asset")
+        + missing_references(session, Site, [item.site_id for item in items], "Site")
+    )
+    
+    names = dict(session.exec(select(Asset.id, Asset.name).where(Asset.id.in_(asset_ids))).all())
+    now = datetime.utcnow()
+    rows = []
+    for item in items:
+        changes = item.dict(exclude_unset=True, exclude={"id"})
+        rows.append({"id": item.id, **changes, "updated_at": now})
+        names[item.id] = changes.get("name") or names[item.id]
+    update_rows(session, Asset, rows)
+    
+    invalidate_after_commit(session, "assets")
+    
+    # Audit log
+    add_audit_rows(session, request, current_user.id, AuditAction.UPDATE, "asset", (
+        (asset_id, f"Updated asset: {names[asset_id]}") for asset_id in asset_ids
+    ))
+    
+    return bulk_response(asset_ids, "updated")
+
+
+@router.delete("/bulk", response_model=BulkResponse)
+async def bulk_delete_assets(
+    data: BulkDeleteRequest,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """Delete many assets in one transaction (requires ASSET_DELETE permission)."""
+    if not has_permission(current_user, Permission.ASSET_DELETE):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Permission denied",
+        )
+    
+    check_batch(current_user, data.ids)
+    names = dict(session.exec(select(Asset.id, Asset.name).where(Asset.id.in_(data.ids))).all())
+    referenced = set(session.exec(
+        select(Ticket.asset_id).where(Ticket.asset_id.in_(data.ids)).distinct()
+    ).all())
+    errors = find_duplicates(data.ids, "asset id")
+    for index, asset_id in enumerate(data.ids):
+        if asset_id not in names:
+            errors.append({"index": index, "error": f"Asset {asset_id} not found"})
+        elif asset_id in referenced:
+            errors.append({"index": index, "error": f"Asset {asset_id} is referenced by tickets"})
+    reject_invalid(errors)
+    
+    invalidate_after_commit(session, "assets")
+    
+    # Audit log
+    add_audit_rows(session, request, current_user.id, AuditAction.DELETE, "asset", (
+        (asset_id, f"Deleted asset: {names[asset_id]}") for asset_id in data.ids
+    ))
+    
+    session.execute(delete(Asset).where(Asset.id.in_(data.ids)))
+    
+    return bulk_response(data.ids, "deleted")
+
+
+@router.post("/import", response_model=AssetImportResponse, status_code=status.HTTP_202_ACCEPTED)
+@limiter.limit(f"{settings.RATE_LIMIT_PER_MINUTE}/minute")
+async def import_assets(
+    request: Request,
+    file: UploadFile = File(...),
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """Import assets from a CSV or XLSX file (requires ASSET_CREATE permission).
+
+    The file is processed by a background job; poll the returned import (or
+    its job) for progress and fetch the error report when done.
+    """
+    if not has_permission(current_user, Permission.ASSET_CREATE):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Permission denied",
+        )
+    
+    file_format = detect_format(file.filename)
+    if file_format is None:
+        raise HTTPException(
+            status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+            detail="Upload a .csv or .xlsx file",
+        )
+    
+    asset_import = AssetImport(
+        filename=os.path.basename(file.filename)[:255],
+        file_format=file_format,
+        created_by_id=current_user.id,
+    )
+    session.add(asset_import)
+    session.flush()
+    
+    # The form parser spooled the body (bounded by UploadSizeLimitMiddleware);
+    # copy it without blocking the event loop
+    size = await run_in_threadpool(save_upload, file.file, upload_path(asset_import.id, file_format))
+    if size is None:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File exceeds {settings.MAX_UPLOAD_SIZE} bytes",
+        )
+    asset_import.file_size = size
+    asset_import.job_id = enqueue(
+        session, "asset_import", {"asset_import_id": asset_import.id}, created_by_id=current_user.id
+    ).id
+    
+    # Audit log
+    create_audit_log(
+        session,
+        current_user.id,
+        AuditAction.CREATE,
+        "asset_import",
+        asset_import.id,
+        f"Uploaded asset import: {asset_import.filename}",
+        request.client.host if request.client else None,
+        request.headers.get("user-agent"),
+    )
+    
+    return asset_import
+
+
+@router.get("/imports/{import_id}", response_model=AssetImportResponse)
+async def get_asset_import(
+    import_id: int,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """Get asset import progress (requires ASSET_VIEW permission)."""
+    if not has_permission(current_user, Permission.ASSET_VIEW):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Permission denied",
+        )
+    
+    asset_import = session.get(AssetImport, import_id)
+    if not asset_import:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Asset import not found",
+        )
+    
+    return asset_import
+
+
+@router.get("/imports/{import_id}/errors")
+async def get_asset_import_errors(
+    import_id: int,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """Download the per-row error report of an import as CSV (requires ASSET_VIEW permission)."""
+    if not has_permission(current_user, Permission.ASSET_VIEW):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Permission denied",
+        )
+    
+    path = error_report_path(import_id)
+    if not session.get(AssetImport, import_id) or not os.path.exists(path):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Error report not found",
+        )
+    
+    return FileResponse(path, media_type="text/csv", filename=f"asset-import-{import_id}-errors.csv")
+
+
+@router.get("/licenses/compliance", response_model=LicenseComplianceResponse)
+async def license_compliance(
+    site_id: Optional[int] = Query(None),
+    noncompliant_only: bool = Query(False),
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """Software installs versus owned licenses per site (requires ASSET_VIEW permission)."""
+    if not has_permission(current_user, Permission.ASSET_VIEW):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Permission denied",
+        )
+    
+    report = await get_compliance_report(session)
+    items = [
+        item for item in report["items"]
+        if (site_id is None or item["site_id"] == site_id)
+        and not (noncompliant_only and item["compliant"])
+    ]
+    return {**report, "items": items}
+
+
 @router.get("/{asset_id}", response_model=AssetResponse)
 async def get_asset(
     asset_id: int,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session),
 ):
@@ -91,6 +413,12 @@ async def get_asset(
             detail="Permission denied",
         )
     
+    etag = current_etag(session, Asset, asset_id)
+    if etag is not None:
+        cached = not_modified(request, etag)
+        if cached:
+            return cached
+    
     asset = session.get(Asset, asset_id)
     if not asset:
         raise HTTPException(
@@ -98,6 +426,7 @@ async def get_asset(
             detail="Asset not found",
         )
     
+    response.headers["ETag"] = entity_etag(asset.id, asset.updated_at)
     return asset
 
 
@@ -106,6 +435,7 @@ async def update_asset(
     asset_id: int,
     asset_data: AssetUpdate,
     request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session),
 ):
@@ -116,12 +446,13 @@ async def update_asset(
             detail="Permission denied",
         )
     
-    asset = session.get(Asset, asset_id)
+    asset = session.get(Asset, asset_id, with_for_update=if_match_lock(request))
     if not asset:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Asset not found",
         )
+    check_if_match(request, entity_etag(asset.id, asset.updated_at))
     
     # Update fields
     update_data = asset_data.dict(exclude_unset=True)
@@ -129,10 +460,9 @@ async def update_asset(
         setattr(asset, field, value)
     
     asset.updated_at = datetime.utcnow()
+    response.headers["ETag"] = entity_etag(asset.id, asset.updated_at)
     
-    session.add(asset)
-    session.commit()
-    session.refresh(asset)
+    invalidate_after_commit(session, "assets")
     
     # Audit log
     create_audit_log(
@@ -170,6 +500,8 @@ async def delete_asset(
             detail="Asset not found",
         )
     
+    invalidate_after_commit(session, "assets")
+    
     # Audit log
     create_audit_log(
         session,
@@ -183,7 +515,6 @@ async def delete_asset(
     )
     
     session.delete(asset)
-    session.commit()
     
     return {"message": "Asset deleted successfully"}
 
@@ -68,7 +68,6 @@ async def login(
         user_agent=request.headers.get("user-agent"),
     )
     session.add(audit_log)
-    session.commit()
     
     # Create tokens
     token_data = {"sub": str(user.id), "email": user.email, "role": user.role.value}
@@ -153,7 +152,6 @@ async def logout(
         user_agent=request.headers.get("user-agent"),
     )
     session.add(audit_log)
-    session.commit()
     
     logger.info("User logged out", email=current_user.email, user_id=current_user.id)
     
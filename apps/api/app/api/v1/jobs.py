@@ -0,0 +1,134 @@
+"""
+Background Job Endpoints
+"""
+
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from sqlmodel import Session, select
+
+from app.core.database import get_session
+from app.core.dependencies import get_current_user, create_audit_log
+from app.core.permissions import Permission, has_permission
+from app.core.responses import projected_response
+from app.models.job import Job, JobCreate, JobResponse, JobStatus
+from app.models.user import User
+from app.models.audit_log import AuditAction
+from app.services.jobs import admin_job_kinds, cancel_job, enqueue
+
+router = APIRouter()
+
+
+def _get_visible_job(
+    session: Session,
+    job_id: int,
+    current_user: User,
+    for_update: bool = False,
+) -> Job:
+    job = session.get(Job, job_id, with_for_update=for_update)
+    if not job or (
+        job.created_by_id != current_user.id
+        and not has_permission(current_user, Permission.SYSTEM_ADMIN)
+    ):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Job not found",
+        )
+    return job
+
+
+@router.get("", response_model=List[JobResponse])
+async def list_jobs(
+    job_status: Optional[JobStatus] = Query(None, alias="status"),
+    kind: Optional[str] = Query(None),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100),
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """List jobs, newest first. Administrators see all jobs, others their own."""
+    statement = select(Job)
+    if not has_permission(current_user, Permission.SYSTEM_ADMIN):
+        statement = statement.where(Job.created_by_id == current_user.id)
+    if job_status is not None:
+        statement = statement.where(Job.status == job_status)
+    if kind is not None:
+        statement = statement.where(Job.kind == kind)
+    statement = statement.order_by(Job.id.desc()).offset(skip).limit(limit)
+    return projected_response(JobResponse, session.exec(statement).all())
+
+
+@router.post("", response_model=JobResponse, status_code=status.HTTP_202_ACCEPTED)
+async def create_job(
+    job_data: JobCreate,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """Start a maintenance job (requires SYSTEM_ADMIN permission)."""
+    if not has_permission(current_user, Permission.SYSTEM_ADMIN):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Permission denied",
+        )
+    
+    if job_data.kind not in admin_job_kinds():
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown job kind; expected one of: {', '.join(admin_job_kinds())}",
+        )
+    
+    job = enqueue(session, job_data.kind, job_data.payload, created_by_id=current_user.id)
+    
+    # Audit log
+    create_audit_log(
+        session,
+        current_user.id,
+        AuditAction.CREATE,
+        "job",
+        job.id,
+        f"Queued job: {job.kind}",
+        request.client.host if request.client else None,
+        request.headers.get("user-agent"),
+    )
+    
+    return job
+
+
+@router.get("/{job_id}", response_model=JobResponse)
+async def get_job(
+    job_id: int,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """Get job status and progress."""
+    return _get_visible_job(session, job_id, current_user)
+
+
+@router.post("/{job_id}/cancel", response_model=JobResponse)
+async def cancel(
+    job_id: int,
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """Cancel a job that has not started yet."""
+    job = _get_visible_job(session, job_id, current_user, for_update=True)
+    if not cancel_job(session, job):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Job is {job.status.value}",
+        )
+    
+    # Audit log
+    create_audit_log(
+        session,
+        current_user.id,
+        AuditAction.UPDATE,
+        "job",
+        job.id,
+        f"Cancelled job: {job.kind}",
+        request.client.host if request.client else None,
+        request.headers.get("user-agent"),
+    )
+    
+    return job
@@ -0,0 +1,153 @@
+"""
+Profiling Endpoints
+
+Profile the API process that serves the request. With several workers,
+repeat the request to reach the others (the ``pid`` field tells them apart).
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi.responses import PlainTextResponse
+from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.database import get_session
+from app.core.dependencies import get_current_user, create_audit_log
+from app.core.permissions import Permission, has_permission
+from app.models.audit_log import AuditAction
+from app.models.profiling import CpuProfileResponse, MemoryDiffResponse
+from app.models.user import User
+from app.services import profiling
+
+router = APIRouter()
+
+
+def require_system_admin(current_user: User = Depends(get_current_user)) -> User:
+    if not has_permission(current_user, Permission.SYSTEM_ADMIN):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Permission denied",
+        )
+    return current_user
+
+
+@router.get(
+    "/cpu",
+    response_model=CpuProfileResponse,
+    responses={200: {"content": {"text/plain": {}}}},
+)
+async def cpu_profile(
+    request: Request,
+    seconds: float = Query(10, gt=0, le=settings.PROFILE_MAX_SECONDS),
+    interval_ms: int = Query(settings.PROFILE_SAMPLE_INTERVAL_MS, ge=1, le=1000),
+    output: str = Query("collapsed", pattern="^(collapsed|json)$"),
+    include_idle: bool = Query(False),
+    current_user: User = Depends(require_system_admin),
+    session: Session = Depends(get_session),
+):
+    """Sample the stacks of all threads for ``seconds``.
+
+    ``collapsed`` output is one ``thread;frame;frame count`` line per stack,
+    ready for flamegraph.pl or speedscope. Threads waiting for work are
+    left out unless ``include_idle`` is set.
+    """
+    # Nothing written yet; don't hold a pooled connection idle in
+    # transaction for the whole sample
+    session.commit()
+    try:
+        profile = await run_in_threadpool(
+            profiling.sample_stacks, seconds, interval_ms / 1000, include_idle
+        )
+    except profiling.ProfilerBusy:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="A CPU profile is already running in this process",
+        )
+
+    # Audit log
+    create_audit_log(
+        session,
+        current_user.id,
+        AuditAction.EXPORT,
+        "profile",
+        None,
+        f"CPU profile of process {profile['pid']} ({profile['duration']}s)",
+        request.client.host if request.client else None,
+        request.headers.get("user-agent"),
+    )
+
+    if output == "collapsed":
+        return PlainTextResponse(
+            profiling.collapsed_text(profile["stacks"]),
+            headers={"X-Profile-Pid": str(profile["pid"])},
+        )
+    return profile
+
+
+@router.post("/memory/start", status_code=status.HTTP_204_NO_CONTENT)
+async def start_memory_profile(
+    request: Request,
+    frames: int = Query(10, ge=1, le=100),
+    current_user: User = Depends(require_system_admin),
+    session: Session = Depends(get_session),
+):
+    """Start tracing allocations and take the baseline snapshot.
+
+    Tracing slows allocations down noticeably; stop it when done.
+    """
+    await run_in_threadpool(profiling.start_memory_tracing, frames)
+
+    # Audit log
+    create_audit_log(
+        session,
+        current_user.id,
+        AuditAction.UPDATE,
+        "profile",
+        None,
+        "Started memory tracing",
+        request.client.host if request.client else None,
+        request.headers.get("user-agent"),
+    )
+
+
+@router.get("/memory", response_model=MemoryDiffResponse)
+async def memory_profile(
+    limit: int = Query(25, ge=1, le=500),
+    group_by: str = Query("lineno", pattern="^(lineno|filename|traceback)$"),
+    current_user: User = Depends(require_system_admin),
+):
+    """Allocation growth since the previous snapshot (or the start)."""
+    diff = await run_in_threadpool(profiling.memory_diff, limit, group_by)
+    if diff is None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Memory tracing is not running in this process",
+        )
+    return diff
+
+
+@router.post("/memory/stop", status_code=status.HTTP_204_NO_CONTENT)
+async def stop_memory_profile(
+    request: Request,
+    current_user: User = Depends(require_system_admin),
+    session: Session = Depends(get_session),
+):
+    """Stop tracing allocations and free the trace data."""
+    if not profiling.memory_tracing():
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Memory tracing is not running in this process",
+        )
+    await run_in_threadpool(profiling.stop_memory_tracing)
+
+    # Audit log
+    create_audit_log(
+        session,
+        current_user.id,
+        AuditAction.UPDATE,
+        "profile",
+        None,
+        "Stopped memory tracing",
+        request.client.host if request.client else None,
+        request.headers.get("user-agent"),
+    )
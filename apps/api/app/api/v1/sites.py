@@ -3,14 +3,30 @@ Site Management Endpoints
 """
 
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlmodel import Session, select
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
 from app.core.database import get_session
 from app.core.dependencies import get_current_user, create_audit_log
+from app.core.etags import (
+    check_if_match,
+    current_etag,
+    entity_etag,
+    if_match_lock,
+    not_modified,
+    page_etag,
+)
 from app.core.permissions import Permission, has_permission
+from app.core.response_cache import (
+    cache_response,
+    cached_response,
+    invalidate_after_commit,
+    response_key,
+)
+from app.core.responses import FastJSONResponse, projected_item_response, projected_json
+from app.core.singleflight import coalesce, flight_key
 from app.core.config import settings
 from app.models.site import Site, SiteCreate, SiteUpdate, SiteResponse
 from app.models.user import User
@@ -23,6 +39,7 @@ limiter = Limiter(key_func=get_remote_address)
 
 @router.get("", response_model=List[SiteResponse])
 async def list_sites(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     current_user: User = Depends(get_current_user),
@@ -35,9 +52,23 @@ async def list_sites(
             detail="Permission denied",
         )
     
-    statement = select(Site).offset(skip).limit(limit)
-    sites = session.exec(statement).all()
-    return sites
+    cache_key = response_key(request, current_user, "sites")
+    hit = cached_response(request, cache_key)
+    if hit:
+        return hit
+    
+    statement = select(Site).order_by(Site.id).offset(skip).limit(limit)
+    etag = page_etag(session, statement)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    body = await coalesce(
+        request,
+        session,
+        flight_key(request, current_user, etag),
+        lambda flight_session: projected_json(SiteResponse, flight_session.exec(statement).all()),
+    )
+    return cache_response(cache_key, FastJSONResponse(body, headers={"ETag": etag}))
 
 
 @router.post("", response_model=SiteResponse)
@@ -57,8 +88,9 @@ async def create_site(
     
     site = Site(**site_data.dict())
     session.add(site)
-    session.commit()
-    session.refresh(site)
+    session.flush()
+    
+    invalidate_after_commit(session, "sites")
     
     # Audit log
     create_audit_log(
@@ -78,6 +110,7 @@ async def create_site(
 @router.get("/{site_id}", response_model=SiteResponse)
 async def get_site(
     site_id: int,
+    request: Request,
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session),
 ):
@@ -88,6 +121,17 @@ async def get_site(
             detail="Permission denied",
         )
     
+    cache_key = response_key(request, current_user, "sites")
+    hit = cached_response(request, cache_key)
+    if hit:
+        return hit
+    
+    etag = current_etag(session, Site, site_id)
+    if etag is not None:
+        cached = not_modified(request, etag)
+        if cached:
+            return cached
+    
     site = session.get(Site, site_id)
     if not site:
         raise HTTPException(
@@ -95,7 +139,9 @@ async def get_site(
             detail="Site not found",
         )
     
-    return site
+    return cache_response(cache_key, projected_item_response(
+        SiteResponse, site, headers={"ETag": entity_etag(site.id, site.updated_at)},
+    ))
 
 
 @router.put("/{site_id}", response_model=SiteResponse)
@@ -103,6 +149,7 @@ async def update_site(
     site_id: int,
     site_data: SiteUpdate,
     request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session),
 ):
@@ -113,12 +160,13 @@ async def update_site(
             detail="Permission denied",
         )
     
-    site = session.get(Site, site_id)
+    site = session.get(Site, site_id, with_for_update=if_match_lock(request))
     if not site:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Site not found",
         )
+    check_if_match(request, entity_etag(site.id, site.updated_at))
     
     # Update fields
     update_data = site_data.dict(exclude_unset=True)
@@ -126,10 +174,9 @@ async def update_site(
         setattr(site, field, value)
     
     site.updated_at = datetime.utcnow()
+    response.headers["ETag"] = entity_etag(site.id, site.updated_at)
     
-    session.add(site)
-    session.commit()
-    session.refresh(site)
+    invalidate_after_commit(session, "sites")
     
     # Audit log
     create_audit_log(
@@ -167,6 +214,8 @@ async def delete_site(
             detail="Site not found",
         )
     
+    invalidate_after_commit(session, "sites")
+    
     # Audit log
     create_audit_log(
         session,
@@ -180,7 +229,6 @@ async def delete_site(
     )
     
     session.delete(site)
-    session.commit()
     
     return {"message": "Site deleted successfully"}
 
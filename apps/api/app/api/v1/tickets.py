@@ -3,18 +3,52 @@ Ticket Management Endpoints
 """
 
 from typing import List
-from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
 from sqlmodel import Session, select
 from slowapi import Limiter
 from slowapi.util import get_remote_address
 
 from app.core.database import get_session
 from app.core.dependencies import get_current_user, create_audit_log
+from app.core.etags import (
+    check_if_match,
+    current_etag,
+    entity_etag,
+    if_match_lock,
+    not_modified,
+    page_etag,
+)
 from app.core.permissions import Permission, has_permission
+from app.core.response_cache import (
+    cache_response,
+    cached_response,
+    first_pages,
+    invalidate_after_commit,
+    response_key,
+)
+from app.core.responses import FastJSONResponse, projected_json
+from app.core.singleflight import coalesce, flight_key
 from app.core.config import settings
-from app.models.ticket import Ticket, TicketCreate, TicketUpdate, TicketResponse
+from app.models.bulk import BulkResponse
+from app.models.ticket import (
+    Ticket,
+    TicketBulkUpdate,
+    TicketCreate,
+    TicketStatus,
+    TicketUpdate,
+    TicketResponse,
+)
 from app.models.user import User
 from app.models.audit_log import AuditAction
+from app.services.bulk_operations import (
+    add_audit_rows,
+    bulk_response,
+    check_batch,
+    find_duplicates,
+    missing_references,
+    reject_invalid,
+    update_rows,
+)
 from datetime import datetime
 
 router = APIRouter()
@@ -23,6 +57,7 @@ limiter = Limiter(key_func=get_remote_address)
 
 @router.get("", response_model=List[TicketResponse])
 async def list_tickets(
+    request: Request,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=100),
     current_user: User = Depends(get_current_user),
@@ -35,9 +70,23 @@ async def list_tickets(
             detail="Permission denied",
         )
     
-    statement = select(Ticket).offset(skip).limit(limit)
-    tickets = session.exec(statement).all()
-    return tickets
+    cache_key = response_key(request, current_user, "tickets") if first_pages(skip, limit) else None
+    hit = cached_response(request, cache_key)
+    if hit:
+        return hit
+    
+    statement = select(Ticket).order_by(Ticket.id).offset(skip).limit(limit)
+    etag = page_etag(session, statement)
+    cached = not_modified(request, etag)
+    if cached:
+        return cached
+    body = await coalesce(
+        request,
+        session,
+        flight_key(request, current_user, etag),
+        lambda flight_session: projected_json(TicketResponse, flight_session.exec(statement).all()),
+    )
+    return cache_response(cache_key, FastJSONResponse(body, headers={"ETag": etag}))
 
 
 @router.post("", response_model=TicketResponse)
@@ -60,8 +109,9 @@ async def create_ticket(
         created_by_id=current_user.id,
     )
     session.add(ticket)
-    session.commit()
-    session.refresh(ticket)
+    session.flush()
+    
+    invalidate_after_commit(session, "tickets")
     
     # Audit log
     create_audit_log(
@@ -78,9 +128,59 @@ async def create_ticket(
     return ticket
 
 
+@router.patch("/bulk", response_model=BulkResponse)
+async def bulk_update_tickets(
+    items: List[TicketBulkUpdate],
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """Change status and assignment of many tickets (requires TICKET_EDIT permission)."""
+    if not has_permission(current_user, Permission.TICKET_EDIT):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Permission denied",
+        )
+    
+    check_batch(current_user, items)
+    ticket_ids = [item.id for item in items]
+    reject_invalid(
+        find_duplicates(ticket_ids, "ticket id")
+        + missing_references(session, Ticket, ticket_ids, "Ticket")
+        + missing_references(session, User, [item.assigned_to_id for item in items], "User")
+    )
+    
+    tickets = {
+        ticket_id: (title, resolved_at)
+        for ticket_id, title, resolved_at in session.exec(
+            select(Ticket.id, Ticket.title, Ticket.resolved_at).where(Ticket.id.in_(ticket_ids))
+        ).all()
+    }
+    now = datetime.utcnow()
+    rows = []
+    for item in items:
+        row = {"id": item.id, **item.dict(exclude_unset=True, exclude={"id"}), "updated_at": now}
+        # Auto-set resolved_at if status is resolved/closed
+        if item.status in (TicketStatus.RESOLVED, TicketStatus.CLOSED) and not tickets[item.id][1]:
+            row["resolved_at"] = now
+        rows.append(row)
+    update_rows(session, Ticket, rows)
+    
+    invalidate_after_commit(session, "tickets")
+    
+    # Audit log
+    add_audit_rows(session, request, current_user.id, AuditAction.UPDATE, "ticket", (
+        (ticket_id, f"Updated ticket: {tickets[ticket_id][0]}") for ticket_id in ticket_ids
+    ))
+    
+    return bulk_response(ticket_ids, "updated")
+
+
 @router.get("/{ticket_id}", response_model=TicketResponse)
 async def get_ticket(
     ticket_id: int,
+    request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session),
 ):
@@ -91,6 +191,12 @@ async def get_ticket(
             detail="Permission denied",
         )
     
+    etag = current_etag(session, Ticket, ticket_id)
+    if etag is not None:
+        cached = not_modified(request, etag)
+        if cached:
+            return cached
+    
     ticket = session.get(Ticket, ticket_id)
     if not ticket:
         raise HTTPException(
@@ -98,6 +204,7 @@ async def get_ticket(
             detail="Ticket not found",
         )
     
+    response.headers["ETag"] = entity_etag(ticket.id, ticket.updated_at)
     return ticket
 
 
@@ -106,6 +213,7 @@ async def update_ticket(
     ticket_id: int,
     ticket_data: TicketUpdate,
     request: Request,
+    response: Response,
     current_user: User = Depends(get_current_user),
     session: Session = Depends(get_session),
 ):
@@ -116,12 +224,13 @@ async def update_ticket(
             detail="Permission denied",
         )
     
-    ticket = session.get(Ticket, ticket_id)
+    ticket = session.get(Ticket, ticket_id, with_for_update=if_match_lock(request))
     if not ticket:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Ticket not found",
         )
+    check_if_match(request, entity_etag(ticket.id, ticket.updated_at))
     
     # Update fields
     update_data = ticket_data.dict(exclude_unset=True)
@@ -133,10 +242,9 @@ async def update_ticket(
         ticket.resolved_at = datetime.utcnow()
     
     ticket.updated_at = datetime.utcnow()
+    response.headers["ETag"] = entity_etag(ticket.id, ticket.updated_at)
     
-    session.add(ticket)
-    session.commit()
-    session.refresh(ticket)
+    invalidate_after_commit(session, "tickets")
     
     # Audit log
     create_audit_log(
@@ -174,6 +282,8 @@ async def delete_ticket(
             detail="Ticket not found",
         )
     
+    invalidate_after_commit(session, "tickets")
+    
     # Audit log
     create_audit_log(
         session,
@@ -187,7 +297,6 @@ async def delete_ticket(
     )
     
     session.delete(ticket)
-    session.commit()
     
     return {"message": "Ticket deleted successfully"}
 
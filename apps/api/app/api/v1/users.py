@@ -2,8 +2,10 @@
 User Management Endpoints
 """
 
+from datetime import datetime
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, status, Query, Request
+from starlette.concurrency import run_in_threadpool
 from sqlmodel import Session, select
 from slowapi import Limiter
 from slowapi.util import get_remote_address
@@ -12,9 +14,21 @@ from app.core.database import get_session
 from app.core.auth import get_password_hash
 from app.core.dependencies import get_current_user, create_audit_log
 from app.core.permissions import Permission, has_permission
+from app.core.responses import projected_response
 from app.core.config import settings
 from app.models.user import User, UserCreate, UserUpdate, UserResponse, UserRole
 from app.models.audit_log import AuditAction
+from app.models.bulk import BulkResponse
+from app.models.site import Site
+from app.services.bulk_operations import (
+    add_audit_rows,
+    bulk_response,
+    check_batch,
+    find_duplicates,
+    insert_rows,
+    missing_references,
+    reject_invalid,
+)
 
 router = APIRouter()
 limiter = Limiter(key_func=get_remote_address)
@@ -36,7 +50,7 @@ async def list_users(
     
     statement = select(User).offset(skip).limit(limit)
     users = session.exec(statement).all()
-    return users
+    return projected_response(UserResponse, users)
 
 
 @router.post("", response_model=UserResponse)
@@ -73,8 +87,7 @@ async def create_user(
         site_id=user_data.site_id,
     )
     session.add(user)
-    session.commit()
-    session.refresh(user)
+    session.flush()
     
     # Audit log
     create_audit_log(
@@ -91,6 +104,59 @@ async def create_user(
     return user
 
 
+@router.post("/bulk", response_model=BulkResponse)
+async def bulk_create_users(
+    items: List[UserCreate],
+    request: Request,
+    current_user: User = Depends(get_current_user),
+    session: Session = Depends(get_session),
+):
+    """Create many users in one transaction (requires USER_CREATE permission)."""
+    if not has_permission(current_user, Permission.USER_CREATE):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Permission denied",
+        )
+    
+    check_batch(current_user, items, settings.BULK_USER_MAX_ITEMS)
+    emails = [item.email for item in items]
+    registered = set(session.exec(select(User.email).where(User.email.in_(emails))).all())
+    errors = find_duplicates(emails, "email")
+    errors += [
+        {"index": index, "error": "Email already registered"}
+        for index, email in enumerate(emails)
+        if email in registered
+    ]
+    errors += missing_references(session, Site, [item.site_id for item in items], "Site")
+    reject_invalid(errors)
+    
+    # Password hashing is deliberately slow; keep it off the event loop
+    hashed_passwords = await run_in_threadpool(
+        lambda: [get_password_hash(item.password) for item in items]
+    )
+    
+    now = datetime.utcnow()
+    user_ids = insert_rows(session, User, [
+        {
+            "email": item.email,
+            "hashed_password": hashed_password,
+            "full_name": item.full_name,
+            "role": item.role,
+            "site_id": item.site_id,
+            "created_at": now,
+            "updated_at": now,
+        }
+        for item, hashed_password in zip(items, hashed_passwords)
+    ])
+    
+    # Audit log
+    add_audit_rows(session, request, current_user.id, AuditAction.CREATE, "user", (
+        (user_id, f"Created user: {item.email}") for user_id, item in zip(user_ids, items)
+    ))
+    
+    return bulk_response(user_ids, "created")
+
+
 @router.get("/{user_id}", response_model=UserResponse)
 async def get_user(
     user_id: int,
@@ -144,10 +210,6 @@ async def update_user(
     from datetime import datetime
     user.updated_at = datetime.utcnow()
     
-    session.add(user)
-    session.commit()
-    session.refresh(user)
-    
     # Audit log
     create_audit_log(
         session,
@@ -204,7 +266,6 @@ async def delete_user(
     )
     
     session.delete(user)
-    session.commit()
     
     return {"message": "User deleted successfully"}
 
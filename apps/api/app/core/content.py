@@ -0,0 +1,115 @@
+"""
+Content Negotiation for Agent Endpoints
+
+Agent endpoints accept and return JSON, MessagePack or CBOR. Bodies are
+validated against the same models whatever the encoding. MessagePack and
+CBOR need the optional ``msgpack`` and ``cbor2`` packages; without them those
+media types are answered with 415.
+"""
+
+from typing import Any, Dict, Type
+from fastapi import HTTPException, Request, Response, status
+from fastapi.exceptions import RequestValidationError
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel, ValidationError
+
+try:
+    import msgpack
+except ImportError:  # pragma: no cover - optional dependency
+    msgpack = None
+
+try:
+    import cbor2
+except ImportError:  # pragma: no cover - optional dependency
+    cbor2 = None
+
+JSON_MEDIA_TYPE = "application/json"
+MSGPACK_MEDIA_TYPE = "application/msgpack"
+CBOR_MEDIA_TYPE = "application/cbor"
+
+_MSGPACK_ALIASES = {MSGPACK_MEDIA_TYPE, "application/x-msgpack", "application/vnd.msgpack"}
+
+
+def _media_type(header: str) -> str:
+    return header.split(";", 1)[0].strip().lower()
+
+
+def _is_json(media_type: str) -> bool:
+    """JSON as FastAPI recognizes it: no type, ``application/json`` or ``application/*+json``."""
+    return media_type in ("", JSON_MEDIA_TYPE) or (
+        media_type.startswith("application/") and media_type.endswith("+json")
+    )
+
+
+def _unsupported(media_type: str) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_415_UNSUPPORTED_MEDIA_TYPE,
+        detail=f"Unsupported media type: {media_type}",
+    )
+
+
+def decode_body(body: bytes, content_type: str) -> Any:
+    """Decode a request body according to its content type."""
+    media_type = _media_type(content_type) or JSON_MEDIA_TYPE
+    if media_type in _MSGPACK_ALIASES:
+        if msgpack is None:
+            raise _unsupported(media_type)
+        return msgpack.unpackb(body, raw=False)
+    if media_type == CBOR_MEDIA_TYPE:
+        if cbor2 is None:
+            raise _unsupported(media_type)
+        return cbor2.loads(body)
+    raise _unsupported(media_type)
+
+
+def negotiated_body(model: Type[BaseModel]):
+    """Dependency parsing a JSON, MessagePack or CBOR body into ``model``."""
+
+    async def dependency(request: Request) -> BaseModel:
+        body = await request.body()
+        content_type = request.headers.get("content-type", JSON_MEDIA_TYPE)
+        try:
+            if _is_json(_media_type(content_type)):
+                return model.model_validate_json(body)
+            return model.model_validate(decode_body(body, content_type))
+        except ValidationError as e:
+            # Same locations FastAPI reports for JSON bodies
+            raise RequestValidationError(
+                [{**error, "loc": ("body", *error["loc"])} for error in e.errors()]
+            )
+        except (ValueError, TypeError) as e:
+            # Undecodable MessagePack/CBOR payloads
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Malformed request body: {e}",
+            )
+
+    return dependency
+
+
+def negotiated_openapi(model: Type[BaseModel]) -> Dict:
+    """OpenAPI request body description for ``negotiated_body`` endpoints."""
+    schema = model.model_json_schema()
+    return {
+        "requestBody": {
+            "required": True,
+            "content": {
+                media_type: {"schema": schema}
+                for media_type in (JSON_MEDIA_TYPE, MSGPACK_MEDIA_TYPE, CBOR_MEDIA_TYPE)
+            },
+        }
+    }
+
+
+def negotiated_response(request: Request, content: Dict) -> Response:
+    """Encode ``content`` in the format the client accepts."""
+    accept = request.headers.get("accept", "")
+    for part in accept.split(","):
+        media_type = _media_type(part)
+        if media_type in _MSGPACK_ALIASES and msgpack is not None:
+            return Response(msgpack.packb(content, use_bin_type=True), media_type=MSGPACK_MEDIA_TYPE)
+        if media_type == CBOR_MEDIA_TYPE and cbor2 is not None:
+            return Response(cbor2.dumps(content), media_type=CBOR_MEDIA_TYPE)
+        if media_type in (JSON_MEDIA_TYPE, "*/*"):
+            break
+    return JSONResponse(content)
@@ -2,20 +2,56 @@
 Database Configuration and Session Management
 """
 
+import time
+
+from sqlalchemy import event
+from sqlalchemy.pool import QueuePool
 from sqlmodel import SQLModel, Session, create_engine
 from app.core.config import settings
+from app.core.metrics import DB_POOL_CHECKED_OUT, DB_POOL_CHECKOUT_WAIT, DB_POOL_OVERFLOW
+from app.core.query_stats import instrument_engine
+from app.core.tracing import span
+from app.models.audit_log import AuditLog
 import structlog
 
 logger = structlog.get_logger()
 
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long checkouts wait for a connection."""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            DB_POOL_CHECKOUT_WAIT.observe(time.perf_counter() - started)
+
+
 engine = create_engine(
     settings.DATABASE_URL,
     echo=settings.DATABASE_ECHO,
     pool_pre_ping=True,
-    pool_size=10,
-    max_overflow=20,
+    poolclass=InstrumentedQueuePool,
+    pool_size=settings.DATABASE_POOL_SIZE,
+    max_overflow=settings.DATABASE_MAX_OVERFLOW,
 )
 
+instrument_engine(engine)
+
+
+@event.listens_for(engine, "checkout")
+@event.listens_for(engine, "checkin")
+def _record_pool_usage(*args):
+    DB_POOL_CHECKED_OUT.set(engine.pool.checkedout())
+    DB_POOL_OVERFLOW.set(max(engine.pool.overflow(), 0))
+
+
+def pool_saturation() -> float:
+    """Fraction of the connection pool (including overflow) checked out."""
+    capacity = settings.DATABASE_POOL_SIZE + settings.DATABASE_MAX_OVERFLOW
+    return engine.pool.checkedout() / capacity if capacity else 0.0
+
 
 async def init_db():
     """Initialize database tables."""
@@ -25,8 +61,27 @@ async def init_db():
 
 
 def get_session():
-    """Get database session."""
-    with Session(engine) as session:
-        yield session
+    """Request-scoped unit of work.
+
+    Handlers add and flush their changes (entity and audit row together) and
+    the transaction is committed once after the handler returns, or rolled
+    back if it raises. Objects are not expired on commit, so nothing has to
+    be refreshed for the response; generated keys come back from the
+    ``INSERT ... RETURNING`` issued by ``flush()``. Handlers that publish
+    in-process state only once data is durable may still commit themselves.
+    """
+    with Session(engine, expire_on_commit=False) as session:
+        try:
+            yield session
+            with span("db.commit") as commit_span:
+                if commit_span.recording:
+                    # Audit rows added with create_audit_log are flushed here
+                    commit_span.set_attribute(
+                        "audit.rows", sum(isinstance(obj, AuditLog) for obj in session.new)
+                    )
+                session.commit()
+        except Exception:
+            session.rollback()
+            raise
 
 
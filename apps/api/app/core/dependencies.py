@@ -8,6 +8,8 @@ from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from sqlmodel import Session, select
 from app.core.database import get_session
 from app.core.auth import verify_token
+from app.core.metrics import AUDIT_LOG_ENTRIES
+from app.core.tracing import span
 from app.models.user import User
 from app.models.audit_log import AuditLog, AuditAction
 import structlog
@@ -21,37 +23,40 @@ async def get_current_user(
     session: Session = Depends(get_session),
 ) -> User:
     """Get current authenticated user from JWT token."""
-    token = credentials.credentials
-    
-    payload = verify_token(token, token_type="access")
-    if not payload:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid authentication credentials",
-            headers={"WWW-Authenticate": "Bearer"},
-        )
-    
-    user_id = payload.get("sub")
-    if not user_id:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="Invalid token payload",
-        )
-    
-    user = session.get(User, user_id)
-    if not user:
-        raise HTTPException(
-            status_code=status.HTTP_401_UNAUTHORIZED,
-            detail="User not found",
-        )
-    
-    if not user.is_active:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Inactive user",
-        )
-    
-    return user
+    with span("auth.verify") as auth_span:
+        token = credentials.credentials
+        
+        payload = verify_token(token, token_type="access")
+        if not payload:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid authentication credentials",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+        
+        user_id = payload.get("sub")
+        if not user_id:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid token payload",
+            )
+        
+        user = session.get(User, user_id)
+        if not user:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="User not found",
+            )
+        
+        if not user.is_active:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail="Inactive user",
+            )
+        
+        auth_span.set_attribute("user.id", user.id)
+        
+        return user
 
 
 async def get_current_active_user(
@@ -71,7 +76,7 @@ def create_audit_log(
     ip_address: Optional[str] = None,
     user_agent: Optional[str] = None,
 ):
-    """Create audit log entry."""
+    """Add an audit log entry to the current unit of work."""
     audit_log = AuditLog(
         user_id=user_id,
         action=action,
@@ -82,5 +87,5 @@ def create_audit_log(
         user_agent=user_agent,
     )
     session.add(audit_log)
-    session.commit()
+    AUDIT_LOG_ENTRIES.labels(resource_type).inc()
 
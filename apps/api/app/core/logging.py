@@ -0,0 +1,230 @@
+"""
+Structured Logging
+
+structlog renders each event to one JSON line (with orjson when installed)
+and hands it to a bounded in-memory queue; a background thread writes the
+queued lines to stdout (journald under systemd) in batches. A request never
+waits for the log write:
+
+- events below ``LOG_LEVEL`` are discarded by the bound logger itself;
+- high-volume events can be sampled by name (``LOG_SAMPLE_RATES``, e.g.
+  ``{"Agent heartbeat": 0.01}``); warnings and errors are never sampled,
+  kept events carry their ``sample_rate``;
+- once the queue is ``LOG_QUEUE_SHED_RATIO`` full, debug events are dropped,
+  and when it is full every new event is dropped. Drops are counted in
+  ``log_events_dropped_total`` and summarised in the log once the writer
+  catches up.
+"""
+
+import atexit
+import json
+import logging
+import queue
+import random
+import sys
+import threading
+from datetime import datetime
+from typing import Any, BinaryIO, Dict, Optional
+
+import structlog
+
+from app.core.config import settings
+from app.core.metrics import LOG_EVENTS_DROPPED
+from app.core.tracing import add_trace_context
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+_LEVELS = {
+    "debug": logging.DEBUG,
+    "info": logging.INFO,
+    "msg": logging.INFO,
+    "warning": logging.WARNING,
+    "warn": logging.WARNING,
+    "error": logging.ERROR,
+    "exception": logging.ERROR,
+    "critical": logging.CRITICAL,
+    "fatal": logging.CRITICAL,
+}
+_WRITE_BATCH = 1000
+
+
+def render_json(event_dict: Dict[str, Any]) -> bytes:
+    """One newline-terminated JSON line."""
+    if orjson is not None:
+        return orjson.dumps(
+            event_dict,
+            default=str,
+            option=orjson.OPT_APPEND_NEWLINE | orjson.OPT_NON_STR_KEYS,
+        )
+    return (json.dumps(event_dict, default=str) + "\n").encode()
+
+
+def _render(logger, method_name, event_dict) -> bytes:
+    return render_json(event_dict)
+
+
+class EventSampler:
+    """structlog processor keeping a fraction of selected events.
+
+    Rates are keyed by event name. Warnings and above are always kept.
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        self.rates = rates
+
+    def __call__(self, logger, method_name, event_dict):
+        rate = self.rates.get(event_dict.get("event"))
+        if rate is None or rate >= 1 or _LEVELS.get(method_name, logging.INFO) >= logging.WARNING:
+            return event_dict
+        if random.random() >= rate:
+            LOG_EVENTS_DROPPED.labels("sampled", method_name).inc()
+            raise structlog.DropEvent
+        event_dict["sample_rate"] = rate
+        return event_dict
+
+
+class LogWriter:
+    """Bounded queue of rendered lines drained by a writer thread."""
+
+    def __init__(self, stream: BinaryIO, max_queue: int, shed_ratio: float):
+        self.stream = stream
+        self._queue: queue.Queue = queue.Queue(max_queue)
+        self._shed_at = max(1, int(max_queue * shed_ratio))
+        self._dropped: Dict[str, int] = {}
+        self._thread = threading.Thread(target=self._run, name="log-writer", daemon=True)
+        self._thread.start()
+
+    def write(self, method_name: str, line: bytes):
+        """Queue ``line`` without blocking; drop it if the queue is too full."""
+        if (
+            _LEVELS.get(method_name, logging.INFO) < logging.INFO
+            and self._queue.qsize() >= self._shed_at
+        ):
+            self._drop(method_name)
+            return
+        try:
+            self._queue.put_nowait(line)
+        except queue.Full:
+            self._drop(method_name)
+
+    def _drop(self, method_name: str):
+        LOG_EVENTS_DROPPED.labels("backpressure", method_name).inc()
+        self._dropped[method_name] = self._dropped.get(method_name, 0) + 1
+
+    def _run(self):
+        while True:
+            line = self._queue.get()
+            if line is None:
+                return
+            batch = [line]
+            while len(batch) < _WRITE_BATCH:
+                try:
+                    line = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if line is None:
+                    self._flush(batch)
+                    return
+                batch.append(line)
+            self._flush(batch)
+
+    def _flush(self, batch):
+        if self._dropped:
+            dropped, self._dropped = self._dropped, {}
+            batch.append(render_json({
+                "event": "Log events dropped",
+                "dropped": dropped,
+                "level": "warning",
+                "timestamp": datetime.utcnow().isoformat() + "Z",
+            }))
+        try:
+            self.stream.write(b"".join(batch))
+            self.stream.flush()
+        except Exception:  # pragma: no cover - nowhere left to report it
+            pass
+
+    def stop(self, timeout: float = 5):
+        """Write out queued lines and stop the thread."""
+        try:
+            self._queue.put(None, timeout=timeout)
+        except queue.Full:
+            return
+        self._thread.join(timeout)
+
+
+class QueueLogger:
+    """structlog logger that forwards rendered lines to a ``LogWriter``."""
+
+    def __init__(self, writer: LogWriter, name: str):
+        self.writer = writer
+        self.name = name
+
+    def _method(method_name: str):
+        def emit(self, line: bytes):
+            self.writer.write(method_name, line)
+        emit.__name__ = method_name
+        return emit
+
+    debug = _method("debug")
+    info = msg = _method("info")
+    warning = warn = _method("warning")
+    error = exception = _method("error")
+    critical = fatal = _method("critical")
+    del _method
+
+
+def _caller_module() -> str:
+    frame = sys._getframe(2)
+    while frame is not None and frame.f_globals.get("__name__", "").startswith(("structlog", __name__)):
+        frame = frame.f_back
+    return frame.f_globals.get("__name__", "?") if frame is not None else "?"
+
+
+class QueueLoggerFactory:
+    """Creates ``QueueLogger`` instances named after the calling module."""
+
+    def __init__(self, writer: LogWriter):
+        self.writer = writer
+
+    def __call__(self, *args) -> QueueLogger:
+        return QueueLogger(self.writer, args[0] if args else _caller_module())
+
+
+_writer: Optional[LogWriter] = None
+
+
+def configure_logging(stream: Optional[BinaryIO] = None):
+    """Configure structlog with the sampled, queue-backed pipeline."""
+    global _writer
+    if _writer is not None:
+        return
+    _writer = LogWriter(
+        stream or sys.stdout.buffer,
+        settings.LOG_QUEUE_SIZE,
+        settings.LOG_QUEUE_SHED_RATIO,
+    )
+    atexit.register(_writer.stop)
+
+    structlog.configure(
+        processors=[
+            EventSampler(settings.LOG_SAMPLE_RATES),
+            structlog.contextvars.merge_contextvars,
+            add_trace_context,
+            structlog.stdlib.add_logger_name,
+            structlog.processors.add_log_level,
+            structlog.processors.TimeStamper(fmt="iso"),
+            structlog.processors.StackInfoRenderer(),
+            structlog.processors.format_exc_info,
+            structlog.processors.UnicodeDecoder(),
+            _render,
+        ],
+        context_class=dict,
+        logger_factory=QueueLoggerFactory(_writer),
+        wrapper_class=structlog.make_filtering_bound_logger(
+            logging.getLevelName(settings.LOG_LEVEL.upper())
+        ),
+        cache_logger_on_first_use=True,
+    )
@@ -0,0 +1,107 @@
+"""
+Event Loop Stall Detector
+
+A coroutine on the event loop records a heartbeat every few milliseconds
+and measures how late each wake-up is (loop lag). A watchdog thread checks
+the heartbeat; once it is older than ``LOOP_STALL_THRESHOLD_MS`` the loop is
+stuck in one callback, so the watchdog captures the loop thread's current
+stack (the blocking frame) and the route of the request being handled.
+When the loop recovers the stall is logged with its duration and counted in
+the metrics.
+"""
+
+import asyncio
+import sys
+import threading
+import time
+import traceback
+from typing import Optional
+
+import structlog
+
+from app.core.metrics import EVENT_LOOP_LAG, EVENT_LOOP_STALL_SECONDS, EVENT_LOOP_STALLS, route_template
+
+logger = structlog.get_logger()
+
+_MAX_STACK_FRAMES = 30
+
+
+def _find_route(frame) -> str:
+    """Route of the request whose code owns ``frame``, from an ASGI ``scope`` local."""
+    while frame is not None:
+        scope = frame.f_locals.get("scope")
+        if isinstance(scope, dict) and scope.get("type") in ("http", "websocket"):
+            return route_template(scope)
+        frame = frame.f_back
+    return "-"
+
+
+class LoopWatchdog:
+    """Measures event loop lag and reports stalls with the blocking stack."""
+
+    def __init__(self, threshold_ms: float, interval_ms: float = 20):
+        self.threshold = threshold_ms / 1000
+        self.interval = interval_ms / 1000
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._last_beat = time.monotonic()
+        self._stall: Optional[dict] = None
+        self._stop = threading.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self):
+        """Start monitoring the running loop (call from the loop thread)."""
+        self._loop = asyncio.get_running_loop()
+        self._loop_thread_id = threading.get_ident()
+        self._last_beat = time.monotonic()
+        self._stop.clear()
+        self._task = asyncio.create_task(self._beat())
+        self._thread = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+        self._thread.start()
+
+    async def stop(self):
+        self._stop.set()
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+        if self._thread is not None:
+            self._thread.join(timeout=1)
+
+    async def _beat(self):
+        while True:
+            expected = time.monotonic() + self.interval
+            await asyncio.sleep(self.interval)
+            now = time.monotonic()
+            EVENT_LOOP_LAG.observe(max(0.0, now - expected))
+            self._last_beat = now
+            stall, self._stall = self._stall, None
+            if stall is not None:
+                self._report(stall, now)
+
+    def _watch(self):
+        while not self._stop.wait(self.interval):
+            if self._stall is not None:
+                continue
+            beat = self._last_beat
+            if time.monotonic() - beat < self.threshold:
+                continue
+            frame = sys._current_frames().get(self._loop_thread_id)
+            if frame is None:
+                continue
+            self._stall = {
+                "since": beat,
+                "route": _find_route(frame),
+                "stack": traceback.format_stack(frame, limit=_MAX_STACK_FRAMES),
+            }
+
+    def _report(self, stall: dict, resumed: float):
+        duration = resumed - stall["since"]
+        EVENT_LOOP_STALLS.labels(stall["route"]).inc()
+        EVENT_LOOP_STALL_SECONDS.observe(duration)
+        logger.warning(
+            "Event loop stalled",
+            duration_ms=round(duration * 1000, 1),
+            route=stall["route"],
+            stack="".join(stall["stack"]),
+        )
@@ -0,0 +1,253 @@
+"""
+Prometheus Metrics
+
+Collectors and the ``/metrics`` exposition. With several uvicorn/gunicorn
+workers set ``PROMETHEUS_MULTIPROC_DIR`` to an empty directory before the
+workers start: every process then writes its samples to memory-mapped files
+there and the scrape aggregates all of them, whichever worker answers it.
+"""
+
+import os
+import threading
+import time
+from typing import Dict, Optional, Tuple
+
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+from prometheus_client.core import GaugeMetricFamily
+from starlette.responses import Response
+from starlette.routing import Match
+
+MULTIPROCESS = "PROMETHEUS_MULTIPROC_DIR" in os.environ
+
+REQUEST_LATENCY = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request latency by route template",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+REQUESTS_IN_PROGRESS = Gauge(
+    "http_requests_in_progress",
+    "HTTP requests being handled",
+    ["method", "route"],
+    multiprocess_mode="livesum",
+)
+
+DB_POOL_CHECKOUT_WAIT = Histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a database connection from the pool",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1, 5, 30),
+)
+DB_POOL_CHECKED_OUT = Gauge(
+    "db_pool_checked_out_connections",
+    "Database connections checked out of the pool",
+    multiprocess_mode="livesum",
+)
+DB_POOL_OVERFLOW = Gauge(
+    "db_pool_overflow_connections",
+    "Database connections open beyond the pool size",
+    multiprocess_mode="livesum",
+)
+
+EVENT_LOOP_LAG = Histogram(
+    "event_loop_lag_seconds",
+    "Delay between a scheduled event loop wake-up and when it ran",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 5),
+)
+EVENT_LOOP_STALLS = Counter(
+    "event_loop_stalls_total",
+    "Times the event loop was blocked beyond the stall threshold",
+    ["route"],
+)
+EVENT_LOOP_STALL_SECONDS = Histogram(
+    "event_loop_stall_seconds",
+    "Duration of event loop stalls",
+    buckets=(0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+AGENT_INGEST = Counter(
+    "agent_ingest_total",
+    "Agent submissions accepted",
+    ["kind"],  # heartbeat, inventory
+)
+RATE_LIMIT_REJECTIONS = Counter(
+    "rate_limit_rejections_total",
+    "Requests rejected by a rate limiter",
+    ["limiter"],  # request, bulk_rows
+)
+SQL_N_PLUS_ONE = Counter(
+    "sql_n_plus_one_total",
+    "Requests that repeated one statement shape beyond the N+1 threshold",
+    ["route"],
+)
+TRACE_SPANS_DROPPED = Counter(
+    "trace_spans_dropped_total",
+    "Trace spans not exported because the export queue was full or export failed",
+)
+LOG_EVENTS_DROPPED = Counter(
+    "log_events_dropped_total",
+    "Log events not written",
+    ["reason", "level"],  # sampled, backpressure
+)
+AUDIT_LOG_ENTRIES = Counter(
+    "audit_log_entries_total",
+    "Audit log rows written",
+    ["resource_type"],
+)
+RESPONSE_CACHE_LOOKUPS = Counter(
+    "response_cache_lookups_total",
+    "Response cache lookups by route template",
+    ["route", "result"],  # hit, miss, error
+)
+RESPONSE_CACHE_INVALIDATIONS = Counter(
+    "response_cache_invalidations_total",
+    "Committed writes that invalidated cached responses",
+    ["tag"],
+)
+SINGLEFLIGHT_REQUESTS = Counter(
+    "singleflight_requests_total",
+    "Reads on coalescing routes that ran the query or shared an identical in-flight one",
+    ["route", "result"],  # executed, coalesced
+)
+
+
+class JobQueueCollector:
+    """Queued and running background jobs, read from the job table at scrape time.
+
+    The queue is shared by all processes, so one query gives the fleet-wide
+    depth regardless of which worker serves the scrape.
+    """
+
+    def collect(self):
+        from sqlalchemy import func
+        from sqlmodel import Session, select
+
+        from app.core.database import engine
+        from app.models.job import Job, JobStatus
+
+        depth = GaugeMetricFamily(
+            "job_queue_depth",
+            "Background jobs waiting or running",
+            labels=["kind", "status"],
+        )
+        try:
+            with Session(engine) as session:
+                rows = session.exec(
+                    select(Job.kind, Job.status, func.count(Job.id))
+                    .where(Job.status.in_([JobStatus.QUEUED, JobStatus.RUNNING]))
+                    .group_by(Job.kind, Job.status)
+                ).all()
+        except Exception:
+            rows = []
+        for kind, job_status, count in rows:
+            depth.add_metric([kind, job_status.value], count)
+        yield depth
+
+
+def _registry() -> CollectorRegistry:
+    if MULTIPROCESS:
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return registry
+
+
+_scrape_registry: Optional[CollectorRegistry] = None
+
+
+def metrics_response() -> Response:
+    """Render all metrics in the Prometheus text format."""
+    global _scrape_registry
+    if _scrape_registry is None:
+        _scrape_registry = _registry()
+        _scrape_registry.register(JobQueueCollector())
+    return Response(generate_latest(_scrape_registry), media_type=CONTENT_TYPE_LATEST)
+
+
+def mark_process_dead():
+    """Drop this process's live gauges (call when a worker shuts down)."""
+    if MULTIPROCESS:
+        multiprocess.mark_process_dead(os.getpid())
+
+
+_ROUTE_SCOPE_KEY = "faeflux.route_template"
+_ROUTE_CACHE_SIZE = 4096
+_route_cache: Dict[Tuple[str, str, str], str] = {}
+_route_cache_lock = threading.Lock()
+
+
+def _match_route(scope) -> str:
+    app = scope.get("app")
+    router = getattr(app, "router", None)
+    partial = None
+    for route in getattr(router, "routes", ()):
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route.path
+        if match == Match.PARTIAL and partial is None:
+            partial = route.path
+    return partial or "unmatched"
+
+
+def route_template(scope) -> str:
+    """Route path template (``/api/v1/assets/{asset_id}``) for a request.
+
+    Unmatched paths share one label to keep cardinality bounded. Matching
+    walks every route, so the result is kept on the scope and in a bounded
+    cache keyed by method and path.
+    """
+    template = scope.get(_ROUTE_SCOPE_KEY)
+    if template is not None:
+        return template
+    key = (scope.get("type"), scope.get("method"), scope.get("path"))
+    template = _route_cache.get(key)
+    if template is None:
+        template = _match_route(scope)
+        with _route_cache_lock:
+            if len(_route_cache) >= _ROUTE_CACHE_SIZE:
+                _route_cache.pop(next(iter(_route_cache)))
+            _route_cache[key] = template
+    scope[_ROUTE_SCOPE_KEY] = template
+    return template
+
+
+class MetricsMiddleware:
+    """Records request latency and in-flight requests per route template."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        method = scope["method"]
+        route = route_template(scope)
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        in_progress = REQUESTS_IN_PROGRESS.labels(method, route)
+        in_progress.inc()
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            REQUEST_LATENCY.labels(method, route, str(status_code)).observe(
+                time.perf_counter() - started
+            )
+            in_progress.dec()
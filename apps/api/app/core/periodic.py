@@ -0,0 +1,19 @@
+"""
+Periodic Background Tasks
+"""
+
+import asyncio
+from typing import Callable
+import structlog
+
+logger = structlog.get_logger()
+
+
+async def run_periodic(func: Callable[[], object], interval_seconds: float, name: str):
+    """Run a blocking function in a worker thread every ``interval_seconds``."""
+    while True:
+        await asyncio.sleep(interval_seconds)
+        try:
+            await asyncio.to_thread(func)
+        except Exception as e:
+            logger.error("Periodic task failed", task=name, error=str(e))
@@ -0,0 +1,208 @@
+"""
+Per-Request SQL Instrumentation
+
+Engine event hooks count and time every statement and attribute it to the
+request being served (via a context variable, which also follows the
+request into threadpool calls). Per request:
+
+- totals are bound to the structlog context and sent as a ``Server-Timing``
+  header (``db;dur=12.3;desc="7 queries"``);
+- statements slower than ``SQL_SLOW_QUERY_MS`` are logged with parameter
+  values redacted;
+- a statement shape run more than ``SQL_N_PLUS_ONE_THRESHOLD`` times is
+  logged as a likely N+1;
+- each statement is a ``db.query`` span when the request's trace is recorded.
+
+``query_budget`` counts statements outside of requests, for asserting how
+many queries an endpoint may issue.
+"""
+
+import re
+import time
+from collections import Counter
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+import structlog
+
+from app.core.config import settings
+from app.core.metrics import SQL_N_PLUS_ONE, route_template
+from app.core.tracing import span
+
+logger = structlog.get_logger()
+
+# Expanded IN lists render as numbered parameters; collapse them per shape
+_EXPANDED_PARAMS = re.compile(r"%\((\w+?)_\d+\)s(?:,\s*%\(\1_\d+\)s)*")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def statement_shape(statement: str) -> str:
+    """Statement text with expanded parameter lists collapsed."""
+    return _WHITESPACE.sub(" ", _EXPANDED_PARAMS.sub(r"%(\1_N)s", statement)).strip()
+
+
+def redact_parameters(parameters: Any) -> Any:
+    """Replace bound values with their type (and length for strings/bytes)."""
+    if isinstance(parameters, dict):
+        return {key: redact_parameters(value) for key, value in parameters.items()}
+    if isinstance(parameters, (list, tuple)):
+        if len(parameters) > 10:
+            return f"<{len(parameters)} parameter sets>"
+        return [redact_parameters(value) for value in parameters]
+    if parameters is None:
+        return None
+    if isinstance(parameters, (str, bytes)):
+        return f"<{type(parameters).__name__}:{len(parameters)}>"
+    return f"<{type(parameters).__name__}>"
+
+
+class QueryStats:
+    """Statements run on behalf of one request."""
+
+    def __init__(self, scope: Optional[Dict] = None):
+        self.scope = scope
+        self.count = 0
+        self.seconds = 0.0
+        self.shapes: Counter = Counter()
+
+    @property
+    def route(self) -> str:
+        return route_template(self.scope) if self.scope else "-"
+
+    def record(self, statement: str, seconds: float):
+        self.count += 1
+        self.seconds += seconds
+        self.shapes[statement_shape(statement)] += 1
+
+    def repeated(self, threshold: int) -> List[tuple]:
+        return [(shape, n) for shape, n in self.shapes.items() if n > threshold]
+
+
+_current: ContextVar[Optional[QueryStats]] = ContextVar("query_stats", default=None)
+_budgets: List[QueryStats] = []
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    query_span = span("db.query")
+    if query_span.recording:
+        query_span.set_attribute("db.statement", statement_shape(statement)[:1000])
+        query_span.set_attribute("db.executemany", executemany)
+    conn.info.setdefault("query_started", []).append((time.perf_counter(), query_span, context))
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started, query_span, _ = conn.info["query_started"].pop()
+    elapsed = time.perf_counter() - started
+    query_span.finish()
+
+    stats = _current.get()
+    if stats is not None:
+        stats.record(statement, elapsed)
+    for budget in _budgets:
+        budget.record(statement, elapsed)
+
+    if elapsed * 1000 >= settings.SQL_SLOW_QUERY_MS:
+        logger.warning(
+            "Slow query",
+            duration_ms=round(elapsed * 1000, 1),
+            route=stats.route if stats else None,
+            statement=_WHITESPACE.sub(" ", statement)[:2000],
+            parameters=redact_parameters(parameters),
+            executemany=executemany,
+        )
+
+
+def _handle_error(context):
+    """Finish the span of the statement that failed.
+
+    Only an entry pushed for this execution is popped: errors raised before
+    the cursor ran (or on connect) never pushed one. Must not raise, or the
+    database error is replaced by ours.
+    """
+    try:
+        started = context.connection.info.get("query_started") if context.connection is not None else None
+        if started and context.execution_context is not None and started[-1][2] is context.execution_context:
+            _, query_span, _ = started.pop()
+            query_span.finish(context.original_exception)
+    except Exception as e:
+        logger.warning("Query instrumentation failed", error=str(e))
+
+
+def instrument_engine(engine: Engine):
+    """Attach the timing hooks to ``engine``."""
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    event.listen(engine, "after_cursor_execute", _after_cursor_execute)
+    event.listen(engine, "handle_error", _handle_error)
+
+
+def _report(stats: QueryStats):
+    for shape, n in stats.repeated(settings.SQL_N_PLUS_ONE_THRESHOLD):
+        SQL_N_PLUS_ONE.labels(stats.route).inc()
+        logger.warning(
+            "Possible N+1 query",
+            route=stats.route,
+            executions=n,
+            statement=shape[:2000],
+        )
+
+
+class QueryStatsMiddleware:
+    """Collects SQL statistics for each HTTP request."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats(scope)
+        token = _current.set(stats)
+        started = time.perf_counter()
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                db_ms = stats.seconds * 1000
+                total_ms = (time.perf_counter() - started) * 1000
+                headers = list(message.get("headers", []))
+                headers.append((
+                    b"server-timing",
+                    f'db;dur={db_ms:.1f};desc="{stats.count} queries", app;dur={total_ms:.1f}'.encode(),
+                ))
+                message = {**message, "headers": headers}
+                structlog.contextvars.bind_contextvars(
+                    db_queries=stats.count, db_ms=round(db_ms, 1)
+                )
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            _current.reset(token)
+            _report(stats)
+
+
+@contextmanager
+def query_budget(max_queries: int) -> Iterator[QueryStats]:
+    """Count statements run on the instrumented engine inside the block.
+
+    Raises ``AssertionError`` if more than ``max_queries`` were issued::
+
+        with query_budget(3):
+            client.put("/api/v1/assets/1", json={...})
+    """
+    stats = QueryStats()
+    _budgets.append(stats)
+    try:
+        yield stats
+    finally:
+        _budgets.remove(stats)
+    if stats.count > max_queries:
+        shapes = "\n".join(f"{n}x {shape}" for shape, n in stats.shapes.most_common())
+        raise AssertionError(
+            f"{stats.count} queries issued, budget is {max_queries}:\n{shapes}"
+        )
@@ -0,0 +1,231 @@
+"""
+Response Cache
+
+Caches rendered JSON bodies of hot read endpoints together with their ETag.
+Handlers opt in explicitly::
+
+    key = response_key(request, current_user, "sites")
+    cached = cached_response(request, key)
+    if cached:
+        return cached
+    ...
+    return cache_response(key, response)
+
+and writers call ``invalidate_after_commit(session, "sites")``.
+
+Keys hold the caller's role (the permission scope), the path and sorted
+query, and the current version of each tag. Invalidation bumps the tag's
+version once the transaction commits, so entries for the old data are never
+read again and age out through LRU/TTL eviction; bumping only after the
+commit keeps a concurrent reader from caching pre-commit data under the new
+version.
+
+Without ``RESPONSE_CACHE_URL`` each process keeps its own LRU cache and
+only sees invalidations made in that process; other workers (and writes from
+job worker processes) may leave a page up to ``RESPONSE_CACHE_TTL_SECONDS``
+old. With a ``redis://`` URL (needs the
+optional ``redis`` package) entries and tag versions are shared by all
+workers; configure the server with an ``allkeys-lru`` eviction policy.
+Cache failures are counted and treated as misses.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Tuple
+
+import structlog
+from fastapi import Request, Response
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.core.etags import not_modified
+from app.core.metrics import RESPONSE_CACHE_INVALIDATIONS, RESPONSE_CACHE_LOOKUPS, route_template
+from app.core.responses import FastJSONResponse
+from app.models.user import User
+
+try:
+    import redis
+except ImportError:  # pragma: no cover - optional dependency
+    redis = None
+
+logger = structlog.get_logger()
+
+_PENDING_TAGS = "response_cache_tags"
+
+
+class LocalCacheBackend:
+    """In-process LRU cache with per-entry expiry."""
+
+    def __init__(self, max_entries: int):
+        self._max_entries = max_entries
+        self._entries: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+        self._versions = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if entry[0] <= time.monotonic():
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry[1]
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        with self._lock:
+            self._entries[key] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self._max_entries:
+                self._entries.popitem(last=False)
+
+    def versions(self, tags: Iterable[str]) -> List[int]:
+        with self._lock:
+            return [self._versions.get(tag, 0) for tag in tags]
+
+    def bump(self, tags: Iterable[str]) -> None:
+        with self._lock:
+            for tag in tags:
+                self._versions[tag] = self._versions.get(tag, 0) + 1
+
+
+class RedisCacheBackend:
+    """Cache shared by all workers; eviction is left to the redis server."""
+
+    def __init__(self, url: str, prefix: str = "faeflux:response:"):
+        if redis is None:
+            raise RuntimeError("RESPONSE_CACHE_URL is set but the redis package is not installed")
+        self._client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+        self._prefix = prefix
+
+    def get(self, key: str) -> Optional[bytes]:
+        return self._client.get(self._prefix + key)
+
+    def set(self, key: str, value: bytes, ttl: int) -> None:
+        self._client.set(self._prefix + key, value, ex=ttl)
+
+    def versions(self, tags: Iterable[str]) -> List[int]:
+        values = self._client.mget([f"{self._prefix}tag:{tag}" for tag in tags])
+        return [int(value or 0) for value in values]
+
+    def bump(self, tags: Iterable[str]) -> None:
+        pipeline = self._client.pipeline(transaction=False)
+        for tag in tags:
+            pipeline.incr(f"{self._prefix}tag:{tag}")
+        pipeline.execute()
+
+
+_backend = None
+_backend_lock = threading.Lock()
+
+
+def get_cache_backend():
+    """The configured backend, created on first use."""
+    global _backend
+    if _backend is None:
+        with _backend_lock:
+            if _backend is None:
+                if settings.RESPONSE_CACHE_URL:
+                    _backend = RedisCacheBackend(settings.RESPONSE_CACHE_URL)
+                else:
+                    _backend = LocalCacheBackend(settings.RESPONSE_CACHE_MAX_ENTRIES)
+    return _backend
+
+
+def set_backend(backend) -> None:
+    """Replace the backend, e.g. with a fresh ``LocalCacheBackend`` in tests."""
+    global _backend
+    _backend = backend
+
+
+def first_pages(skip: int, limit: int) -> bool:
+    """Whether a list page is among the leading pages worth caching."""
+    return skip < settings.RESPONSE_CACHE_LIST_PAGES * limit
+
+
+def scope_key(request: Request, user: User) -> str:
+    """Identifies what a read returns: the caller's role, path and sorted query."""
+    query = "&".join(f"{k}={v}" for k, v in sorted(request.query_params.multi_items()))
+    return f"{user.role.value}:{request.url.path}?{query}"
+
+
+def response_key(request: Request, user: User, *tags: str) -> Optional[str]:
+    """Cache key for this request in ``user``'s permission scope.
+
+    ``None`` when caching is disabled or the backend is unreachable.
+    """
+    if not settings.RESPONSE_CACHE_ENABLED:
+        return None
+    try:
+        versions = get_cache_backend().versions(tags)
+    except Exception as e:
+        _lookup_failed(request, e)
+        return None
+    tagged = ",".join(f"{tag}.{version}" for tag, version in zip(tags, versions))
+    return f"{scope_key(request, user)}:{tagged}"
+
+
+def cached_response(request: Request, key: Optional[str]) -> Optional[Response]:
+    """The cached response for ``key`` (``304`` if the client has it), or ``None``."""
+    if key is None:
+        return None
+    try:
+        entry = get_cache_backend().get(key)
+    except Exception as e:
+        _lookup_failed(request, e)
+        return None
+    route = route_template(request.scope)
+    if entry is None:
+        RESPONSE_CACHE_LOOKUPS.labels(route=route, result="miss").inc()
+        return None
+    RESPONSE_CACHE_LOOKUPS.labels(route=route, result="hit").inc()
+
+    etag, body = entry.split(b"\n", 1)
+    etag = etag.decode()
+    return not_modified(request, etag) or FastJSONResponse(body, headers={"ETag": etag})
+
+
+def cache_response(key: Optional[str], response: Response) -> Response:
+    """Store a successful JSON ``response`` (which must carry an ETag) under ``key``."""
+    if key is None or response.status_code != 200:
+        return response
+    try:
+        get_cache_backend().set(
+            key,
+            response.headers["etag"].encode() + b"\n" + response.body,
+            settings.RESPONSE_CACHE_TTL_SECONDS,
+        )
+    except Exception as e:
+        logger.warning("Response cache write failed", error=str(e))
+    return response
+
+
+def _lookup_failed(request: Request, error: Exception) -> None:
+    RESPONSE_CACHE_LOOKUPS.labels(route=route_template(request.scope), result="error").inc()
+    logger.warning("Response cache lookup failed", error=str(error))
+
+
+def invalidate_after_commit(session: Session, *tags: str) -> None:
+    """Invalidate cached responses tagged with ``tags`` once ``session`` commits."""
+    session.info.setdefault(_PENDING_TAGS, set()).update(tags)
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_committed(session) -> None:
+    tags = session.info.pop(_PENDING_TAGS, None)
+    if not tags:
+        return
+    for tag in tags:
+        RESPONSE_CACHE_INVALIDATIONS.labels(tag=tag).inc()
+    try:
+        get_cache_backend().bump(sorted(tags))
+    except Exception as e:
+        logger.error("Response cache invalidation failed", tags=sorted(tags), error=str(e))
+
+
+@event.listens_for(Session, "after_rollback")
+def _discard_rolled_back(session) -> None:
+    session.info.pop(_PENDING_TAGS, None)
@@ -0,0 +1,157 @@
+"""
+Fast JSON Responses
+
+List endpoints return rows straight from the database. Going through
+``response_model`` FastAPI validates every row into the response model,
+dumps it back to a dict and encodes that with ``json.dumps`` — three passes
+over trusted data. ``project`` instead copies the response model's fields
+off each row with a getter compiled once per model, and ``FastJSONResponse``
+encodes the result with orjson (``json.dumps`` when it is not installed).
+
+The bytes are the same as the ``response_model`` path for the row types we
+serve (``python -m benchmarks.serialization`` checks this); the one
+difference is that orjson writes floats beyond 1e16 or below 1e-4 as
+``1e16`` rather than ``1e+16``, which parses to the same number. Keep
+``response_model`` on the route: it still documents the schema.
+"""
+
+import json
+import operator
+from datetime import date, datetime
+from enum import Enum
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Type, Union, get_args, get_origin
+
+from fastapi.responses import Response
+from pydantic import BaseModel, TypeAdapter
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    orjson = None
+
+_PLAIN_TYPES = (str, int, bool, datetime, date, dict, list, Any)
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode ``content`` as compact UTF-8 JSON, like ``JSONResponse``."""
+    if orjson is not None:
+        return orjson.dumps(content)
+    return json.dumps(
+        content,
+        ensure_ascii=False,
+        allow_nan=False,
+        separators=(",", ":"),
+        default=_default,
+    ).encode("utf-8")
+
+
+class FastJSONResponse(Response):
+    """JSON response encoded with :func:`dumps`; ``bytes`` are sent as is."""
+
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        if isinstance(content, bytes):
+            return content
+        return dumps(content)
+
+
+def _as_float(value: Any) -> Any:
+    return value if value is None or type(value) is float else float(value)
+
+
+def _converter(annotation: Any) -> Union[Callable[[Any], Any], None, bool]:
+    """Conversion a column value needs to serialize like the field would.
+
+    ``None`` means the value is used as is, ``False`` that the field cannot
+    be projected (nested models and anything else orjson would encode
+    differently from pydantic).
+    """
+    origin = get_origin(annotation)
+    if origin is Union:
+        members = [arg for arg in get_args(annotation) if arg is not type(None)]
+        return _converter(members[0]) if len(members) == 1 else False
+    if origin in (dict, list, Dict, List):
+        return None if all(_converter(arg) is None for arg in get_args(annotation)) else False
+    if annotation is float:
+        return _as_float
+    if annotation in _PLAIN_TYPES or (isinstance(annotation, type) and issubclass(annotation, Enum)):
+        return None
+    return False
+
+
+@lru_cache(maxsize=None)
+def _projector(model: Type[BaseModel]) -> Callable[[Iterable[Any]], List[Dict[str, Any]]]:
+    names = tuple(model.model_fields)
+    converters = {name: _converter(field.annotation) for name, field in model.model_fields.items()}
+
+    if any(converter is False for converter in converters.values()):
+        # Nested models: validate and dump with a precompiled adapter
+        adapter = TypeAdapter(List[model])
+        return lambda rows: adapter.dump_python(
+            adapter.validate_python(rows, from_attributes=True), mode="json"
+        )
+
+    attributes = operator.attrgetter(*names)
+    loaded = operator.itemgetter(*names)
+    if len(names) == 1:
+        attributes = (lambda get: lambda row: (get(row),))(attributes)
+        loaded = (lambda get: lambda values: (get(values),))(loaded)
+
+    def getter(row: Any) -> tuple:
+        # Loaded ORM columns sit in the instance __dict__; reading them there
+        # skips the instrumented descriptors. Expired or deferred columns and
+        # rows without a __dict__ go through normal attribute access.
+        try:
+            return loaded(vars(row))
+        except (TypeError, KeyError):
+            return attributes(row)
+
+    converted = [(name, converter) for name, converter in converters.items() if converter]
+
+    def project_rows(rows: Iterable[Any]) -> List[Dict[str, Any]]:
+        items = [dict(zip(names, getter(row))) for row in rows]
+        for name, convert in converted:
+            for item in items:
+                item[name] = convert(item[name])
+        return items
+
+    return project_rows
+
+
+def project(model: Type[BaseModel], rows: Iterable[Any]) -> List[Dict[str, Any]]:
+    """Copy ``model``'s fields off ORM objects or result rows, in field order.
+
+    Rows are trusted database data and are not validated.
+    """
+    return _projector(model)(rows)
+
+
+def projected_json(model: Type[BaseModel], rows: Iterable[Any]) -> bytes:
+    """``rows`` encoded as a JSON list of ``model``."""
+    return dumps(project(model, rows))
+
+
+def projected_response(
+    model: Type[BaseModel],
+    rows: Iterable[Any],
+    headers: Optional[Dict[str, str]] = None,
+) -> FastJSONResponse:
+    """Respond with ``rows`` as a JSON list of ``model``."""
+    return FastJSONResponse(project(model, rows), headers=headers)
+
+
+def projected_item_response(
+    model: Type[BaseModel],
+    row: Any,
+    headers: Optional[Dict[str, str]] = None,
+) -> FastJSONResponse:
+    """Respond with one row as ``model``."""
+    return FastJSONResponse(project(model, (row,))[0], headers=headers)
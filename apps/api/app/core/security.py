@@ -2,7 +2,12 @@
 Security Middleware and Utilities
 """
 
-from fastapi import Request, Response, status
+import math
+import threading
+import time
+from typing import Dict, Tuple
+
+from fastapi import HTTPException, Request, Response, status
 from fastapi.responses import JSONResponse
 from slowapi import Limiter, _rate_limit_exceeded_handler
 from slowapi.util import get_remote_address
@@ -10,6 +15,7 @@ from slowapi.errors import RateLimitExceeded
 from starlette.middleware.base import BaseHTTPMiddleware
 import structlog
 from app.core.config import settings
+from app.core.metrics import RATE_LIMIT_REJECTIONS
 
 logger = structlog.get_logger()
 
@@ -17,6 +23,35 @@ logger = structlog.get_logger()
 limiter = Limiter(key_func=get_remote_address)
 
 
+class RowRateLimiter:
+    """Token bucket limiting rows per minute rather than requests.
+
+    Used by bulk endpoints, where one request may write a thousand rows.
+    State is per process, like the request limiter's memory storage.
+    """
+
+    def __init__(self, rows_per_minute: int):
+        self.capacity = rows_per_minute
+        self.rate = rows_per_minute / 60.0
+        self._buckets: Dict[str, Tuple[float, float]] = {}
+        self._lock = threading.Lock()
+
+    def consume(self, key: str, rows: int) -> int:
+        """Take ``rows`` tokens. Returns 0 if allowed, else seconds to wait."""
+        now = time.monotonic()
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (self.capacity, now))
+            tokens = min(self.capacity, tokens + (now - updated) * self.rate)
+            if rows > tokens:
+                self._buckets[key] = (tokens, now)
+                return max(1, math.ceil((rows - tokens) / self.rate)) if self.rate else 60
+            self._buckets[key] = (tokens - rows, now)
+            return 0
+
+
+bulk_row_limiter = RowRateLimiter(settings.BULK_ROWS_PER_MINUTE)
+
+
 class SecurityHeadersMiddleware(BaseHTTPMiddleware):
     """Add security headers to all responses."""
 
@@ -74,10 +109,60 @@ class HostValidationMiddleware(BaseHTTPMiddleware):
         return await call_next(request)
 
 
+class UploadSizeLimitMiddleware:
+    """Reject multipart uploads larger than ``MAX_UPLOAD_SIZE`` before they are spooled.
+
+    A declared ``Content-Length`` over the limit is answered at once;
+    bodies sent without one are cut off once they pass it.
+    """
+
+    # Room for the multipart boundaries and part headers around the file
+    OVERHEAD = 64 * 1024
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        headers = dict(scope.get("headers") or ()) if scope["type"] == "http" else {}
+        if not headers.get(b"content-type", b"").startswith(b"multipart/form-data"):
+            await self.app(scope, receive, send)
+            return
+
+        limit = settings.MAX_UPLOAD_SIZE + self.OVERHEAD
+        too_large = HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"File exceeds {settings.MAX_UPLOAD_SIZE} bytes",
+        )
+        declared = headers.get(b"content-length")
+        if declared is not None and declared.isdigit() and int(declared) > limit:
+            response = JSONResponse(status_code=too_large.status_code, content={"detail": too_large.detail})
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive():
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise too_large
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+def _rate_limit_exceeded(request: Request, exc: RateLimitExceeded) -> Response:
+    RATE_LIMIT_REJECTIONS.labels("request").inc()
+    return _rate_limit_exceeded_handler(request, exc)
+
+
 def setup_security_middleware(app):
     """Setup all security middleware."""
     app.state.limiter = limiter
-    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded_handler)
+    app.add_exception_handler(RateLimitExceeded, _rate_limit_exceeded)
+    app.add_middleware(UploadSizeLimitMiddleware)
     app.add_middleware(SecurityHeadersMiddleware)
     app.add_middleware(HostValidationMiddleware)
 
@@ -0,0 +1,94 @@
+"""
+Request Coalescing
+
+When many clients ask for the same page at once (every dashboard opening at
+shift start), each request would run the same query. Routes that opt in
+wrap their read in ``coalesce``: the first request for a key runs it in the
+threadpool, and identical requests arriving while it is in flight wait for
+that result instead of querying themselves::
+
+    body = await coalesce(request, session, flight_key(request, current_user, etag), load)
+
+Keys are per permission scope (role, path, sorted query) plus any extra
+parts the route adds; list routes add the page ETag computed before the
+read, so a request only shares a result that is at least as new as its own
+tag. Coalescing is per process. ``load`` gets a session of its own, since
+the request that started it may be gone before it finishes, and its result
+is handed to every waiter, so it must be treated as read-only (return data,
+not a ``Response``).
+
+Callers' sessions end their read transaction (a rollback) before waiting,
+returning the connection to the pool; otherwise a burst of waiters would
+hold every connection while the one query they wait for queues for another.
+Objects they loaded are detached first and stay readable.
+Only read-only routes may coalesce: a session with pending changes is
+refused.
+"""
+
+import asyncio
+from typing import Callable, Dict, Optional, TypeVar
+
+from fastapi import Request
+from sqlmodel import Session
+from starlette.concurrency import run_in_threadpool
+
+from app.core.config import settings
+from app.core.database import engine
+from app.core.metrics import SINGLEFLIGHT_REQUESTS, route_template
+from app.core.response_cache import scope_key
+from app.models.user import User
+
+T = TypeVar("T")
+
+_flights: Dict[str, "asyncio.Future"] = {}
+
+
+def flight_key(request: Request, user: User, *parts: str) -> Optional[str]:
+    """Coalescing key for this request; ``None`` when coalescing is disabled."""
+    if not settings.SINGLEFLIGHT_ENABLED:
+        return None
+    return ":".join((scope_key(request, user),) + parts)
+
+
+async def coalesce(
+    request: Request,
+    session: Session,
+    key: Optional[str],
+    load: Callable[[Session], T],
+) -> T:
+    """Run ``load`` in the threadpool, once for all concurrent callers with ``key``."""
+    if session.new or session.dirty or session.deleted:
+        raise RuntimeError("coalesce() needs a session without pending changes")
+    # Detach first: a rollback expires loaded objects (``current_user``),
+    # and touching them afterwards would check out a connection again
+    session.expunge_all()
+    session.rollback()
+
+    if key is None:
+        return await run_in_threadpool(_run, load)
+
+    route = route_template(request.scope)
+    flight = _flights.get(key)
+    if flight is not None:
+        SINGLEFLIGHT_REQUESTS.labels(route=route, result="coalesced").inc()
+        return await asyncio.shield(flight)
+
+    SINGLEFLIGHT_REQUESTS.labels(route=route, result="executed").inc()
+    # A task of its own, so waiters still get the result if the first
+    # request is cancelled
+    flight = asyncio.ensure_future(run_in_threadpool(_run, load))
+    _flights[key] = flight
+    flight.add_done_callback(lambda done: _land(key, done))
+    return await asyncio.shield(flight)
+
+
+def _run(load: Callable[[Session], T]) -> T:
+    with Session(engine) as session:
+        return load(session)
+
+
+def _land(key: str, flight: "asyncio.Future") -> None:
+    if _flights.get(key) is flight:
+        del _flights[key]
+    if not flight.cancelled():
+        flight.exception()  # waiters re-raise it; keeps asyncio from logging it as lost
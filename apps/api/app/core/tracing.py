@@ -0,0 +1,390 @@
+"""
+Request Tracing
+
+Minimal span tracing compatible with W3C Trace Context. Every request (and
+every background job) gets a trace id and a request id; both are added to
+log lines, and the trace id is returned in a ``traceparent`` response
+header. An incoming ``traceparent`` continues the caller's trace.
+
+Spans are recorded for a trace when it is head-sampled (the caller's sampled
+flag, or ``TRACE_SAMPLE_RATE``) or when tail sampling is on
+(``TRACE_TAIL_LATENCY_MS`` > 0): then every trace is recorded and kept only
+if its root took at least that long or failed. Unrecorded traces cost a
+context variable lookup per span. Finished traces are handed to a background
+thread that appends them to a JSON lines file or posts them to an OTLP/HTTP
+collector (``TRACE_EXPORTER``).
+"""
+
+import json
+import queue
+import random
+import re
+import threading
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+import httpx
+import structlog
+
+from app.core.config import settings
+from app.core.metrics import TRACE_SPANS_DROPPED, route_template
+
+logger = structlog.get_logger()
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+_MAX_SPANS_PER_TRACE = 2000
+
+# OTLP span kinds
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_SERVER = 2
+SPAN_KIND_CONSUMER = 5
+
+
+def _new_id(bits: int) -> str:
+    return "%0*x" % (bits // 4, random.getrandbits(bits) or 1)
+
+
+class Trace:
+    """Spans of one trace handled by this process."""
+
+    __slots__ = ("trace_id", "sampled", "recording", "spans", "request_id")
+
+    def __init__(self, trace_id: str, sampled: bool, recording: bool, request_id: Optional[str] = None):
+        self.trace_id = trace_id
+        self.sampled = sampled
+        self.recording = recording
+        self.spans: List["Span"] = []
+        self.request_id = request_id
+
+
+class Span:
+    """A timed operation. Use as a context manager to make it the current span."""
+
+    __slots__ = ("trace", "name", "kind", "span_id", "parent_id", "start_ns", "end_ns", "attributes", "error", "_token")
+
+    def __init__(
+        self,
+        trace: Trace,
+        name: str,
+        parent_id: Optional[str],
+        attributes: Dict[str, Any],
+        kind: int = SPAN_KIND_INTERNAL,
+    ):
+        self.trace = trace
+        self.name = name
+        self.kind = kind
+        self.span_id = _new_id(64)
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes = attributes
+        self.error: Optional[str] = None
+        self._token = None
+
+    @property
+    def recording(self) -> bool:
+        return self.trace.recording
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace.trace_id}-{self.span_id}-{'01' if self.trace.sampled else '00'}"
+
+    def set_attribute(self, key: str, value: Any):
+        self.attributes[key] = value
+
+    def set_error(self, error: BaseException):
+        self.error = f"{type(error).__name__}: {error}"[:500]
+
+    def finish(self, error: Optional[BaseException] = None):
+        self.end_ns = time.time_ns()
+        if error is not None:
+            self.set_error(error)
+        if self.trace.recording and len(self.trace.spans) < _MAX_SPANS_PER_TRACE:
+            self.trace.spans.append(self)
+
+    def __enter__(self):
+        self._token = _current.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _current.reset(self._token)
+        self.finish(exc)
+
+
+class _NoopSpan:
+    """Stand-in returned when the current trace is not recorded."""
+
+    recording = False
+
+    def set_attribute(self, key: str, value: Any):
+        pass
+
+    def set_error(self, error: BaseException):
+        pass
+
+    def finish(self, error: Optional[BaseException] = None):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        pass
+
+
+_NOOP = _NoopSpan()
+_current: ContextVar[Optional[Span]] = ContextVar("trace_span", default=None)
+
+
+def current_span() -> Optional[Span]:
+    return _current.get()
+
+
+def span(name: str, **attributes):
+    """Child span of the current span.
+
+    Use it in a ``with`` block to make it current, or call ``finish()``
+    when the operation ends.
+    """
+    parent = _current.get()
+    if parent is None or not parent.trace.recording:
+        return _NOOP
+    return Span(parent.trace, name, parent.span_id, attributes)
+
+
+def parse_traceparent(header: Optional[str]):
+    """``(trace_id, parent_span_id, sampled)`` from a W3C traceparent header."""
+    match = _TRACEPARENT.match((header or "").strip().lower())
+    if not match:
+        return None
+    trace_id, parent_id, flags = match.groups()
+    if trace_id == "0" * 32 or parent_id == "0" * 16:
+        return None
+    return trace_id, parent_id, bool(int(flags, 16) & 1)
+
+
+class start_trace:
+    """Root span of this process's part of a trace.
+
+    On exit the trace is exported if it was head-sampled, or if tail
+    sampling is on and the root was slow or failed.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        traceparent: Optional[str] = None,
+        kind: int = SPAN_KIND_INTERNAL,
+        request_id: Optional[str] = None,
+        **attributes,
+    ):
+        parent = parse_traceparent(traceparent)
+        if parent is not None:
+            trace_id, parent_id, sampled = parent
+        else:
+            trace_id, parent_id = _new_id(128), None
+            sampled = random.random() < settings.TRACE_SAMPLE_RATE
+        recording = sampled or settings.TRACE_TAIL_LATENCY_MS > 0
+        trace = Trace(trace_id, sampled, recording, request_id)
+        self.span = Span(trace, name, parent_id, attributes, kind)
+        self._token = None
+
+    def __enter__(self) -> Span:
+        self._token = _current.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb):
+        _current.reset(self._token)
+        root = self.span
+        root.finish(exc)
+        trace = root.trace
+        if not trace.recording:
+            return
+        duration_ms = (root.end_ns - root.start_ns) / 1e6
+        tail = settings.TRACE_TAIL_LATENCY_MS
+        if trace.sampled or (tail > 0 and (duration_ms >= tail or root.error)):
+            _export(trace.spans)
+
+
+def add_trace_context(logger, method_name, event_dict):
+    """structlog processor adding the request, trace and span ids."""
+    current = _current.get()
+    if current is not None:
+        if current.trace.request_id is not None:
+            event_dict.setdefault("request_id", current.trace.request_id)
+        event_dict.setdefault("trace_id", current.trace.trace_id)
+        event_dict.setdefault("span_id", current.span_id)
+    return event_dict
+
+
+class TracingMiddleware:
+    """Starts a trace per HTTP request and tags logs with a request id."""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = traceparent = None
+        for name, value in scope["headers"]:
+            if name == b"x-request-id":
+                request_id = value.decode("latin-1")[:128]
+            elif name == b"traceparent":
+                traceparent = value.decode("latin-1")
+        request_id = request_id or _new_id(128)
+        route = route_template(scope)
+
+        with start_trace(
+            f"{scope['method']} {route}",
+            traceparent,
+            SPAN_KIND_SERVER,
+            request_id,
+            **{"http.method": scope["method"], "http.route": route, "request.id": request_id},
+        ) as root:
+            async def send_wrapper(message):
+                if message["type"] == "http.response.start":
+                    root.set_attribute("http.status_code", message["status"])
+                    message = {
+                        **message,
+                        "headers": list(message.get("headers", [])) + [
+                            (b"x-request-id", request_id.encode("latin-1")),
+                            (b"traceparent", root.traceparent.encode()),
+                        ],
+                    }
+                await send(message)
+
+            await self.app(scope, receive, send_wrapper)
+
+
+# Export
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_span(s: Span) -> Dict[str, Any]:
+    encoded = {
+        "traceId": s.trace.trace_id,
+        "spanId": s.span_id,
+        "name": s.name,
+        "kind": s.kind,
+        "startTimeUnixNano": str(s.start_ns),
+        "endTimeUnixNano": str(s.end_ns),
+        "attributes": [{"key": k, "value": _otlp_value(v)} for k, v in s.attributes.items()],
+        "status": {"code": 2, "message": s.error} if s.error else {"code": 0},
+    }
+    if s.parent_id:
+        encoded["parentSpanId"] = s.parent_id
+    return encoded
+
+
+def encode_otlp(spans: List[Span]) -> Dict[str, Any]:
+    """OTLP/HTTP JSON ``ExportTraceServiceRequest`` body."""
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [
+                {"key": "service.name", "value": {"stringValue": settings.TRACE_SERVICE_NAME}},
+            ]},
+            "scopeSpans": [{
+                "scope": {"name": "faeflux.tracing"},
+                "spans": [_otlp_span(s) for s in spans],
+            }],
+        }]
+    }
+
+
+class SpanExporter:
+    """Background thread exporting finished traces in batches.
+
+    Traces are dropped (and counted) when the queue is full rather than
+    slowing requests down.
+    """
+
+    def __init__(self, kind: str, max_queue: int = 1000, batch_size: int = 512):
+        self.kind = kind
+        self.batch_size = batch_size
+        self._queue: queue.Queue = queue.Queue(max_queue)
+        self._client: Optional[httpx.Client] = None
+        self._thread = threading.Thread(target=self._run, name="span-exporter", daemon=True)
+
+    def start(self):
+        if self.kind == "otlp":
+            self._client = httpx.Client(timeout=5)
+        self._thread.start()
+
+    def stop(self, timeout: float = 5):
+        self._queue.put(None)
+        self._thread.join(timeout)
+        if self._client is not None:
+            self._client.close()
+
+    def submit(self, spans: List[Span]):
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            TRACE_SPANS_DROPPED.inc(len(spans))
+
+    def _run(self):
+        stopping = False
+        while not stopping:
+            item = self._queue.get()
+            batch: List[Span] = []
+            while item is not None:
+                batch.extend(item)
+                if len(batch) >= self.batch_size:
+                    break
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            stopping = item is None
+            if batch:
+                try:
+                    self._write(batch)
+                except Exception as e:
+                    TRACE_SPANS_DROPPED.inc(len(batch))
+                    logger.warning("Span export failed", exporter=self.kind, error=str(e))
+
+    def _write(self, batch: List[Span]):
+        if self.kind == "otlp":
+            response = self._client.post(settings.TRACE_OTLP_ENDPOINT, json=encode_otlp(batch))
+            response.raise_for_status()
+            return
+        with open(settings.TRACE_FILE, "a", encoding="utf-8") as f:
+            for s in batch:
+                f.write(json.dumps(_otlp_span(s), separators=(",", ":")) + "\n")
+
+
+_exporter: Optional[SpanExporter] = None
+
+
+def _export(spans: List[Span]):
+    if _exporter is not None and spans:
+        _exporter.submit(spans)
+
+
+def init_tracing():
+    """Start the exporter configured by ``TRACE_EXPORTER`` (file, otlp or none)."""
+    global _exporter
+    if settings.TRACE_EXPORTER not in ("file", "otlp"):
+        return
+    _exporter = SpanExporter(settings.TRACE_EXPORTER)
+    _exporter.start()
+
+
+def shutdown_tracing():
+    """Flush queued traces and stop the exporter."""
+    global _exporter
+    if _exporter is not None:
+        _exporter.stop()
+        _exporter = None
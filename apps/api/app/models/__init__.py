@@ -4,10 +4,20 @@ SQLModel Models
 
 from app.models.user import User, UserRole
 from app.models.asset import Asset, AssetType, AssetStatus
+from app.models.asset_import import AssetImport, AssetImportStatus
 from app.models.ticket import Ticket, TicketStatus, TicketPriority
 from app.models.site import Site
 from app.models.audit_log import AuditLog
 from app.models.agent import Agent, AgentStatus
+from app.models.fleet_counter import FleetCounter
+from app.models.job import Job, JobStatus
+from app.models.inventory import (
+    AgentSoftware,
+    AgentHardware,
+    InventoryChunk,
+    InventoryVersion,
+    InventoryVersionSection,
+)
 
 __all__ = [
     "User",
@@ -15,6 +25,8 @@ __all__ = [
     "Asset",
     "AssetType",
     "AssetStatus",
+    "AssetImport",
+    "AssetImportStatus",
     "Ticket",
     "TicketStatus",
     "TicketPriority",
@@ -22,4 +34,12 @@ __all__ = [
     "AuditLog",
     "Agent",
     "AgentStatus",
+    "FleetCounter",
+    "Job",
+    "JobStatus",
+    "AgentSoftware",
+    "AgentHardware",
+    "InventoryChunk",
+    "InventoryVersion",
+    "InventoryVersionSection",
 ]
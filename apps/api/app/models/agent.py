@@ -4,7 +4,9 @@ Agent Model
 
 from datetime import datetime
 from enum import Enum
-from typing import Optional, Dict
+from typing import Any, Dict, List, Optional
+from sqlalchemy import ForeignKey, Integer
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlmodel import SQLModel, Field, Column, JSON
 
 
@@ -32,7 +34,19 @@ class Agent(AgentBase, table=True):
     
     id: Optional[int] = Field(default=None, primary_key=True)
     last_heartbeat: Optional[datetime] = None
-    inventory_data: Optional[Dict] = Field(default=None, sa_column=Column(JSON))
+    # Stored as jsonb on PostgreSQL so path projections run without reparsing.
+    # Never loaded by list/get queries; read it through the inventory endpoint.
+    inventory_data: Optional[Dict] = Field(
+        default=None,
+        sa_column=Column(JSON().with_variant(JSONB(), "postgresql")),
+    )
+    inventory_updated_at: Optional[datetime] = None
+    asset_id: Optional[int] = Field(
+        default=None,
+        sa_column=Column(Integer, ForeignKey("asset.id", ondelete="SET NULL"), nullable=True),
+    )
+    asset_reconciled_at: Optional[datetime] = None
+    command_token_hash: Optional[str] = Field(default=None, max_length=64)
     created_at: datetime = Field(default_factory=datetime.utcnow)
     updated_at: datetime = Field(default_factory=datetime.utcnow)
 
@@ -66,6 +80,7 @@ class AgentResponse(SQLModel):
     ip_address: Optional[str] = None
     status: AgentStatus
     site_id: Optional[int] = None
+    asset_id: Optional[int] = None
     last_heartbeat: Optional[datetime] = None
     created_at: datetime
     updated_at: datetime
@@ -85,3 +100,48 @@ class AgentInventory(SQLModel):
     inventory: Dict
 
 
+
+
+class AgentCommandTokenResponse(SQLModel):
+    """Newly issued agent command token (shown once)."""
+    agent_id: int
+    command_token: str
+
+
+class AgentCommandCreate(SQLModel):
+    """Command dispatch request."""
+    action: str = Field(max_length=100)
+    payload: Dict = {}
+
+
+class AgentCommandBroadcast(AgentCommandCreate):
+    """Command fan-out request. Targets all agents if no filter is given."""
+    agent_ids: Optional[List[int]] = None
+    site_id: Optional[int] = None
+
+
+class AgentCommandResult(SQLModel):
+    """Command result submitted by an agent."""
+    hostname: str
+    status: str = "ok"  # ok, error
+    result: Optional[Any] = None
+
+
+class AgentCommandResponse(SQLModel):
+    """Command status response schema."""
+    id: str
+    agent_id: int
+    action: str
+    payload: Dict
+    status: str  # queued, delivered, completed, failed
+    result: Optional[Any] = None
+    created_at: datetime
+    delivered_at: Optional[datetime] = None
+    completed_at: Optional[datetime] = None
+
+
+class AgentCommandBroadcastResponse(SQLModel):
+    """Command fan-out response schema."""
+    dispatched: int
+    skipped: List[int] = []  # not connected, or too many pending commands
+    command_ids: Dict[int, str] = {}
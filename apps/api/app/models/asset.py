@@ -4,8 +4,8 @@ Asset Model
 
 from datetime import datetime
 from enum import Enum
-from typing import Optional, List, TYPE_CHECKING
-from sqlmodel import SQLModel, Field, Relationship, Column, Text
+from typing import Dict, Optional, List, TYPE_CHECKING
+from sqlmodel import SQLModel, Field, Relationship, Column, Index, Text
 
 if TYPE_CHECKING:
     from app.models.user import User
@@ -38,6 +38,8 @@ class AssetBase(SQLModel):
     asset_type: AssetType
     status: AssetStatus = Field(default=AssetStatus.ACTIVE)
     serial_number: Optional[str] = Field(default=None, max_length=255, index=True)
+    hostname: Optional[str] = Field(default=None, max_length=255, index=True)
+    mac_address: Optional[str] = Field(default=None, max_length=17, index=True)
     model: Optional[str] = Field(default=None, max_length=255)
     manufacturer: Optional[str] = Field(default=None, max_length=255)
     purchase_date: Optional[datetime] = None
@@ -51,6 +53,9 @@ class AssetBase(SQLModel):
 class Asset(AssetBase, table=True):
     """Asset table model."""
     __tablename__ = "asset"
+    __table_args__ = (
+        Index("ix_asset_id_updated_at", "id", "updated_at"),  # index-only ETag queries
+    )
     
     id: Optional[int] = Field(default=None, primary_key=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -72,6 +77,8 @@ class AssetCreate(SQLModel):
     asset_type: AssetType
     status: AssetStatus = AssetStatus.ACTIVE
     serial_number: Optional[str] = None
+    hostname: Optional[str] = None
+    mac_address: Optional[str] = None
     model: Optional[str] = None
     manufacturer: Optional[str] = None
     purchase_date: Optional[datetime] = None
@@ -88,6 +95,8 @@ class AssetUpdate(SQLModel):
     asset_type: Optional[AssetType] = None
     status: Optional[AssetStatus] = None
     serial_number: Optional[str] = None
+    hostname: Optional[str] = None
+    mac_address: Optional[str] = None
     model: Optional[str] = None
     manufacturer: Optional[str] = None
     purchase_date: Optional[datetime] = None
@@ -98,6 +107,11 @@ class AssetUpdate(SQLModel):
     site_id: Optional[int] = None
 
 
+class AssetBulkUpdate(AssetUpdate):
+    """Asset update schema for bulk requests."""
+    id: int
+
+
 class AssetResponse(SQLModel):
     """Asset response schema."""
     id: int
@@ -105,6 +119,8 @@ class AssetResponse(SQLModel):
     asset_type: AssetType
     status: AssetStatus
     serial_number: Optional[str] = None
+    hostname: Optional[str] = None
+    mac_address: Optional[str] = None
     model: Optional[str] = None
     manufacturer: Optional[str] = None
     purchase_date: Optional[datetime] = None
@@ -117,3 +133,21 @@ class AssetResponse(SQLModel):
     created_at: datetime
     updated_at: datetime
 
+
+
+class LicenseComplianceItem(SQLModel):
+    """Installs versus owned licenses for one product at one site."""
+    site_id: Optional[int] = None
+    product: str
+    licensed: int
+    installed: int
+    shortfall: int
+    compliant: bool
+    versions: Dict[str, int] = {}
+
+
+class LicenseComplianceResponse(SQLModel):
+    """License compliance report."""
+    generated_at: datetime
+    cached: bool
+    items: List[LicenseComplianceItem]
@@ -0,0 +1,57 @@
+"""
+Asset Import Model
+"""
+
+from datetime import datetime
+from enum import Enum
+from typing import Optional
+from sqlmodel import SQLModel, Field
+
+
+class AssetImportStatus(str, Enum):
+    """Asset import status."""
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+
+
+class AssetImport(SQLModel, table=True):
+    """Asset import job: an uploaded spreadsheet and its progress."""
+    __tablename__ = "asset_import"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    filename: str = Field(max_length=255)
+    file_format: str = Field(max_length=10)  # csv, xlsx
+    file_size: int = 0
+    status: AssetImportStatus = Field(default=AssetImportStatus.PENDING)
+    rows_processed: int = 0
+    rows_valid: int = 0
+    rows_failed: int = 0
+    assets_created: int = 0
+    assets_updated: int = 0
+    message: Optional[str] = Field(default=None, max_length=1000)
+    job_id: Optional[int] = Field(default=None, foreign_key="job.id")
+    created_by_id: int = Field(foreign_key="user.id")
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class AssetImportResponse(SQLModel):
+    """Asset import response schema."""
+    id: int
+    filename: str
+    file_format: str
+    file_size: int
+    status: AssetImportStatus
+    rows_processed: int
+    rows_valid: int
+    rows_failed: int
+    assets_created: int
+    assets_updated: int
+    message: Optional[str] = None
+    job_id: Optional[int] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
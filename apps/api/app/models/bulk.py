@@ -0,0 +1,24 @@
+"""
+Bulk Operation Schemas
+"""
+
+from typing import List, Optional
+from sqlmodel import SQLModel
+
+
+class BulkDeleteRequest(SQLModel):
+    """Bulk delete request schema."""
+    ids: List[int]
+
+
+class BulkItemResult(SQLModel):
+    """Outcome for one item of a bulk request."""
+    index: int
+    id: Optional[int] = None
+    status: str  # created, updated, deleted
+
+
+class BulkResponse(SQLModel):
+    """Bulk operation response schema."""
+    total: int
+    results: List[BulkItemResult]
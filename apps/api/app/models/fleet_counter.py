@@ -0,0 +1,23 @@
+"""
+Fleet Counter Model
+"""
+
+from typing import Dict
+from sqlmodel import SQLModel, Field
+
+
+class FleetCounter(SQLModel, table=True):
+    """Incrementally maintained agent count for one dimension value."""
+    __tablename__ = "fleet_counter"
+
+    dimension: str = Field(max_length=20, primary_key=True)  # status, os_type, site
+    key: str = Field(max_length=255, primary_key=True)
+    count: int = Field(default=0)
+
+
+class FleetSummaryResponse(SQLModel):
+    """Fleet summary response schema."""
+    total: int
+    by_status: Dict[str, int]
+    by_os_type: Dict[str, int]
+    by_site: Dict[str, int]
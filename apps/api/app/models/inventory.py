@@ -0,0 +1,101 @@
+"""
+Normalized Inventory Models
+"""
+
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+from sqlmodel import SQLModel, Field, Index, Column, JSON
+
+
+class AgentSoftware(SQLModel, table=True):
+    """Installed software projected from agent inventory."""
+    __tablename__ = "agent_software"
+    __table_args__ = (
+        Index("ix_agent_software_agent_name_version", "agent_id", "name", "version", unique=True),
+        Index("ix_agent_software_name_version_key", "name", "version_key"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    agent_id: int = Field(foreign_key="agent.id")
+    name: str = Field(max_length=255)  # normalized (lowercase) product name
+    version: str = Field(default="", max_length=100)
+    version_key: str = Field(default="", max_length=255)  # sortable form of version
+
+
+class AgentHardware(SQLModel, table=True):
+    """Hardware attribute projected from agent inventory."""
+    __tablename__ = "agent_hardware"
+    __table_args__ = (
+        Index("ix_agent_hardware_agent_component_attribute", "agent_id", "component", "attribute", unique=True),
+        Index("ix_agent_hardware_attribute_value", "attribute", "value"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    agent_id: int = Field(foreign_key="agent.id")
+    component: str = Field(max_length=100)
+    attribute: str = Field(max_length=100)
+    value: str = Field(default="", max_length=1024)
+
+
+class AgentSoftwareResponse(SQLModel):
+    """Fleet software query result."""
+    agent_id: int
+    hostname: str
+    name: str
+    version: str
+
+
+class InventoryChunk(SQLModel, table=True):
+    """Content-addressed inventory section, stored once per unique content."""
+    __tablename__ = "inventory_chunk"
+
+    digest: str = Field(primary_key=True, max_length=64)  # sha256 of canonical JSON
+    data: Any = Field(default=None, sa_column=Column(JSON))
+    size: int = Field(default=0)
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+class InventoryVersion(SQLModel, table=True):
+    """One recorded inventory snapshot of an agent."""
+    __tablename__ = "inventory_version"
+    __table_args__ = (
+        Index("ix_inventory_version_agent_version", "agent_id", "version", unique=True),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    agent_id: int = Field(foreign_key="agent.id")
+    version: int
+    created_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+
+
+class InventoryVersionSection(SQLModel, table=True):
+    """Manifest entry linking a version's section to its chunk."""
+    __tablename__ = "inventory_version_section"
+
+    version_id: int = Field(foreign_key="inventory_version.id", primary_key=True)
+    section: str = Field(max_length=100, primary_key=True)
+    digest: str = Field(foreign_key="inventory_chunk.digest", max_length=64, index=True)
+
+
+class InventoryVersionResponse(SQLModel):
+    """Inventory version response schema."""
+    version: int
+    created_at: datetime
+    sections: List[str]
+
+
+class AgentInventoryResponse(SQLModel):
+    """Agent inventory response: the whole document or the requested paths."""
+    agent_id: int
+    inventory: Optional[Dict[str, Any]] = None
+    paths: Optional[Dict[str, Any]] = None
+
+
+class InventoryDiffResponse(SQLModel):
+    """Inventory diff between two versions."""
+    agent_id: int
+    from_version: int
+    to_version: int
+    sections_added: Dict[str, Any] = {}
+    sections_removed: List[str] = []
+    sections_changed: Dict[str, Any] = {}
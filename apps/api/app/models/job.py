@@ -0,0 +1,68 @@
+"""
+Background Job Model
+"""
+
+from datetime import datetime
+from enum import Enum
+from typing import Any, Dict, Optional
+from sqlmodel import SQLModel, Field, Index, Column, JSON, Text
+
+
+class JobStatus(str, Enum):
+    """Job status."""
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+class Job(SQLModel, table=True):
+    """Queued unit of background work, claimed with FOR UPDATE SKIP LOCKED."""
+    __tablename__ = "job"
+    __table_args__ = (
+        Index("ix_job_status_run_after", "status", "run_after"),
+    )
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    kind: str = Field(max_length=100, index=True)
+    status: JobStatus = Field(default=JobStatus.QUEUED)
+    payload: Dict = Field(default_factory=dict, sa_column=Column(JSON))
+    result: Optional[Dict] = Field(default=None, sa_column=Column(JSON))
+    error: Optional[str] = Field(default=None, sa_column=Column(Text))
+    attempts: int = 0
+    max_attempts: int = 3
+    progress: float = 0.0  # 0..1
+    progress_message: Optional[str] = Field(default=None, max_length=500)
+    run_after: datetime = Field(default_factory=datetime.utcnow)
+    locked_by: Optional[str] = Field(default=None, max_length=100)
+    locked_at: Optional[datetime] = None
+    created_by_id: Optional[int] = Field(default=None, foreign_key="user.id")
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+
+class JobCreate(SQLModel):
+    """Job creation schema."""
+    kind: str
+    payload: Dict[str, Any] = {}
+
+
+class JobResponse(SQLModel):
+    """Job response schema."""
+    id: int
+    kind: str
+    status: JobStatus
+    payload: Dict[str, Any]
+    result: Optional[Dict[str, Any]] = None
+    error: Optional[str] = None
+    attempts: int
+    max_attempts: int
+    progress: float
+    progress_message: Optional[str] = None
+    run_after: datetime
+    created_by_id: Optional[int] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
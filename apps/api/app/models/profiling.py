@@ -0,0 +1,32 @@
+"""
+Profiling Schemas
+"""
+
+from typing import Dict, List
+from sqlmodel import SQLModel
+
+
+class CpuProfileResponse(SQLModel):
+    """Sampled stacks of one API process, collapsed stack -> sample count."""
+    pid: int
+    duration: float
+    samples: int
+    stacks: Dict[str, int]
+
+
+class MemoryStat(SQLModel):
+    """Allocation growth at one location."""
+    location: List[str]
+    size_bytes: int
+    size_diff_bytes: int
+    count: int
+    count_diff: int
+
+
+class MemoryDiffResponse(SQLModel):
+    """tracemalloc snapshot diff of one API process."""
+    pid: int
+    traced_bytes: int
+    peak_bytes: int
+    growth_bytes: int
+    top: List[MemoryStat]
@@ -4,7 +4,7 @@ Site Model
 
 from datetime import datetime
 from typing import Optional, List, TYPE_CHECKING
-from sqlmodel import SQLModel, Field, Relationship
+from sqlmodel import SQLModel, Field, Index, Relationship
 
 if TYPE_CHECKING:
     from app.models.user import User
@@ -26,6 +26,9 @@ class SiteBase(SQLModel):
 class Site(SiteBase, table=True):
     """Site table model."""
     __tablename__ = "site"
+    __table_args__ = (
+        Index("ix_site_id_updated_at", "id", "updated_at"),  # index-only ETag queries
+    )
     
     id: Optional[int] = Field(default=None, primary_key=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
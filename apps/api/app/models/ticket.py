@@ -5,7 +5,7 @@ Ticket Model
 from datetime import datetime
 from enum import Enum
 from typing import Optional, TYPE_CHECKING
-from sqlmodel import SQLModel, Field, Relationship, Column, Text
+from sqlmodel import SQLModel, Field, Relationship, Column, Index, Text
 
 if TYPE_CHECKING:
     from app.models.user import User
@@ -42,6 +42,9 @@ class TicketBase(SQLModel):
 class Ticket(TicketBase, table=True):
     """Ticket table model."""
     __tablename__ = "ticket"
+    __table_args__ = (
+        Index("ix_ticket_id_updated_at", "id", "updated_at"),  # index-only ETag queries
+    )
     
     id: Optional[int] = Field(default=None, primary_key=True)
     created_at: datetime = Field(default_factory=datetime.utcnow)
@@ -79,6 +82,13 @@ class TicketUpdate(SQLModel):
     assigned_to_id: Optional[int] = None
 
 
+class TicketBulkUpdate(SQLModel):
+    """Ticket status and assignment update for bulk requests."""
+    id: int
+    status: Optional[TicketStatus] = None
+    assigned_to_id: Optional[int] = None
+
+
 class TicketResponse(SQLModel):
     """Ticket response schema."""
     id: int
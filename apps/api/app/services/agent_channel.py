@@ -0,0 +1,162 @@
+"""
+Agent Command Channel
+
+Per-agent command queues shared by the WebSocket channel and the long-poll
+fallback. Commands are queued in the worker process that accepted them, so
+multi-worker deployments must route an agent's channel and the commands for
+it to the same worker (e.g. by running a single channel worker).
+
+An idle connection costs one small queue and one pending receive; results
+come back on the same connection and are kept for the most recent
+``max_tracked`` commands (or for the whole of a larger broadcast). Broadcasts
+only reach agents that are connected at the time; queues of agents that are
+gone are dropped once they drain.
+"""
+
+import asyncio
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+from uuid import uuid4
+
+
+class AgentChannelHub:
+    """Dispatches commands to connected agents and collects their results."""
+
+    def __init__(self, max_queued_per_agent: int = 100, max_tracked: int = 50000):
+        self.max_queued_per_agent = max_queued_per_agent
+        self.max_tracked = max_tracked
+        self._queues: Dict[int, asyncio.Queue] = {}
+        self._connections: Dict[int, int] = {}
+        self._commands: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+
+    @property
+    def connected_agents(self) -> int:
+        return len(self._connections)
+
+    @property
+    def queued_agents(self) -> int:
+        return len(self._queues)
+
+    def is_connected(self, agent_id: int) -> bool:
+        return agent_id in self._connections
+
+    def _queue(self, agent_id: int) -> asyncio.Queue:
+        queue = self._queues.get(agent_id)
+        if queue is None:
+            queue = asyncio.Queue(maxsize=self.max_queued_per_agent)
+            self._queues[agent_id] = queue
+        return queue
+
+    def connect(self, agent_id: int) -> asyncio.Queue:
+        """Register a connection and return the agent's command queue."""
+        self._connections[agent_id] = self._connections.get(agent_id, 0) + 1
+        return self._queue(agent_id)
+
+    def disconnect(self, agent_id: int):
+        """Unregister a connection; drop the queue if nothing is pending."""
+        count = self._connections.get(agent_id, 0) - 1
+        if count > 0:
+            self._connections[agent_id] = count
+            return
+        self._connections.pop(agent_id, None)
+        queue = self._queues.get(agent_id)
+        if queue is not None and queue.empty():
+            del self._queues[agent_id]
+
+    def dispatch(self, agent_id: int, action: str, payload: Dict) -> Dict[str, Any]:
+        """Queue a command for an agent.
+
+        Raises ``asyncio.QueueFull`` if the agent already has too many
+        undelivered commands.
+        """
+        command = self._enqueue(agent_id, action, payload)
+        self._trim(self.max_tracked)
+        return command
+
+    def _enqueue(self, agent_id: int, action: str, payload: Dict) -> Dict[str, Any]:
+        command = {
+            "id": uuid4().hex,
+            "agent_id": agent_id,
+            "action": action,
+            "payload": payload,
+            "status": "queued",
+            "result": None,
+            "created_at": datetime.utcnow(),
+            "delivered_at": None,
+            "completed_at": None,
+        }
+        self._queue(agent_id).put_nowait(
+            {"id": command["id"], "action": action, "payload": payload}
+        )
+
+        self._commands[command["id"]] = command
+        return command
+
+    def _trim(self, keep: int):
+        while len(self._commands) > keep:
+            self._commands.popitem(last=False)
+
+    def fan_out(
+        self,
+        agent_ids: Iterable[int],
+        action: str,
+        payload: Dict,
+    ) -> Tuple[Dict[int, str], List[int]]:
+        """Queue a command for many agents; returns ``(command_ids, skipped)``.
+
+        Agents that are not connected, or whose queue is full, are skipped.
+        Every command of the broadcast stays tracked even if it exceeds
+        ``max_tracked``.
+        """
+        command_ids = {}
+        skipped = []
+        for agent_id in agent_ids:
+            if not self.is_connected(agent_id):
+                skipped.append(agent_id)
+                continue
+            try:
+                command_ids[agent_id] = self._enqueue(agent_id, action, payload)["id"]
+            except asyncio.QueueFull:
+                skipped.append(agent_id)
+        self._trim(max(self.max_tracked, len(command_ids)))
+        return command_ids, skipped
+
+    def get(self, command_id: str) -> Optional[Dict[str, Any]]:
+        return self._commands.get(command_id)
+
+    def mark_delivered(self, command_id: str):
+        command = self._commands.get(command_id)
+        if command and command["status"] == "queued":
+            command["status"] = "delivered"
+            command["delivered_at"] = datetime.utcnow()
+
+    def complete(self, command_id: str, agent_id: int, status: str, result: Any) -> bool:
+        """Record a command result. Returns False for unknown commands."""
+        command = self._commands.get(command_id)
+        if not command or command["agent_id"] != agent_id:
+            return False
+        command["status"] = "completed" if status == "ok" else "failed"
+        command["result"] = result
+        command["completed_at"] = datetime.utcnow()
+        return True
+
+    async def poll(self, agent_id: int, timeout: float, max_commands: int = 100) -> List[Dict[str, Any]]:
+        """Wait up to ``timeout`` seconds for commands (long-poll fallback)."""
+        queue = self.connect(agent_id)
+        try:
+            first = await asyncio.wait_for(queue.get(), timeout)
+        except asyncio.TimeoutError:
+            return []
+        finally:
+            self.disconnect(agent_id)
+
+        commands = [first]
+        while len(commands) < max_commands and not queue.empty():
+            commands.append(queue.get_nowait())
+        for command in commands:
+            self.mark_delivered(command["id"])
+        return commands
+
+
+agent_channel_hub = AgentChannelHub()
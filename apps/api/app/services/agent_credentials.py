@@ -0,0 +1,45 @@
+"""
+Agent Command Credentials
+
+Agents report heartbeats and inventory by hostname alone, but receiving
+commands (and reporting their results) also needs the agent's command
+token, sent in the ``X-Agent-Token`` header. A token is issued when the
+heartbeat that registers the agent returns it, and can be reissued by an
+administrator (for agents registered before tokens existed, or after a
+leak). Only its SHA-256 is stored; reissuing replaces the previous token.
+"""
+
+import hashlib
+import hmac
+import secrets
+from typing import Optional
+
+from sqlmodel import Session, select
+
+from app.core.database import engine
+from app.models.agent import Agent
+
+AGENT_TOKEN_HEADER = "x-agent-token"
+
+
+def _digest(token: str) -> str:
+    return hashlib.sha256(token.encode()).hexdigest()
+
+
+def issue_command_token(session: Session, agent: Agent) -> str:
+    """Give ``agent`` a new command token and return it (it is not stored)."""
+    token = secrets.token_urlsafe(32)
+    agent.command_token_hash = _digest(token)
+    session.add(agent)
+    return token
+
+
+def verify_command_token(agent_id: int, token: Optional[str]) -> bool:
+    """Whether ``token`` is the current command token of the agent."""
+    if not token:
+        return False
+    with Session(engine) as session:
+        stored = session.exec(
+            select(Agent.command_token_hash).where(Agent.id == agent_id)
+        ).first()
+    return stored is not None and hmac.compare_digest(stored, _digest(token))
@@ -0,0 +1,326 @@
+"""
+Streaming Asset Import
+
+Loads assets from an uploaded CSV or XLSX file. Rows are read one at a time,
+validated against ``AssetCreate`` in chunks and the valid ones are streamed
+into a temporary staging table with PostgreSQL ``COPY``. A single ``MERGE``
+then updates assets with a matching serial number and inserts the rest, so
+the whole file lands in one transaction. Memory use depends on the chunk
+size, not the file size.
+
+Invalid rows are written to a CSV error report next to the upload; progress
+is committed to the ``asset_import`` row after every chunk.
+"""
+
+import csv
+import io
+import os
+import tempfile
+from datetime import datetime
+from typing import Any, BinaryIO, Callable, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert, text, update
+from sqlmodel import Session, select
+import structlog
+
+from app.core.config import settings
+from app.core.database import engine
+from app.core.response_cache import invalidate_after_commit
+from app.models.asset import AssetCreate
+from app.models.asset_import import AssetImport, AssetImportStatus
+from app.models.audit_log import AuditAction, AuditLog
+from app.models.site import Site
+
+try:
+    import openpyxl
+except ImportError:  # pragma: no cover - optional dependency
+    openpyxl = None
+
+logger = structlog.get_logger()
+
+SUPPORTED_FORMATS = ("csv", "xlsx")
+
+# AssetCreate fields in staging/COPY column order
+_COLUMNS = list(AssetCreate.model_fields)
+_ENUM_COLUMNS = {"asset_type", "status"}
+_COPY_NULL = r"\N"
+_STAGING = "asset_import_staging"
+
+
+def import_dir() -> str:
+    path = settings.ASSET_IMPORT_DIR or os.path.join(tempfile.gettempdir(), "faeflux-imports")
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def upload_path(import_id: int, file_format: str) -> str:
+    return os.path.join(import_dir(), f"asset-import-{import_id}.{file_format}")
+
+
+def save_upload(source: BinaryIO, path: str) -> Optional[int]:
+    """Copy an uploaded file to ``path`` (blocking; run it in the threadpool).
+
+    Returns the size, or None (and leaves no file) if it exceeds
+    ``MAX_UPLOAD_SIZE``.
+    """
+    size = 0
+    with open(path, "wb") as out:
+        while chunk := source.read(1024 * 1024):
+            size += len(chunk)
+            if size > settings.MAX_UPLOAD_SIZE:
+                break
+            out.write(chunk)
+    if size > settings.MAX_UPLOAD_SIZE:
+        os.remove(path)
+        return None
+    return size
+
+
+def error_report_path(import_id: int) -> str:
+    return os.path.join(import_dir(), f"asset-import-{import_id}-errors.csv")
+
+
+def detect_format(filename: str) -> Optional[str]:
+    """File format from the upload's extension, if supported and available."""
+    extension = os.path.splitext(filename or "")[1].lower().lstrip(".")
+    if extension not in SUPPORTED_FORMATS:
+        return None
+    if extension == "xlsx" and openpyxl is None:
+        return None
+    return extension
+
+
+def _normalize_header(header: Any) -> str:
+    return "_".join(str(header or "").strip().lower().split())
+
+
+def _read_rows(path: str, file_format: str) -> Iterator[Dict[str, Any]]:
+    """Yield rows as dicts keyed by normalized header, streaming the file."""
+    if file_format == "csv":
+        with open(path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.reader(f)
+            headers = [_normalize_header(h) for h in next(reader, [])]
+            for values in reader:
+                yield dict(zip(headers, values))
+        return
+
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        headers = [_normalize_header(h) for h in next(rows, ())]
+        for values in rows:
+            yield dict(zip(headers, values))
+    finally:
+        workbook.close()
+
+
+def _validate(row: Dict[str, Any]) -> AssetCreate:
+    data = {
+        key: value.strip() if isinstance(value, str) else value
+        for key, value in row.items()
+        if key in _COLUMNS
+    }
+    data = {key: value for key, value in data.items() if value not in (None, "")}
+    return AssetCreate.model_validate(data)
+
+
+def _format_errors(error: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in e['loc'])}: {e['msg']}" for e in error.errors()
+    )
+
+
+def _copy_value(column: str, value: Any) -> Any:
+    if value is None:
+        return _COPY_NULL
+    if column in _ENUM_COLUMNS:
+        return value.name  # enum columns store member names
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _copy_chunk(session: Session, rows: List[Tuple[int, AssetCreate]]):
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row_number, asset in rows:
+        writer.writerow([row_number] + [_copy_value(c, getattr(asset, c)) for c in _COLUMNS])
+    buffer.seek(0)
+
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {_STAGING} (row_number, {', '.join(_COLUMNS)}) "
+            f"FROM STDIN WITH (FORMAT csv, NULL '{_COPY_NULL}')",
+            buffer,
+        )
+    finally:
+        cursor.close()
+
+
+def _create_staging(session: Session):
+    # CREATE TABLE AS copies column types (including enums) but no constraints
+    session.execute(text(
+        f"CREATE TEMP TABLE {_STAGING} ON COMMIT DROP AS "
+        f"SELECT {', '.join(_COLUMNS)} FROM asset WITH NO DATA"
+    ))
+    session.execute(text(f"ALTER TABLE {_STAGING} ADD COLUMN row_number integer"))
+
+
+def _duplicate_serials(session: Session) -> List[Tuple[int, str]]:
+    """Rows whose serial number appears again later in the file."""
+    return session.execute(text(
+        f"SELECT row_number, serial_number FROM ("
+        f"  SELECT row_number, serial_number, row_number() OVER ("
+        f"    PARTITION BY serial_number ORDER BY row_number DESC) AS position"
+        f"  FROM {_STAGING} WHERE serial_number IS NOT NULL"
+        f") ranked WHERE position > 1 ORDER BY row_number"
+    )).all()
+
+
+def _merge(session: Session, created_by_id: int) -> Tuple[int, int]:
+    """Merge staged rows into ``asset``; returns ``(created, updated)``.
+
+    Rows with a serial number update every asset with that serial number
+    (the last such row in the file wins) and blank cells keep the current
+    value. All other rows are inserted.
+    """
+    assignments = ", ".join(
+        f"{c} = coalesce(s.{c}, a.{c})" for c in _COLUMNS if c != "serial_number"
+    )
+    columns = ", ".join(_COLUMNS)
+    source_columns = ", ".join(f"s.{c}" for c in _COLUMNS)
+    # One source row per serial number; rows without one are all kept
+    source_key = "serial_number, CASE WHEN serial_number IS NULL THEN row_number END"
+
+    updated = session.execute(text(
+        f"SELECT count(DISTINCT a.id) FROM asset a JOIN {_STAGING} s "
+        f"ON a.serial_number = s.serial_number"
+    )).scalar_one()
+
+    result = session.execute(
+        text(
+            f"MERGE INTO asset a "
+            f"USING (SELECT DISTINCT ON ({source_key}) * FROM {_STAGING} "
+            f"       ORDER BY {source_key}, row_number DESC) s "
+            f"ON s.serial_number IS NOT NULL AND a.serial_number = s.serial_number "
+            f"WHEN MATCHED THEN UPDATE SET {assignments}, updated_at = :now "
+            f"WHEN NOT MATCHED THEN INSERT ({columns}, created_by_id, created_at, updated_at) "
+            f"VALUES ({source_columns}, :created_by_id, :now, :now)"
+        ),
+        {"now": datetime.utcnow(), "created_by_id": created_by_id},
+    )
+    return result.rowcount - updated, updated
+
+
+def _set_progress(asset_import_id: int, **values):
+    with Session(engine) as session:
+        session.execute(
+            update(AssetImport).where(AssetImport.id == asset_import_id).values(**values)
+        )
+        session.commit()
+
+
+def run_asset_import(
+    asset_import_id: int,
+    on_progress: Optional[Callable[[Dict[str, int]], None]] = None,
+) -> Dict[str, Any]:
+    """Process an uploaded asset file. Safe to run in a worker thread.
+
+    ``on_progress`` is called with the row counters after every chunk.
+    """
+    with Session(engine) as session:
+        job = session.get(AssetImport, asset_import_id)
+        if job is None or job.status != AssetImportStatus.PENDING:
+            return {}
+        path = upload_path(job.id, job.file_format)
+        file_format, created_by_id, filename = job.file_format, job.created_by_id, job.filename
+        site_ids = set(session.exec(select(Site.id)).all())
+
+    _set_progress(asset_import_id, status=AssetImportStatus.RUNNING, started_at=datetime.utcnow())
+    counts = {"rows_processed": 0, "rows_valid": 0, "rows_failed": 0}
+    chunk_size = settings.ASSET_IMPORT_CHUNK_ROWS
+
+    try:
+        with Session(engine) as session, open(
+            error_report_path(asset_import_id), "w", newline="", encoding="utf-8"
+        ) as report:
+            errors = csv.writer(report)
+            errors.writerow(["row", "error"])
+            _create_staging(session)
+
+            chunk: List[Tuple[int, AssetCreate]] = []
+            # Row 1 is the header
+            for row_number, row in enumerate(_read_rows(path, file_format), start=2):
+                if not any(value not in (None, "") for value in row.values()):
+                    continue
+                counts["rows_processed"] += 1
+                try:
+                    asset = _validate(row)
+                except ValidationError as e:
+                    counts["rows_failed"] += 1
+                    errors.writerow([row_number, _format_errors(e)])
+                    continue
+                if asset.site_id is not None and asset.site_id not in site_ids:
+                    counts["rows_failed"] += 1
+                    errors.writerow([row_number, f"site_id: Site {asset.site_id} not found"])
+                    continue
+
+                chunk.append((row_number, asset))
+                if len(chunk) >= chunk_size:
+                    _copy_chunk(session, chunk)
+                    counts["rows_valid"] += len(chunk)
+                    chunk = []
+                    _set_progress(asset_import_id, **counts)
+                    if on_progress:
+                        on_progress(counts)
+
+            if chunk:
+                _copy_chunk(session, chunk)
+                counts["rows_valid"] += len(chunk)
+            _set_progress(asset_import_id, **counts)
+            if on_progress:
+                on_progress(counts)
+
+            for row_number, serial_number in _duplicate_serials(session):
+                errors.writerow([
+                    row_number,
+                    f"serial_number: {serial_number} repeated later in file; later row used",
+                ])
+
+            created, updated = _merge(session, created_by_id)
+            if created or updated:
+                invalidate_after_commit(session, "assets")
+            session.execute(insert(AuditLog).values(
+                user_id=created_by_id,
+                action=AuditAction.CREATE,
+                resource_type="asset_import",
+                resource_id=asset_import_id,
+                details=f"Imported {filename}: {created} assets created, {updated} updated",
+                created_at=datetime.utcnow(),
+            ))
+            session.commit()
+    except Exception as e:
+        logger.error("Asset import failed", asset_import_id=asset_import_id, error=str(e))
+        _set_progress(
+            asset_import_id,
+            status=AssetImportStatus.FAILED,
+            message=str(e)[:1000],
+            finished_at=datetime.utcnow(),
+            **counts,
+        )
+        raise
+    finally:
+        if os.path.exists(path):
+            os.remove(path)
+
+    result = {**counts, "assets_created": created, "assets_updated": updated}
+    _set_progress(
+        asset_import_id,
+        status=AssetImportStatus.COMPLETED,
+        finished_at=datetime.utcnow(),
+        **result,
+    )
+    logger.info("Asset import finished", asset_import_id=asset_import_id, **result)
+    return result
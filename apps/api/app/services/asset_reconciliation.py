@@ -0,0 +1,310 @@
+"""
+Inventory to Asset Reconciliation
+
+Links agents to ``Asset`` rows using the identity found in their inventory.
+Agents whose inventory changed since their last reconciliation are processed
+in batches; each batch is matched against the asset table with one query
+(hash joins on serial number, hostname and MAC address, best match per
+agent), then matched assets are updated and missing ones created in bulk,
+with an audit row for every change.
+"""
+
+import secrets
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import Integer, String, column, func, insert, literal, or_, union_all, update, values
+from sqlmodel import Session, select
+import structlog
+
+from app.core.auth import get_password_hash
+from app.core.response_cache import invalidate_after_commit
+from app.models.agent import Agent
+from app.models.asset import Asset, AssetStatus, AssetType
+from app.models.audit_log import AuditLog, AuditAction
+from app.models.inventory import AgentHardware
+from app.models.user import User, UserRole
+
+logger = structlog.get_logger()
+
+SYSTEM_USER_EMAIL = "system@faeflux.local"
+
+# Asset fields filled from inventory
+_IDENTITY_FIELDS = ("serial_number", "hostname", "mac_address", "manufacturer", "model")
+
+# Serial numbers firmware reports when none was set (compared lowercased)
+_PLACEHOLDER_SERIALS = {
+    "to be filled by o.e.m.",
+    "default string",
+    "system serial number",
+    "chassis serial number",
+    "not specified",
+    "not applicable",
+    "not available",
+    "none",
+    "n/a",
+    "na",
+    "unknown",
+    "invalid",
+    "0123456789",
+    "123456789",
+}
+
+
+def get_system_user_id(session: Session) -> int:
+    """Return the id of the (inactive) user that owns automated changes."""
+    user_id = session.exec(select(User.id).where(User.email == SYSTEM_USER_EMAIL)).first()
+    if user_id is not None:
+        return user_id
+
+    user = User(
+        email=SYSTEM_USER_EMAIL,
+        full_name="System",
+        hashed_password=get_password_hash(secrets.token_urlsafe(32)),
+        role=UserRole.VIEWER,
+        is_active=False,
+    )
+    session.add(user)
+    session.commit()
+    return user.id
+
+
+def normalize_mac(mac: Optional[str]) -> Optional[str]:
+    """Normalize a MAC address to ``aa:bb:cc:dd:ee:ff``."""
+    if not mac:
+        return None
+    digits = "".join(c for c in mac.lower() if c in "0123456789abcdef")
+    if len(digits) != 12 or digits == "000000000000":
+        return None
+    return ":".join(digits[i:i + 2] for i in range(0, 12, 2))
+
+
+def normalize_serial(serial: Optional[str]) -> Optional[str]:
+    """Return the serial number, or None for blanks and known placeholders."""
+    if not serial:
+        return None
+    serial = serial.strip()
+    if serial.lower() in _PLACEHOLDER_SERIALS or len(set(serial)) <= 1:
+        return None  # also "0", "00000000", "xxxxxxxx" and the like
+    return serial
+
+
+def _load_identities(session: Session, agents) -> Dict[int, Dict]:
+    """Collect identity attributes per agent from the normalized hardware table.
+
+    Serial numbers that are placeholders, or that several agents of the
+    batch report (cloned VMs, boards without a serial), identify nothing and
+    are left out.
+    """
+    identities = {
+        agent.id: {"hostname": agent.hostname, "macs": set()}
+        for agent in agents
+    }
+    statement = select(
+        AgentHardware.agent_id,
+        AgentHardware.component,
+        AgentHardware.attribute,
+        AgentHardware.value,
+    ).where(
+        AgentHardware.agent_id.in_(list(identities)),
+        AgentHardware.attribute.in_(["serial_number", "mac_address", "manufacturer", "model"]),
+    )
+    for agent_id, component, attribute, value in session.exec(statement).all():
+        identity = identities[agent_id]
+        if attribute == "mac_address":
+            mac = normalize_mac(value)
+            if mac:
+                identity["macs"].add(mac)
+        elif component == "system":
+            if attribute == "serial_number":
+                value = normalize_serial(value)
+            if value:
+                identity[attribute] = value
+
+    serials = Counter(identity.get("serial_number") for identity in identities.values())
+    for identity in identities.values():
+        if serials[identity.get("serial_number")] > 1:
+            identity.pop("serial_number", None)
+    return identities
+
+
+def _match_assets(session: Session, identities: Dict[int, Dict]) -> Dict[int, Asset]:
+    """Find the best matching asset per agent in a single query.
+
+    Serial number beats hostname beats MAC address.
+    """
+    rows = []
+    for agent_id, identity in identities.items():
+        macs = identity["macs"] or {None}
+        for mac in macs:
+            rows.append((agent_id, identity.get("serial_number"), identity["hostname"].lower(), mac))
+
+    candidate = values(
+        column("agent_id", Integer),
+        column("serial_number", String),
+        column("hostname", String),
+        column("mac_address", String),
+        name="candidate",
+    ).data(rows)
+
+    by_serial = select(
+        candidate.c.agent_id, Asset.id.label("asset_id"), literal(1).label("priority")
+    ).join(Asset, Asset.serial_number == candidate.c.serial_number)
+    by_hostname = select(
+        candidate.c.agent_id, Asset.id.label("asset_id"), literal(2).label("priority")
+    ).join(Asset, func.lower(Asset.hostname) == candidate.c.hostname)
+    by_mac = select(
+        candidate.c.agent_id, Asset.id.label("asset_id"), literal(3).label("priority")
+    ).join(Asset, func.lower(Asset.mac_address) == candidate.c.mac_address)
+    matches = union_all(by_serial, by_hostname, by_mac).subquery("match")
+
+    statement = (
+        select(matches.c.agent_id, Asset)
+        .join(Asset, Asset.id == matches.c.asset_id)
+        .distinct(matches.c.agent_id)
+        .order_by(matches.c.agent_id, matches.c.priority, Asset.id)
+    )
+    return {agent_id: asset for agent_id, asset in session.exec(statement).all()}
+
+
+def _reconcile_batch(session: Session, agents, system_user_id: int) -> Dict[str, int]:
+    now = datetime.utcnow()
+    identities = _load_identities(session, agents)
+    matched = _match_assets(session, identities)
+
+    asset_updates: List[Dict] = []
+    asset_inserts: List[Dict] = []
+    audit_rows: List[Dict] = []
+    links: Dict[int, Optional[int]] = {}
+
+    for agent in agents:
+        identity = identities[agent.id]
+        desired = {
+            "serial_number": identity.get("serial_number"),
+            "hostname": agent.hostname,
+            "mac_address": min(identity["macs"]) if identity["macs"] else None,
+            "manufacturer": identity.get("manufacturer"),
+            "model": identity.get("model"),
+        }
+        asset = matched.get(agent.id)
+
+        if asset is None:
+            asset_inserts.append({
+                "name": agent.hostname,
+                "asset_type": AssetType.COMPUTER,
+                "status": AssetStatus.ACTIVE,
+                "site_id": agent.site_id,
+                "created_by_id": system_user_id,
+                "created_at": now,
+                "updated_at": now,
+                **desired,
+            })
+            continue
+
+        links[agent.id] = asset.id
+        changes = {
+            field: value
+            for field, value in desired.items()
+            if value and getattr(asset, field) != value
+        }
+        if changes:
+            asset_updates.append({"id": asset.id, "updated_at": now, **changes})
+            audit_rows.append({
+                "resource_id": asset.id,
+                "action": AuditAction.UPDATE,
+                "details": f"Reconciled asset {asset.name} from agent {agent.hostname}: "
+                           + ", ".join(sorted(changes)),
+            })
+
+    if asset_updates:
+        session.execute(update(Asset), asset_updates)
+
+    if asset_inserts:
+        created = session.execute(
+            insert(Asset).returning(Asset.id, Asset.hostname), asset_inserts
+        ).all()
+        agent_ids = {agent.hostname: agent.id for agent in agents}
+        for asset_id, hostname in created:
+            links[agent_ids[hostname]] = asset_id
+            audit_rows.append({
+                "resource_id": asset_id,
+                "action": AuditAction.CREATE,
+                "details": f"Created asset {hostname} from agent inventory",
+            })
+
+    session.execute(
+        update(Agent),
+        [
+            {"id": agent.id, "asset_id": links.get(agent.id, agent.asset_id), "asset_reconciled_at": now}
+            for agent in agents
+        ],
+    )
+
+    if asset_inserts or asset_updates:
+        invalidate_after_commit(session, "assets")
+    if audit_rows:
+        session.execute(
+            insert(AuditLog),
+            [
+                {"user_id": system_user_id, "resource_type": "asset", "created_at": now, **row}
+                for row in audit_rows
+            ],
+        )
+
+    session.commit()
+    return {
+        "agents": len(agents),
+        "created": len(asset_inserts),
+        "updated": len(asset_updates),
+    }
+
+
+def reconcile_assets(
+    session: Session,
+    batch_size: int,
+    time_budget_seconds: float,
+) -> Dict:
+    """Reconcile agents with changed inventory until done or out of time.
+
+    Each batch is committed on its own, so a run that exceeds its budget
+    resumes where it stopped on the next invocation.
+    """
+    started = time.monotonic()
+    system_user_id = get_system_user_id(session)
+    totals = defaultdict(int)
+    completed = False
+
+    last_id = 0
+    while time.monotonic() - started < time_budget_seconds:
+        statement = (
+            select(Agent.id, Agent.hostname, Agent.site_id, Agent.asset_id)
+            .where(
+                Agent.id > last_id,
+                Agent.inventory_updated_at.is_not(None),
+                or_(
+                    Agent.asset_reconciled_at.is_(None),
+                    Agent.asset_reconciled_at < Agent.inventory_updated_at,
+                ),
+            )
+            .order_by(Agent.id)
+            .limit(batch_size)
+        )
+        agents = session.exec(statement).all()
+        if not agents:
+            completed = True
+            break
+
+        for key, value in _reconcile_batch(session, agents, system_user_id).items():
+            totals[key] += value
+        totals["batches"] += 1
+        last_id = agents[-1].id
+
+    result = {
+        **totals,
+        "completed": completed,
+        "elapsed_seconds": round(time.monotonic() - started, 2),
+    }
+    logger.info("Asset reconciliation finished", **result)
+    return result
@@ -0,0 +1,139 @@
+"""
+Bulk Write Helpers
+
+Shared by the bulk endpoints. A bulk request is validated as a whole before
+anything is written: any invalid item rejects the request with 422 and a
+per-item error list. Rows are then written with multi-row statements in the
+request's unit of work, together with one audit row per item.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple, Type
+
+from fastapi import HTTPException, Request, status
+from sqlalchemy import insert, update
+from sqlmodel import Session, SQLModel, select
+
+from app.core.config import settings
+from app.core.metrics import AUDIT_LOG_ENTRIES, RATE_LIMIT_REJECTIONS
+from app.core.security import bulk_row_limiter
+from app.core.tracing import span
+from app.models.audit_log import AuditAction, AuditLog
+from app.models.bulk import BulkItemResult, BulkResponse
+from app.models.user import User
+
+
+def check_batch(current_user: User, items: Sequence, max_items: Optional[int] = None) -> None:
+    """Reject empty or oversized batches and charge the row rate limit.
+
+    ``max_items`` defaults to ``BULK_MAX_ITEMS``.
+    """
+    max_items = max_items or settings.BULK_MAX_ITEMS
+    if not items:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="No items given",
+        )
+    if len(items) > max_items:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {max_items} items per request",
+        )
+    retry_after = bulk_row_limiter.consume(str(current_user.id), len(items))
+    if retry_after:
+        RATE_LIMIT_REJECTIONS.labels("bulk_rows").inc()
+        raise HTTPException(
+            status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+            detail=f"Bulk row limit of {settings.BULK_ROWS_PER_MINUTE}/minute exceeded",
+            headers={"Retry-After": str(retry_after)},
+        )
+
+
+def reject_invalid(errors: List[Dict[str, Any]]) -> None:
+    """Fail the whole request if any item is invalid."""
+    if errors:
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=errors,
+        )
+
+
+def find_duplicates(values: Iterable, label: str) -> List[Dict[str, Any]]:
+    """Errors for items repeating a value already used earlier in the batch."""
+    errors = []
+    seen = set()
+    for index, value in enumerate(values):
+        if value in seen:
+            errors.append({"index": index, "error": f"Duplicate {label} in request"})
+        seen.add(value)
+    return errors
+
+
+def insert_rows(session: Session, model: Type[SQLModel], rows: List[Dict]) -> List[int]:
+    """Insert rows with multi-row INSERT ... RETURNING; ids in input order."""
+    statement = insert(model).returning(model.id, sort_by_parameter_order=True)
+    return list(session.execute(statement, rows).scalars())
+
+
+def update_rows(session: Session, model: Type[SQLModel], rows: List[Dict]) -> None:
+    """Update rows by primary key; rows with the same columns share a statement."""
+    session.execute(update(model), rows)
+
+
+def add_audit_rows(
+    session: Session,
+    request: Request,
+    user_id: int,
+    action: AuditAction,
+    resource_type: str,
+    entries: Iterable[Tuple[Optional[int], str]],
+) -> None:
+    """Insert one audit row per ``(resource_id, details)`` entry."""
+    now = datetime.utcnow()
+    ip_address = request.client.host if request.client else None
+    user_agent = request.headers.get("user-agent")
+    rows = [
+        {
+            "user_id": user_id,
+            "action": action,
+            "resource_type": resource_type,
+            "resource_id": resource_id,
+            "details": details,
+            "ip_address": ip_address,
+            "user_agent": user_agent,
+            "created_at": now,
+        }
+        for resource_id, details in entries
+    ]
+    if rows:
+        with span("audit.write", **{"audit.resource_type": resource_type, "audit.rows": len(rows)}):
+            session.execute(insert(AuditLog), rows)
+        AUDIT_LOG_ENTRIES.labels(resource_type).inc(len(rows))
+
+
+def bulk_response(ids: Sequence[int], result_status: str) -> BulkResponse:
+    return BulkResponse(
+        total=len(ids),
+        results=[
+            BulkItemResult(index=index, id=item_id, status=result_status)
+            for index, item_id in enumerate(ids)
+        ],
+    )
+
+
+def missing_references(
+    session: Session,
+    model: Type[SQLModel],
+    values: Sequence[Optional[int]],
+    label: str,
+) -> List[Dict[str, Any]]:
+    """Errors for items referring to ``model`` rows that do not exist."""
+    wanted = {value for value in values if value is not None}
+    if not wanted:
+        return []
+    found = set(session.exec(select(model.id).where(model.id.in_(wanted))).all())
+    return [
+        {"index": index, "error": f"{label} {value} not found"}
+        for index, value in enumerate(values)
+        if value is not None and value not in found
+    ]
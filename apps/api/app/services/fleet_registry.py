@@ -0,0 +1,247 @@
+"""
+Fleet Registry
+
+Process-local hostname -> agent index used by the agent ingest endpoints so
+heartbeats and inventory submissions can resolve an agent without a lookup
+query. The registry is loaded with a single scan at startup, updated by the
+ingest path and rebuilt periodically from the database to correct drift
+(e.g. agents registered through another worker).
+
+Rows are stored column-wise in ``array`` buffers and hostnames are packed
+into one ``bytearray``; lookups go through a sorted array of 64-bit hostname
+hashes. 100k agents with typical FQDNs take about 6 MB.
+"""
+
+import hashlib
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlmodel import Session, select
+import structlog
+
+from app.core.database import engine
+from app.models.agent import Agent, AgentStatus
+
+logger = structlog.get_logger()
+
+_STATUSES = list(AgentStatus)
+_STATUS_CODES = {s: i for i, s in enumerate(_STATUSES)}
+_NO_SITE = -1
+
+
+class AgentEntry(NamedTuple):
+    """Cached agent metadata."""
+    agent_id: int
+    hostname: str
+    status: AgentStatus
+    os_type: str
+    site_id: Optional[int]
+
+
+def _hostname_hash(encoded: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(encoded, digest_size=8).digest(), "little")
+
+
+class _Columns:
+    """Column storage for one registry generation."""
+
+    def __init__(self):
+        self.hashes = array("Q")      # sorted hostname hashes
+        self.slots = array("I")       # row index for each entry in ``hashes``
+        self.names = bytearray()      # utf-8 hostnames, back to back
+        self.name_ends = array("I")   # end offset of each row's hostname
+        self.agent_ids = array("q")
+        self.statuses = array("B")
+        self.os_types = array("H")    # index into ``os_type_values``
+        self.site_ids = array("q")
+        self.os_type_values = []
+        self.os_type_codes = {}
+
+    def os_type_code(self, os_type: str) -> int:
+        code = self.os_type_codes.get(os_type)
+        if code is None:
+            code = len(self.os_type_values)
+            self.os_type_values.append(os_type)
+            self.os_type_codes[os_type] = code
+        return code
+
+    def hostname(self, row: int) -> bytes:
+        start = self.name_ends[row - 1] if row else 0
+        return bytes(self.names[start:self.name_ends[row]])
+
+    def find(self, encoded: bytes, hashed: int) -> Tuple[int, Optional[int]]:
+        """Return ``(position in hashes, row)``; row is None if absent."""
+        position = bisect_left(self.hashes, hashed)
+        index = position
+        while index < len(self.hashes) and self.hashes[index] == hashed:
+            row = self.slots[index]
+            if self.hostname(row) == encoded:
+                return index, row
+            index += 1
+        return position, None
+
+    def append(self, encoded: bytes, agent_id: int, status: AgentStatus, os_type: str, site_id: Optional[int]) -> int:
+        row = len(self.agent_ids)
+        self.names += encoded
+        self.name_ends.append(len(self.names))
+        self.agent_ids.append(agent_id)
+        self.statuses.append(_STATUS_CODES[status])
+        self.os_types.append(self.os_type_code(os_type))
+        self.site_ids.append(_NO_SITE if site_id is None else site_id)
+        return row
+
+    def set(self, row: int, agent_id: int, status: AgentStatus, os_type: str, site_id: Optional[int]):
+        self.agent_ids[row] = agent_id
+        self.statuses[row] = _STATUS_CODES[status]
+        self.os_types[row] = self.os_type_code(os_type)
+        self.site_ids[row] = _NO_SITE if site_id is None else site_id
+
+    def entry(self, row: int) -> AgentEntry:
+        site_id = self.site_ids[row]
+        return AgentEntry(
+            agent_id=self.agent_ids[row],
+            hostname=self.hostname(row).decode("utf-8"),
+            status=_STATUSES[self.statuses[row]],
+            os_type=self.os_type_values[self.os_types[row]],
+            site_id=None if site_id == _NO_SITE else site_id,
+        )
+
+    def nbytes(self) -> int:
+        buffers = (
+            self.hashes, self.slots, self.name_ends, self.agent_ids,
+            self.statuses, self.os_types, self.site_ids,
+        )
+        return len(self.names) + sum(a.itemsize * len(a) for a in buffers)
+
+
+class FleetRegistry:
+    """Compact, thread-safe hostname -> agent index."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._columns = _Columns()
+        self._loaded = False
+
+    @property
+    def loaded(self) -> bool:
+        return self._loaded
+
+    def __len__(self) -> int:
+        return len(self._columns.hashes)
+
+    def nbytes(self) -> int:
+        """Approximate memory used by the column buffers."""
+        return self._columns.nbytes()
+
+    def get(self, hostname: str) -> Optional[AgentEntry]:
+        """Look up an agent by hostname."""
+        encoded = hostname.encode("utf-8")
+        hashed = _hostname_hash(encoded)
+        with self._lock:
+            columns = self._columns
+            _, row = columns.find(encoded, hashed)
+            return None if row is None else columns.entry(row)
+
+    def agent_ids(self, site_id: Optional[int] = None) -> List[int]:
+        """List registered agent ids, optionally limited to a site."""
+        with self._lock:
+            columns = self._columns
+            if site_id is None:
+                return [columns.agent_ids[row] for row in columns.slots]
+            return [
+                columns.agent_ids[row]
+                for row in columns.slots
+                if columns.site_ids[row] == site_id
+            ]
+
+    def upsert(
+        self,
+        agent_id: int,
+        hostname: str,
+        status: AgentStatus,
+        os_type: str,
+        site_id: Optional[int] = None,
+    ):
+        """Insert or update an agent."""
+        encoded = hostname.encode("utf-8")
+        hashed = _hostname_hash(encoded)
+        with self._lock:
+            columns = self._columns
+            position, row = columns.find(encoded, hashed)
+            if row is not None:
+                columns.set(row, agent_id, status, os_type, site_id)
+                return
+            row = columns.append(encoded, agent_id, status, os_type, site_id)
+            columns.hashes.insert(position, hashed)
+            columns.slots.insert(position, row)
+
+    def discard(self, hostname: str):
+        """Forget an agent. Its row is reclaimed on the next rebuild."""
+        encoded = hostname.encode("utf-8")
+        hashed = _hostname_hash(encoded)
+        with self._lock:
+            columns = self._columns
+            position, row = columns.find(encoded, hashed)
+            if row is not None:
+                del columns.hashes[position]
+                del columns.slots[position]
+
+    def rebuild(self, rows: Iterable[Tuple[int, str, AgentStatus, str, Optional[int]]]):
+        """Replace the registry contents with ``(id, hostname, status, os_type, site_id)`` rows."""
+        columns = _Columns()
+        keyed = []
+        for agent_id, hostname, status, os_type, site_id in rows:
+            encoded = hostname.encode("utf-8")
+            row = columns.append(encoded, agent_id, status, os_type, site_id)
+            keyed.append((_hostname_hash(encoded), row))
+        keyed.sort()
+        columns.hashes = array("Q", (hashed for hashed, _ in keyed))
+        columns.slots = array("I", (row for _, row in keyed))
+
+        with self._lock:
+            self._columns = columns
+            self._loaded = True
+
+    def load(self, session: Session):
+        """Rebuild the registry with a single scan of the agent table."""
+        statement = select(Agent.id, Agent.hostname, Agent.status, Agent.os_type, Agent.site_id)
+        self.rebuild(session.exec(statement).all())
+        logger.info("Fleet registry loaded", agents=len(self), bytes=self.nbytes())
+
+
+fleet_registry = FleetRegistry()
+
+
+def resolve_agent(session: Session, hostname: str) -> Optional[AgentEntry]:
+    """Resolve an agent by hostname, falling back to the database on a miss."""
+    entry = fleet_registry.get(hostname)
+    if entry is not None:
+        return entry
+
+    statement = select(
+        Agent.id, Agent.hostname, Agent.status, Agent.os_type, Agent.site_id
+    ).where(Agent.hostname == hostname)
+    row = session.exec(statement).first()
+    if row is None:
+        return None
+
+    fleet_registry.upsert(*row)
+    return AgentEntry(*row)
+
+
+def resolve_agent_detached(hostname: str) -> Optional[AgentEntry]:
+    """Resolve an agent without holding a session (for long-lived connections)."""
+    entry = fleet_registry.get(hostname)
+    if entry is not None:
+        return entry
+    with Session(engine) as session:
+        return resolve_agent(session, hostname)
+
+
+def reload_fleet_registry():
+    """Reload the registry from the database."""
+    with Session(engine) as session:
+        fleet_registry.load(session)
+
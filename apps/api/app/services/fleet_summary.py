@@ -0,0 +1,150 @@
+"""
+Fleet Summary Counters
+
+Agent counts by status, OS type and site kept in ``fleet_counter`` and
+adjusted on every transition (new agent, heartbeat bringing an agent online,
+offline sweep, manual edits), so the summary is a read of a few rows instead
+of a ``GROUP BY`` over the agent table. A periodic full recount corrects any
+drift.
+"""
+
+from collections import Counter
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, text, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import Session, select
+import structlog
+
+from app.core.database import engine
+from app.models.agent import Agent, AgentStatus
+from app.models.fleet_counter import FleetCounter
+from app.services.fleet_registry import fleet_registry
+
+logger = structlog.get_logger()
+
+# (status, os_type, site_id) of an agent
+AgentDimensions = Tuple[AgentStatus, str, Optional[int]]
+
+_NO_SITE = "none"
+
+
+def _keys(dimensions: AgentDimensions) -> Iterable[Tuple[str, str]]:
+    status, os_type, site_id = dimensions
+    yield "status", AgentStatus(status).value
+    yield "os_type", os_type
+    yield "site", _NO_SITE if site_id is None else str(site_id)
+
+
+def transition_deltas(
+    before: Optional[AgentDimensions],
+    after: Optional[AgentDimensions],
+) -> Counter:
+    """Counter deltas for an agent moving from ``before`` to ``after``."""
+    deltas = Counter()
+    if before is not None:
+        for key in _keys(before):
+            deltas[key] -= 1
+    if after is not None:
+        for key in _keys(after):
+            deltas[key] += 1
+    return deltas
+
+
+def apply_deltas(session: Session, deltas: Counter):
+    """Add deltas to the counters. The caller owns the transaction."""
+    rows = [
+        {"dimension": dimension, "key": key, "count": delta}
+        for (dimension, key), delta in deltas.items()
+        if delta
+    ]
+    if not rows:
+        return
+    statement = pg_insert(FleetCounter).values(rows)
+    session.execute(
+        statement.on_conflict_do_update(
+            index_elements=["dimension", "key"],
+            set_={"count": FleetCounter.count + statement.excluded.count},
+        )
+    )
+
+
+def read_summary(session: Session) -> Dict:
+    """Read the fleet summary from the counters."""
+    summary = {"status": {}, "os_type": {}, "site": {}}
+    statement = select(FleetCounter).where(FleetCounter.count > 0)
+    for counter in session.exec(statement).all():
+        summary.setdefault(counter.dimension, {})[counter.key] = counter.count
+    return {
+        "total": sum(summary["status"].values()),
+        "by_status": summary["status"],
+        "by_os_type": summary["os_type"],
+        "by_site": summary["site"],
+    }
+
+
+def recount_fleet_counters(session: Session):
+    """Rebuild all counters from the agent table."""
+    # Block concurrent increments so they are not lost between count and swap
+    session.execute(text("LOCK TABLE fleet_counter IN EXCLUSIVE MODE"))
+
+    rows = []
+    for dimension, column in (
+        ("status", Agent.status),
+        ("os_type", Agent.os_type),
+        ("site", Agent.site_id),
+    ):
+        statement = select(column, func.count()).group_by(column)
+        for value, count in session.exec(statement).all():
+            if dimension == "status":
+                key = AgentStatus(value).value
+            elif dimension == "site":
+                key = _NO_SITE if value is None else str(value)
+            else:
+                key = value
+            rows.append({"dimension": dimension, "key": key, "count": count})
+
+    session.execute(delete(FleetCounter))
+    if rows:
+        session.execute(insert(FleetCounter), rows)
+    session.commit()
+
+
+def sweep_offline_agents(session: Session, offline_after_seconds: int) -> int:
+    """Mark agents offline whose last heartbeat is too old."""
+    cutoff = datetime.utcnow() - timedelta(seconds=offline_after_seconds)
+    statement = (
+        update(Agent)
+        .where(Agent.status == AgentStatus.ONLINE, Agent.last_heartbeat < cutoff)
+        .values(status=AgentStatus.OFFLINE)
+        .returning(Agent.id, Agent.hostname, Agent.os_type, Agent.site_id)
+    )
+    swept = session.execute(statement).all()
+
+    deltas = Counter()
+    for _, _, os_type, site_id in swept:
+        deltas.update(transition_deltas(
+            (AgentStatus.ONLINE, os_type, site_id),
+            (AgentStatus.OFFLINE, os_type, site_id),
+        ))
+    apply_deltas(session, deltas)
+    session.commit()
+
+    for agent_id, hostname, os_type, site_id in swept:
+        fleet_registry.upsert(agent_id, hostname, AgentStatus.OFFLINE, os_type, site_id)
+    if swept:
+        logger.info("Agents marked offline", count=len(swept))
+    return len(swept)
+
+
+def run_recount():
+    """Recount fleet counters (periodic task)."""
+    with Session(engine) as session:
+        recount_fleet_counters(session)
+
+
+def run_offline_sweep(offline_after_seconds: int):
+    """Mark stale agents offline (periodic task)."""
+    with Session(engine) as session:
+        sweep_offline_agents(session, offline_after_seconds)
@@ -0,0 +1,88 @@
+"""
+Heartbeat Pacing
+
+Computes the ``next_heartbeat_in`` directive returned to agents. Every
+heartbeat is booked into a slot on a schedule whose slots are at least
+``1 / ingest_ceiling`` seconds apart, so the arrivals the server asks for
+never exceed the ingest ceiling: a fleet reconnecting at once after an
+outage is spread out instead of coming back in lockstep. The base interval is
+stretched when the database pool or the ingest rate is close to saturation.
+No directive is longer than ``max_interval``.
+"""
+
+import threading
+import time
+from typing import Dict, Optional
+
+
+class HeartbeatPacer:
+    """Server-side heartbeat scheduler."""
+
+    def __init__(
+        self,
+        base_interval: float,
+        max_interval: float,
+        ingest_ceiling: float,
+        load_threshold: float = 0.7,
+    ):
+        self.base_interval = base_interval
+        self.max_interval = max_interval
+        self.ingest_ceiling = ingest_ceiling
+        self.load_threshold = load_threshold
+        self._lock = threading.Lock()
+        self._next_slot = 0.0
+        self._second = 0
+        self._second_count = 0
+        self._arrival_rate = 0.0
+
+    def _record_arrival(self, now: float):
+        second = int(now)
+        if second != self._second:
+            # Rate of the last complete second; 0 if it was skipped entirely
+            self._arrival_rate = self._second_count if second == self._second + 1 else 0.0
+            self._second = second
+            self._second_count = 0
+        self._second_count += 1
+
+    def schedule(
+        self,
+        fleet_size: int,
+        pool_saturation: float = 0.0,
+        now: Optional[float] = None,
+    ) -> Dict[str, float]:
+        """Book the next heartbeat of an agent and return its directives.
+
+        ``next_heartbeat_in`` is when the agent should report again and
+        ``jitter`` is the random spread it should add when reconnecting after
+        a failure.
+        """
+        with self._lock:
+            now = time.monotonic() if now is None else now
+            self._record_arrival(now)
+
+            # Never ask for more than the ceiling in steady state
+            fleet_window = fleet_size / self.ingest_ceiling
+            interval = max(self.base_interval, fleet_window)
+
+            # Stretch under load
+            load = max(pool_saturation, self._arrival_rate / self.ingest_ceiling)
+            if load > self.load_threshold:
+                interval *= 1 + (load - self.load_threshold) / (1 - self.load_threshold)
+            # Start booking early enough that the whole fleet fits in slots
+            # before max_interval
+            interval = min(interval, max(self.max_interval - fleet_window, self.base_interval))
+
+            # Arrivals beyond the ceiling (agents ignoring the directive,
+            # several workers) share slots at the cap instead of booking
+            # the schedule ever further ahead
+            spacing = 1.0 / self.ingest_ceiling
+            slot = min(max(now + interval, self._next_slot), now + self.max_interval)
+            self._next_slot = slot + spacing
+
+            delay = slot - now
+            jitter = min(max(interval * 0.1, fleet_window), self.max_interval)
+
+        return {
+            "next_heartbeat_in": round(delay, 3),
+            "jitter": round(jitter, 3),
+        }
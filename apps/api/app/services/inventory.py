@@ -0,0 +1,167 @@
+"""
+Inventory Projection Service
+
+Projects submitted agent inventory into the normalized ``agent_software`` and
+``agent_hardware`` tables so fleet-wide questions can be answered with
+indexed queries instead of loading every inventory blob.
+
+Expected inventory shape::
+
+    {
+        "software": [{"name": "OpenSSL", "version": "1.1.1k"}, ...],
+        "hardware": {
+            "system": {"manufacturer": "Dell", "serial_number": "ABC123"},
+            "network": [{"name": "eth0", "mac_address": "00:11:22:33:44:55"}],
+            "memory_mb": 16384,
+        },
+    }
+"""
+
+import re
+from typing import Dict, Set, Tuple
+from sqlalchemy import delete, insert, tuple_
+from sqlmodel import Session, select
+
+from app.models.inventory import AgentSoftware, AgentHardware
+
+_VERSION_TOKEN = re.compile(r"\d+|[A-Za-z]+")
+
+
+def normalize_software_name(name: str) -> str:
+    """Normalize a product name for lookups."""
+    return " ".join(str(name).split()).lower()[:255]
+
+
+def version_sort_key(version: str) -> str:
+    """Build a key whose string order matches version order.
+
+    Numeric parts are zero padded so ``"1.10"`` sorts after ``"1.9"`` and
+    range predicates can use the ``(name, version_key)`` index.
+    """
+    parts = []
+    for token in _VERSION_TOKEN.findall(version or ""):
+        parts.append(token.zfill(10) if token.isdigit() else token.lower())
+    return ".".join(parts)[:255]
+
+
+def extract_software(inventory: Dict) -> Set[Tuple[str, str]]:
+    """Extract ``(name, version)`` pairs from an inventory snapshot."""
+    result = set()
+    for item in inventory.get("software") or []:
+        if isinstance(item, dict):
+            name = item.get("name")
+            version = item.get("version")
+        else:
+            name, version = item, None
+        if not name:
+            continue
+        result.add((normalize_software_name(name), str(version or "")[:100]))
+    return result
+
+
+def extract_hardware(inventory: Dict) -> Set[Tuple[str, str, str]]:
+    """Flatten the hardware section into ``(component, attribute, value)`` triples."""
+    hardware = inventory.get("hardware") or {}
+    if not isinstance(hardware, dict):
+        return set()
+
+    result = {}
+
+    def add(component: str, attributes: Dict):
+        for attribute, value in attributes.items():
+            if value is None or isinstance(value, (dict, list)):
+                continue
+            result[(component[:100], str(attribute)[:100])] = str(value)[:1024]
+
+    for component, data in hardware.items():
+        if isinstance(data, dict):
+            add(component, data)
+        elif isinstance(data, list):
+            for index, item in enumerate(data):
+                if isinstance(item, dict):
+                    add(f"{component}[{index}]", item)
+        elif data is not None:
+            add("system", {component: data})
+
+    return {(component, attribute, value) for (component, attribute), value in result.items()}
+
+
+def _sync_software(session: Session, agent_id: int, desired: Set[Tuple[str, str]]) -> bool:
+    """Apply a set-based diff to the agent's software rows."""
+    statement = select(AgentSoftware.name, AgentSoftware.version).where(
+        AgentSoftware.agent_id == agent_id
+    )
+    current = {tuple(row) for row in session.exec(statement).all()}
+
+    removed = current - desired
+    added = desired - current
+
+    if removed:
+        session.execute(
+            delete(AgentSoftware).where(
+                AgentSoftware.agent_id == agent_id,
+                tuple_(AgentSoftware.name, AgentSoftware.version).in_(list(removed)),
+            )
+        )
+    if added:
+        session.execute(
+            insert(AgentSoftware),
+            [
+                {
+                    "agent_id": agent_id,
+                    "name": name,
+                    "version": version,
+                    "version_key": version_sort_key(version),
+                }
+                for name, version in added
+            ],
+        )
+
+    return bool(removed or added)
+
+
+def _sync_hardware(session: Session, agent_id: int, desired: Set[Tuple[str, str, str]]) -> bool:
+    """Apply a set-based diff to the agent's hardware rows."""
+    statement = select(
+        AgentHardware.component, AgentHardware.attribute, AgentHardware.value
+    ).where(AgentHardware.agent_id == agent_id)
+    current = {tuple(row) for row in session.exec(statement).all()}
+
+    removed = current - desired
+    added = desired - current
+
+    if removed:
+        session.execute(
+            delete(AgentHardware).where(
+                AgentHardware.agent_id == agent_id,
+                tuple_(AgentHardware.component, AgentHardware.attribute).in_(
+                    [(component, attribute) for component, attribute, _ in removed]
+                ),
+            )
+        )
+    if added:
+        session.execute(
+            insert(AgentHardware),
+            [
+                {
+                    "agent_id": agent_id,
+                    "component": component,
+                    "attribute": attribute,
+                    "value": value,
+                }
+                for component, attribute, value in added
+            ],
+        )
+
+    return bool(removed or added)
+
+
+def project_inventory(session: Session, agent_id: int, inventory: Dict) -> bool:
+    """Project an inventory snapshot into the normalized tables.
+
+    Only the difference against the currently stored rows is written.
+    Returns True if any row changed. The caller owns the transaction.
+    """
+    software_changed = _sync_software(session, agent_id, extract_software(inventory))
+    hardware_changed = _sync_hardware(session, agent_id, extract_hardware(inventory))
+    return software_changed or hardware_changed
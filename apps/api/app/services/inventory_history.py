@@ -0,0 +1,252 @@
+"""
+Inventory History Service
+
+Keeps every inventory snapshot of an agent as a version whose top-level
+sections point at content-addressed chunks. A chunk is stored once no matter
+how many versions (or agents) reference it, so storage grows with actual
+change rather than with submission count.
+"""
+
+import hashlib
+import json
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, Tuple
+from sqlalchemy import delete, func, insert, exists, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlmodel import Session, select
+
+from app.models.agent import Agent
+from app.models.inventory import (
+    InventoryChunk,
+    InventoryVersion,
+    InventoryVersionSection,
+)
+
+
+def _canonical_json(value: Any) -> str:
+    return json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def chunk_inventory(inventory: Dict) -> Dict[str, Tuple[str, Any, int]]:
+    """Split an inventory into ``section -> (digest, data, size)`` chunks."""
+    chunks = {}
+    for section, data in inventory.items():
+        encoded = _canonical_json(data)
+        digest = hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+        chunks[str(section)[:100]] = (digest, data, len(encoded))
+    return chunks
+
+
+def _manifest(session: Session, version_id: int) -> Dict[str, str]:
+    statement = select(InventoryVersionSection.section, InventoryVersionSection.digest).where(
+        InventoryVersionSection.version_id == version_id
+    )
+    return dict(session.exec(statement).all())
+
+
+def _latest_version(session: Session, agent_id: int) -> Optional[InventoryVersion]:
+    statement = (
+        select(InventoryVersion)
+        .where(InventoryVersion.agent_id == agent_id)
+        .order_by(InventoryVersion.version.desc())
+        .limit(1)
+    )
+    return session.exec(statement).first()
+
+
+def record_inventory_version(
+    session: Session,
+    agent_id: int,
+    inventory: Dict,
+) -> Optional[InventoryVersion]:
+    """Record a new version if the inventory differs from the latest one.
+
+    Returns the new version, or None if nothing changed. The caller owns the
+    transaction; it keeps the agent row locked, so concurrent submissions for
+    the same agent are numbered one after the other.
+    """
+    chunks = chunk_inventory(inventory)
+    manifest = {section: digest for section, (digest, _, _) in chunks.items()}
+
+    session.execute(select(Agent.id).where(Agent.id == agent_id).with_for_update())
+    latest = _latest_version(session, agent_id)
+    if latest and _manifest(session, latest.id) == manifest:
+        return None
+
+    if chunks:
+        unique_chunks = {digest: (data, size) for digest, data, size in chunks.values()}
+        # Concurrent submissions may race on the same chunk; the digest is the key.
+        session.execute(
+            pg_insert(InventoryChunk)
+            .values([
+                {"digest": digest, "data": data, "size": size, "created_at": datetime.utcnow()}
+                for digest, (data, size) in unique_chunks.items()
+            ])
+            .on_conflict_do_nothing(index_elements=["digest"])
+        )
+
+    version = InventoryVersion(
+        agent_id=agent_id,
+        version=(latest.version + 1) if latest else 1,
+    )
+    session.add(version)
+    session.flush()
+
+    if manifest:
+        session.execute(
+            insert(InventoryVersionSection),
+            [
+                {"version_id": version.id, "section": section, "digest": digest}
+                for section, digest in manifest.items()
+            ],
+        )
+
+    return version
+
+
+def load_inventory_version(session: Session, agent_id: int, version: int) -> Optional[Dict]:
+    """Reassemble the inventory snapshot of a version."""
+    version_id = session.exec(
+        select(InventoryVersion.id).where(
+            InventoryVersion.agent_id == agent_id, InventoryVersion.version == version
+        )
+    ).first()
+    if version_id is None:
+        return None
+
+    statement = (
+        select(InventoryVersionSection.section, InventoryChunk.data)
+        .join(InventoryChunk, InventoryChunk.digest == InventoryVersionSection.digest)
+        .where(InventoryVersionSection.version_id == version_id)
+    )
+    return dict(session.exec(statement).all())
+
+
+def _diff_values(old: Any, new: Any) -> Dict[str, Any]:
+    """Describe how a section changed."""
+    if isinstance(old, dict) and isinstance(new, dict):
+        return {
+            "added": {k: v for k, v in new.items() if k not in old},
+            "removed": {k: v for k, v in old.items() if k not in new},
+            "changed": {
+                k: {"from": old[k], "to": new[k]}
+                for k in old.keys() & new.keys()
+                if old[k] != new[k]
+            },
+        }
+    if isinstance(old, list) and isinstance(new, list):
+        old_items = {_canonical_json(item): item for item in old}
+        new_items = {_canonical_json(item): item for item in new}
+        return {
+            "added": [item for key, item in new_items.items() if key not in old_items],
+            "removed": [item for key, item in old_items.items() if key not in new_items],
+        }
+    return {"from": old, "to": new}
+
+
+def diff_inventory_versions(
+    session: Session,
+    agent_id: int,
+    from_version: int,
+    to_version: int,
+) -> Optional[Dict[str, Any]]:
+    """Diff two versions section by section.
+
+    Sections whose chunk digest is identical are skipped without loading
+    their content.
+    """
+    versions = {
+        v.version: v
+        for v in session.exec(
+            select(InventoryVersion).where(
+                InventoryVersion.agent_id == agent_id,
+                InventoryVersion.version.in_([from_version, to_version]),
+            )
+        ).all()
+    }
+    if from_version not in versions or to_version not in versions:
+        return None
+
+    old_manifest = _manifest(session, versions[from_version].id)
+    new_manifest = _manifest(session, versions[to_version].id)
+
+    changed_digests = {
+        digest
+        for section in old_manifest.keys() | new_manifest.keys()
+        if old_manifest.get(section) != new_manifest.get(section)
+        for digest in (old_manifest.get(section), new_manifest.get(section))
+        if digest
+    }
+    contents = dict(
+        session.exec(
+            select(InventoryChunk.digest, InventoryChunk.data).where(
+                InventoryChunk.digest.in_(changed_digests)
+            )
+        ).all()
+    ) if changed_digests else {}
+
+    result = {
+        "agent_id": agent_id,
+        "from_version": from_version,
+        "to_version": to_version,
+        "sections_added": {},
+        "sections_removed": [],
+        "sections_changed": {},
+    }
+    for section in sorted(old_manifest.keys() | new_manifest.keys()):
+        old_digest = old_manifest.get(section)
+        new_digest = new_manifest.get(section)
+        if old_digest == new_digest:
+            continue
+        if old_digest is None:
+            result["sections_added"][section] = contents.get(new_digest)
+        elif new_digest is None:
+            result["sections_removed"].append(section)
+        else:
+            result["sections_changed"][section] = _diff_values(
+                contents.get(old_digest), contents.get(new_digest)
+            )
+    return result
+
+
+def compact_inventory_history(
+    session: Session,
+    keep_versions: int,
+    retention_days: int,
+) -> Dict[str, int]:
+    """Drop old versions and garbage-collect chunks no version references.
+
+    The newest ``keep_versions`` versions of every agent are always kept;
+    older ones are removed once they are past ``retention_days``.
+    """
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+
+    ranked = select(
+        InventoryVersion.id,
+        InventoryVersion.created_at,
+        func.row_number()
+        .over(partition_by=InventoryVersion.agent_id, order_by=InventoryVersion.version.desc())
+        .label("rank"),
+    ).subquery()
+    expired = select(ranked.c.id).where(ranked.c.rank > keep_versions, ranked.c.created_at < cutoff)
+
+    session.execute(
+        delete(InventoryVersionSection).where(InventoryVersionSection.version_id.in_(expired))
+    )
+    versions_deleted = session.execute(
+        delete(InventoryVersion).where(InventoryVersion.id.in_(expired))
+    ).rowcount
+
+    # Chunk inserts take ROW EXCLUSIVE on inventory_chunk until the ingest
+    # commits, and this mode conflicts with it: the delete below waits for
+    # in-flight ingests and then sees their sections, and ingests arriving
+    # meanwhile wait instead of skipping a chunk that is about to go.
+    session.execute(text("LOCK TABLE inventory_chunk IN SHARE ROW EXCLUSIVE MODE"))
+    chunks_deleted = session.execute(
+        delete(InventoryChunk).where(
+            ~exists().where(InventoryVersionSection.digest == InventoryChunk.digest)
+        )
+    ).rowcount
+
+    session.commit()
+    return {"versions_deleted": versions_deleted, "chunks_deleted": chunks_deleted}
@@ -0,0 +1,120 @@
+"""
+Inventory Path Projection
+
+Reads selected parts of an agent's inventory. Paths are dotted, e.g.
+``software.*.name`` or ``hardware.network.0.mac_address``: a ``*`` matches
+every element of an array and a number indexes into an array. On PostgreSQL
+the projection runs in the database as SQL/JSON path queries, so only the
+requested values leave the server; elsewhere it is evaluated in Python with
+the same (lax mode) semantics.
+"""
+
+from typing import Any, Dict, List, Optional, Union
+from sqlalchemy import cast, func
+from sqlalchemy.dialects.postgresql import JSONB, JSONPATH
+from sqlmodel import Session, select
+
+from app.models.agent import Agent
+
+Segment = Union[str, int]
+
+MAX_PATH_SEGMENTS = 16
+WILDCARD = "*"
+
+
+def parse_path(path: str) -> List[Segment]:
+    """Split a dotted path into keys, array indexes and wildcards."""
+    segments = path.split(".")
+    if not path or len(segments) > MAX_PATH_SEGMENTS or any(not s for s in segments):
+        raise ValueError(f"Invalid inventory path: {path!r}")
+    return [int(s) if s.isdigit() else s for s in segments]
+
+
+def to_jsonpath(segments: List[Segment]) -> str:
+    """Translate parsed segments into an SQL/JSON path expression."""
+    parts = ["$"]
+    for segment in segments:
+        if segment == WILDCARD:
+            parts.append("[*]")
+        elif isinstance(segment, int):
+            parts.append(f"[{segment}]")
+        else:
+            escaped = segment.replace("\\", "\\\\").replace('"', '\\"')
+            parts.append(f'."{escaped}"')
+    return "".join(parts)
+
+
+def _step(nodes: List[Any], segment: Segment) -> List[Any]:
+    result = []
+    for node in nodes:
+        if segment == WILDCARD:
+            result.extend(node if isinstance(node, list) else [node])
+        elif isinstance(segment, int):
+            if isinstance(node, list):
+                if segment < len(node):
+                    result.append(node[segment])
+            elif segment == 0:
+                result.append(node)
+        else:
+            # Member access unwraps one level of arrays (lax mode)
+            for item in node if isinstance(node, list) else [node]:
+                if isinstance(item, dict) and segment in item:
+                    result.append(item[segment])
+    return result
+
+
+def project_json(data: Any, segments: List[Segment]) -> Any:
+    """Evaluate a parsed path in Python.
+
+    Paths with a wildcard return every match as a list; other paths return
+    the first match or None.
+    """
+    nodes = [] if data is None else [data]
+    for segment in segments:
+        nodes = _step(nodes, segment)
+    if WILDCARD in segments:
+        return nodes if data is not None else None
+    return nodes[0] if nodes else None
+
+
+def read_inventory(
+    session: Session,
+    agent_id: int,
+    paths: Optional[List[str]] = None,
+) -> Optional[Dict[str, Any]]:
+    """Read an agent's inventory, or only the requested paths.
+
+    Returns None if the agent does not exist.
+    """
+    if not paths:
+        row = session.exec(
+            select(Agent.id, Agent.inventory_data).where(Agent.id == agent_id)
+        ).first()
+        return None if row is None else {"agent_id": agent_id, "inventory": row[1]}
+
+    parsed = {path: parse_path(path) for path in paths}
+
+    if session.get_bind().dialect.name != "postgresql":
+        row = session.exec(
+            select(Agent.id, Agent.inventory_data).where(Agent.id == agent_id)
+        ).first()
+        if row is None:
+            return None
+        return {
+            "agent_id": agent_id,
+            "paths": {path: project_json(row[1], segments) for path, segments in parsed.items()},
+        }
+
+    document = cast(Agent.inventory_data, JSONB)
+    columns = []
+    for segments in parsed.values():
+        jsonpath = cast(to_jsonpath(segments), JSONPATH)
+        if WILDCARD in segments:
+            columns.append(func.jsonb_path_query_array(document, jsonpath))
+        else:
+            columns.append(func.jsonb_path_query_first(document, jsonpath))
+
+    row = session.exec(select(Agent.id, *columns).where(Agent.id == agent_id)).first()
+    if row is None:
+        return None
+    return {"agent_id": agent_id, "paths": dict(zip(parsed, row[1:]))}
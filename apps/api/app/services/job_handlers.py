@@ -0,0 +1,59 @@
+"""
+Background Job Handlers
+
+Importing this module registers the handlers with the job queue.
+"""
+
+from typing import Any, Dict
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.database import engine
+from app.services.asset_import import run_asset_import
+from app.services.asset_reconciliation import reconcile_assets
+from app.services.fleet_summary import run_recount
+from app.services.inventory_history import compact_inventory_history
+from app.services.jobs import job_handler, report_progress
+
+
+@job_handler("asset_import", max_attempts=1)
+def asset_import(job_id: int, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Load an uploaded asset file (data errors are not worth retrying)."""
+    return run_asset_import(
+        payload["asset_import_id"],
+        on_progress=lambda counts: report_progress(
+            job_id, message=f"{counts['rows_processed']} rows processed"
+        ),
+    )
+
+
+@job_handler("asset_reconciliation", admin_enqueue=True)
+def asset_reconciliation(job_id: int, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Link agents to assets from their inventory."""
+    with Session(engine) as session:
+        return dict(reconcile_assets(
+            session,
+            batch_size=payload.get("batch_size", settings.ASSET_RECONCILE_BATCH_SIZE),
+            time_budget_seconds=payload.get(
+                "time_budget_seconds", settings.ASSET_RECONCILE_TIME_BUDGET_SECONDS
+            ),
+        ))
+
+
+@job_handler("inventory_compaction", admin_enqueue=True)
+def inventory_compaction(job_id: int, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Prune old inventory versions and unreferenced chunks."""
+    with Session(engine) as session:
+        return compact_inventory_history(
+            session,
+            keep_versions=payload.get("keep_versions", settings.INVENTORY_HISTORY_KEEP_VERSIONS),
+            retention_days=payload.get("retention_days", settings.INVENTORY_HISTORY_RETENTION_DAYS),
+        )
+
+
+@job_handler("fleet_recount", admin_enqueue=True)
+def fleet_recount(job_id: int, payload: Dict[str, Any]) -> Dict[str, Any]:
+    """Rebuild fleet summary counters from the agent table."""
+    run_recount()
+    return {}
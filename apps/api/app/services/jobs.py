@@ -0,0 +1,306 @@
+"""
+Background Jobs
+
+A persistent job queue in the ``job`` table, worked by every API process
+without a broker. Workers claim the oldest runnable job with
+``SELECT ... FOR UPDATE SKIP LOCKED``, so any number of processes can share
+the queue. Each process runs a bounded pool of asyncio workers; handlers run
+in a thread, or in a process pool when registered as CPU bound and
+``JOB_PROCESS_WORKERS`` is set.
+
+Failed jobs are retried with exponential backoff until ``max_attempts``.
+A running job holds a lease that its worker renews; jobs whose lease
+expires (the process died or was stopped) are put back on the queue.
+
+Each run is traced as a ``job <kind>`` root span.
+
+Handlers are plain functions ``handler(job_id, payload) -> result dict``
+registered with ``@job_handler(kind)``; they may call ``report_progress``.
+"""
+
+import asyncio
+import os
+import random
+import socket
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from multiprocessing import get_context
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+from sqlalchemy import and_, func, update
+from sqlmodel import Session, select
+import structlog
+
+from app.core.database import engine
+from app.core.tracing import SPAN_KIND_CONSUMER, start_trace
+from app.models.job import Job, JobStatus
+
+logger = structlog.get_logger()
+
+
+class JobHandler(NamedTuple):
+    func: Callable[[int, Dict[str, Any]], Optional[Dict[str, Any]]]
+    cpu_bound: bool
+    max_attempts: int
+    admin_enqueue: bool
+
+
+_handlers: Dict[str, JobHandler] = {}
+
+
+def job_handler(
+    kind: str,
+    cpu_bound: bool = False,
+    max_attempts: int = 3,
+    admin_enqueue: bool = False,
+):
+    """Register a module-level function as the handler for ``kind``.
+
+    ``admin_enqueue`` allows administrators to start the job through the
+    jobs API.
+    """
+
+    def register(func):
+        _handlers[kind] = JobHandler(func, cpu_bound, max_attempts, admin_enqueue)
+        return func
+
+    return register
+
+
+def admin_job_kinds() -> List[str]:
+    return sorted(kind for kind, handler in _handlers.items() if handler.admin_enqueue)
+
+
+def enqueue(
+    session: Session,
+    kind: str,
+    payload: Optional[Dict[str, Any]] = None,
+    created_by_id: Optional[int] = None,
+    run_after: Optional[datetime] = None,
+) -> Job:
+    """Add a job to the caller's transaction; it runs once committed."""
+    handler = _handlers.get(kind)
+    if handler is None:
+        raise ValueError(f"Unknown job kind: {kind}")
+    job = Job(
+        kind=kind,
+        payload=payload or {},
+        max_attempts=handler.max_attempts,
+        created_by_id=created_by_id,
+        run_after=run_after or datetime.utcnow(),
+    )
+    session.add(job)
+    session.flush()
+    return job
+
+
+def report_progress(job_id: int, progress: Optional[float] = None, message: Optional[str] = None):
+    """Record progress of a running job (``progress`` from 0 to 1)."""
+    values: Dict[str, Any] = {"locked_at": datetime.utcnow()}
+    if progress is not None:
+        values["progress"] = max(0.0, min(1.0, progress))
+    if message is not None:
+        values["progress_message"] = message[:500]
+    _update_job(and_(Job.id == job_id, Job.status == JobStatus.RUNNING), **values)
+
+
+def _update_job(condition, **values) -> int:
+    with Session(engine) as session:
+        result = session.execute(
+            update(Job).where(condition).values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        session.commit()
+        return result.rowcount
+
+
+def _claim(worker_id: str) -> Optional[Job]:
+    """Lock the oldest runnable job and mark it running."""
+    now = datetime.utcnow()
+    candidate = (
+        select(Job.id)
+        .where(Job.status == JobStatus.QUEUED, Job.run_after <= now)
+        .order_by(Job.run_after, Job.id)
+        .limit(1)
+        .with_for_update(skip_locked=True)
+        .scalar_subquery()
+    )
+    with Session(engine, expire_on_commit=False) as session:
+        job_id = session.execute(
+            update(Job)
+            .where(Job.id == candidate)
+            .values(
+                status=JobStatus.RUNNING,
+                attempts=Job.attempts + 1,
+                locked_by=worker_id,
+                locked_at=now,
+                started_at=func.coalesce(Job.started_at, now),
+            )
+            .returning(Job.id)
+            .execution_options(synchronize_session=False)
+        ).scalar()
+        session.commit()
+        return session.get(Job, job_id) if job_id is not None else None
+
+
+def _owned(job: Job, worker_id: str):
+    return and_(Job.id == job.id, Job.status == JobStatus.RUNNING, Job.locked_by == worker_id)
+
+
+def _retry_delay(attempts: int, base_seconds: float, max_seconds: float) -> float:
+    """Exponential backoff with jitter."""
+    return min(max_seconds, base_seconds * 2 ** (attempts - 1)) * random.uniform(0.5, 1.0)
+
+
+def requeue_expired(lease_seconds: float) -> int:
+    """Return jobs with an expired lease to the queue (or fail them)."""
+    expired = and_(
+        Job.status == JobStatus.RUNNING,
+        Job.locked_at < datetime.utcnow() - timedelta(seconds=lease_seconds),
+    )
+    now = datetime.utcnow()
+    requeued = _update_job(
+        and_(expired, Job.attempts < Job.max_attempts),
+        status=JobStatus.QUEUED, locked_by=None, locked_at=None, run_after=now,
+    )
+    failed = _update_job(
+        expired,
+        status=JobStatus.FAILED, locked_by=None, error="Lease expired", finished_at=now,
+    )
+    if requeued or failed:
+        logger.warning("Expired job leases", requeued=requeued, failed=failed)
+    return requeued + failed
+
+
+def cancel_job(session: Session, job: Job) -> bool:
+    """Cancel a job that has not started yet."""
+    if job.status != JobStatus.QUEUED:
+        return False
+    job.status = JobStatus.CANCELLED
+    job.finished_at = datetime.utcnow()
+    return True
+
+
+class JobWorkerPool:
+    """Bounded pool of asyncio workers draining the job queue."""
+
+    def __init__(
+        self,
+        workers: int,
+        process_workers: int,
+        poll_seconds: float,
+        lease_seconds: float,
+        retry_base_seconds: float,
+        retry_max_seconds: float,
+    ):
+        self.workers = workers
+        self.process_workers = process_workers
+        self.poll_seconds = poll_seconds
+        self.lease_seconds = lease_seconds
+        self.retry_base_seconds = retry_base_seconds
+        self.retry_max_seconds = retry_max_seconds
+        self._tasks: List[asyncio.Task] = []
+        self._process_pool: Optional[ProcessPoolExecutor] = None
+        self._prefix = f"{socket.gethostname()}:{os.getpid()}"
+
+    def start(self):
+        if self.process_workers > 0:
+            # spawn: children must not inherit the parent's pooled connections
+            self._process_pool = ProcessPoolExecutor(
+                self.process_workers, mp_context=get_context("spawn")
+            )
+        self._tasks = [
+            asyncio.create_task(self._work(f"{self._prefix}:{i}"))
+            for i in range(self.workers)
+        ]
+        self._tasks.append(asyncio.create_task(self._expire_leases()))
+        logger.info("Job workers started", workers=self.workers, process_workers=self.process_workers)
+
+    async def stop(self):
+        """Stop workers. Interrupted jobs are requeued once their lease expires."""
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        if self._process_pool is not None:
+            self._process_pool.shutdown(wait=False, cancel_futures=True)
+            self._process_pool = None
+
+    async def _expire_leases(self):
+        while True:
+            await asyncio.sleep(self.lease_seconds / 2)
+            try:
+                await asyncio.to_thread(requeue_expired, self.lease_seconds)
+            except Exception as e:
+                logger.error("Job lease check failed", error=str(e))
+
+    async def _work(self, worker_id: str):
+        while True:
+            try:
+                job = await asyncio.to_thread(_claim, worker_id)
+            except Exception as e:
+                logger.error("Job claim failed", worker=worker_id, error=str(e))
+                job = None
+            if job is None:
+                await asyncio.sleep(self.poll_seconds)
+                continue
+            await self._run(job, worker_id)
+
+    async def _renew_lease(self, job: Job, worker_id: str):
+        while True:
+            await asyncio.sleep(self.lease_seconds / 3)
+            await asyncio.to_thread(
+                _update_job, _owned(job, worker_id), locked_at=datetime.utcnow()
+            )
+
+    async def _run(self, job: Job, worker_id: str):
+        with start_trace(
+            f"job {job.kind}",
+            kind=SPAN_KIND_CONSUMER,
+            **{"job.id": job.id, "job.kind": job.kind, "job.attempt": job.attempts},
+        ) as job_span:
+            await self._execute(job, worker_id, job_span)
+
+    async def _execute(self, job: Job, worker_id: str, job_span):
+        handler = _handlers.get(job.kind)
+        log = logger.bind(job_id=job.id, kind=job.kind, attempt=job.attempts)
+        if handler is None:
+            await asyncio.to_thread(
+                _update_job, _owned(job, worker_id),
+                status=JobStatus.FAILED, error=f"Unknown job kind: {job.kind}",
+                finished_at=datetime.utcnow(), locked_by=None,
+            )
+            return
+
+        renew = asyncio.create_task(self._renew_lease(job, worker_id))
+        try:
+            if handler.cpu_bound and self._process_pool is not None:
+                result = await asyncio.get_running_loop().run_in_executor(
+                    self._process_pool, handler.func, job.id, job.payload
+                )
+            else:
+                result = await asyncio.to_thread(handler.func, job.id, job.payload)
+        except Exception as e:
+            job_span.set_error(e)
+            now = datetime.utcnow()
+            if job.attempts < job.max_attempts:
+                delay = _retry_delay(job.attempts, self.retry_base_seconds, self.retry_max_seconds)
+                values = {"status": JobStatus.QUEUED, "run_after": now + timedelta(seconds=delay)}
+                log.warning("Job failed, retrying", error=str(e), retry_in=round(delay, 1))
+            else:
+                values = {"status": JobStatus.FAILED, "finished_at": now}
+                log.error("Job failed", error=str(e))
+            await asyncio.to_thread(
+                _update_job, _owned(job, worker_id),
+                error=f"{type(e).__name__}: {e}", locked_by=None, locked_at=None, **values,
+            )
+            return
+        finally:
+            renew.cancel()
+
+        await asyncio.to_thread(
+            _update_job, _owned(job, worker_id),
+            status=JobStatus.SUCCEEDED, result=result, error=None, progress=1.0,
+            finished_at=datetime.utcnow(), locked_by=None, locked_at=None,
+        )
+        log.info("Job succeeded")
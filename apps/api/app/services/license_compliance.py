@@ -0,0 +1,166 @@
+"""
+Software License Compliance
+
+Compares software installs from agent inventory with owned licenses. A
+license is an active ``Asset`` of type ``SOFTWARE``; each row is one seat
+for the product named by ``Asset.name`` at the asset's site. Installs are
+counted per site, product and version with a single aggregate query over
+``agent_software``, restricted to licensed products.
+
+The report is cached in-process and rebuilt when inventory or licenses
+change (or after ``LICENSE_COMPLIANCE_CACHE_SECONDS`` at the latest, which
+bounds staleness from agents moving between sites). Rebuilds run in the
+threadpool with their own session, one at a time; while one runs, callers
+get the previous report.
+"""
+
+import asyncio
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import func, tuple_
+from sqlmodel import Session, select
+from starlette.concurrency import run_in_threadpool
+import structlog
+
+from app.core.config import settings
+from app.core.database import engine
+from app.models.agent import Agent
+from app.models.asset import Asset, AssetStatus, AssetType
+from app.models.inventory import AgentSoftware
+
+logger = structlog.get_logger()
+
+_cache: Dict[str, object] = {"fingerprint": None, "built_at": 0.0, "report": None}
+_rebuild: Optional["asyncio.Future"] = None
+
+
+def _license_product():
+    """SQL form of ``normalize_software_name`` applied to license names."""
+    return func.left(
+        func.lower(func.regexp_replace(func.trim(Asset.name), r"\s+", " ", "g")),
+        255,
+    )
+
+
+def _license_filter():
+    return (Asset.asset_type == AssetType.SOFTWARE, Asset.status == AssetStatus.ACTIVE)
+
+
+def _fingerprint(session: Session) -> Tuple:
+    """Cheap summary that changes whenever the report could change."""
+    agents = session.exec(
+        select(func.count(Agent.id), func.max(Agent.inventory_updated_at))
+    ).one()
+    licenses = session.exec(
+        select(func.count(Asset.id), func.max(Asset.updated_at)).where(*_license_filter())
+    ).one()
+    return tuple(agents) + tuple(licenses)
+
+
+def _count_licenses(session: Session) -> Dict[Tuple[Optional[int], str], int]:
+    product = _license_product()
+    statement = (
+        select(Asset.site_id, product, func.count(Asset.id))
+        .where(*_license_filter())
+        .group_by(Asset.site_id, product)
+    )
+    return {(site_id, name): count for site_id, name, count in session.exec(statement).all()}
+
+
+def _count_installs(session: Session, products: List[str]):
+    """Installs per (site, product) and per (site, product, version).
+
+    Uses grouping sets so an agent with two versions of a product counts
+    once in the product total.
+    """
+    statement = (
+        select(
+            Agent.site_id,
+            AgentSoftware.name,
+            AgentSoftware.version,
+            func.grouping(AgentSoftware.version),
+            func.count(func.distinct(AgentSoftware.agent_id)),
+        )
+        .join(Agent, Agent.id == AgentSoftware.agent_id)
+        .where(AgentSoftware.name.in_(products))
+        .group_by(
+            func.grouping_sets(
+                tuple_(Agent.site_id, AgentSoftware.name, AgentSoftware.version),
+                tuple_(Agent.site_id, AgentSoftware.name),
+            )
+        )
+    )
+    totals: Dict[Tuple[Optional[int], str], int] = {}
+    versions: Dict[Tuple[Optional[int], str], Dict[str, int]] = {}
+    for site_id, name, version, is_total, count in session.exec(statement).all():
+        if is_total:
+            totals[(site_id, name)] = count
+        else:
+            versions.setdefault((site_id, name), {})[version] = count
+    return totals, versions
+
+
+def build_compliance_report(session: Session) -> Dict:
+    """Compute the compliance report from the database."""
+    licenses = _count_licenses(session)
+    products = sorted({name for _, name in licenses})
+    totals, versions = _count_installs(session, products) if products else ({}, {})
+
+    items = []
+    for site_id, product in sorted(set(licenses) | set(totals), key=lambda k: (k[0] or 0, k[1])):
+        licensed = licenses.get((site_id, product), 0)
+        installed = totals.get((site_id, product), 0)
+        items.append({
+            "site_id": site_id,
+            "product": product,
+            "licensed": licensed,
+            "installed": installed,
+            "shortfall": max(installed - licensed, 0),
+            "compliant": installed <= licensed,
+            "versions": versions.get((site_id, product), {}),
+        })
+
+    return {"generated_at": datetime.utcnow(), "items": items}
+
+
+def _rebuild_report(fingerprint: Tuple) -> Dict:
+    started = time.monotonic()
+    with Session(engine) as session:
+        report = build_compliance_report(session)
+    _cache.update(fingerprint=fingerprint, built_at=time.monotonic(), report=report)
+    logger.info(
+        "License compliance report built",
+        items=len(report["items"]),
+        elapsed_ms=round((time.monotonic() - started) * 1000, 1),
+    )
+    return report
+
+
+async def get_compliance_report(session: Session) -> Dict:
+    """Return the cached report, rebuilding it if its inputs changed.
+
+    Only the first request (before any report exists) waits for the build.
+    """
+    global _rebuild
+    fingerprint = _fingerprint(session)
+    report = _cache["report"]
+    fresh = (
+        _cache["fingerprint"] == fingerprint
+        and time.monotonic() - _cache["built_at"] < settings.LICENSE_COMPLIANCE_CACHE_SECONDS
+    )
+    if fresh:
+        return {**report, "cached": True}
+
+    if _rebuild is None or _rebuild.done():
+        _rebuild = asyncio.ensure_future(run_in_threadpool(_rebuild_report, fingerprint))
+        _rebuild.add_done_callback(_log_failure)
+    if report is not None:
+        return {**report, "cached": True}
+    return {**await asyncio.shield(_rebuild), "cached": False}
+
+
+def _log_failure(rebuild: "asyncio.Future") -> None:
+    if not rebuild.cancelled() and rebuild.exception() is not None:
+        logger.error("License compliance report build failed", error=str(rebuild.exception()))
@@ -0,0 +1,166 @@
+"""
+In-Process Profiling
+
+A statistical CPU sampler and tracemalloc snapshot diffs for the running
+API process, so hot spots and memory growth can be found in production
+without attaching external tools.
+
+The sampler reads every thread's stack with ``sys._current_frames()`` at a
+fixed interval and counts identical stacks. The result is in the collapsed
+format (``thread;module:function;... count`` per line) read by
+``flamegraph.pl``, speedscope and similar tools. Only the process serving
+the request is profiled.
+"""
+
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import Counter
+from typing import Any, Dict, List, Optional
+
+# Leaf frames of threads waiting for work rather than running code
+_IDLE_LEAVES = {
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+    ("connection.py", "wait"),
+    ("loop_watchdog.py", "_watch"),
+}
+
+_profile_lock = threading.Lock()
+_memory_lock = threading.Lock()
+_baseline: Optional[tracemalloc.Snapshot] = None
+
+
+class ProfilerBusy(Exception):
+    """Another profile is already running in this process."""
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__") or os.path.basename(code.co_filename)
+    return f"{module}:{code.co_name}"
+
+
+def _is_idle(frame) -> bool:
+    return (os.path.basename(frame.f_code.co_filename), frame.f_code.co_name) in _IDLE_LEAVES
+
+
+def _collapse(frame) -> List[str]:
+    """Stack from the outermost frame to ``frame``."""
+    labels = []
+    while frame is not None:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    labels.reverse()
+    return labels
+
+
+def sample_stacks(seconds: float, interval: float, include_idle: bool = False) -> Dict[str, Any]:
+    """Sample all thread stacks for ``seconds``; returns collapsed stack counts.
+
+    Raises ``ProfilerBusy`` if a profile is already running.
+    """
+    if not _profile_lock.acquire(blocking=False):
+        raise ProfilerBusy()
+    try:
+        own_thread = threading.get_ident()
+        stacks: Counter = Counter()
+        samples = 0
+        started = time.perf_counter()
+        deadline = started + seconds
+        while True:
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_thread or (not include_idle and _is_idle(frame)):
+                    continue
+                thread_name = names.get(thread_id, str(thread_id)).replace(";", "_")
+                stacks[";".join([thread_name] + _collapse(frame))] += 1
+            samples += 1
+            now = time.perf_counter()
+            if now >= deadline:
+                break
+            time.sleep(min(interval, deadline - now))
+        return {
+            "pid": os.getpid(),
+            "duration": round(time.perf_counter() - started, 3),
+            "samples": samples,
+            "stacks": stacks,
+        }
+    finally:
+        _profile_lock.release()
+
+
+def collapsed_text(stacks: Counter) -> str:
+    """Render stack counts in the collapsed (folded) flamegraph format."""
+    return "".join(f"{stack} {count}\n" for stack, count in stacks.most_common())
+
+
+def _snapshot() -> tracemalloc.Snapshot:
+    return tracemalloc.take_snapshot().filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+    ))
+
+
+def _location(stat: tracemalloc.StatisticDiff, group_by: str) -> List[str]:
+    if group_by == "filename":
+        return [stat.traceback[0].filename]
+    return [f"{frame.filename}:{frame.lineno}" for frame in stat.traceback]
+
+
+def memory_tracing() -> bool:
+    return tracemalloc.is_tracing()
+
+
+def start_memory_tracing(frames: int):
+    """Start tracemalloc and take the baseline snapshot."""
+    global _baseline
+    with _memory_lock:
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(frames)
+        _baseline = _snapshot()
+
+
+def stop_memory_tracing():
+    global _baseline
+    with _memory_lock:
+        _baseline = None
+        tracemalloc.stop()
+
+
+def memory_diff(limit: int, group_by: str) -> Optional[Dict[str, Any]]:
+    """Allocation growth since the previous snapshot, largest first.
+
+    The new snapshot becomes the baseline for the next call. Returns
+    ``None`` when tracing is not running.
+    """
+    global _baseline
+    with _memory_lock:
+        if not tracemalloc.is_tracing() or _baseline is None:
+            return None
+        snapshot = _snapshot()
+        stats = snapshot.compare_to(_baseline, group_by)
+        _baseline = snapshot
+        current, peak = tracemalloc.get_traced_memory()
+
+    return {
+        "pid": os.getpid(),
+        "traced_bytes": current,
+        "peak_bytes": peak,
+        "growth_bytes": sum(stat.size_diff for stat in stats),
+        "top": [
+            {
+                "location": _location(stat, group_by),
+                "size_bytes": stat.size,
+                "size_diff_bytes": stat.size_diff,
+                "count": stat.count,
+                "count_diff": stat.count_diff,
+            }
+            for stat in stats[:limit]
+        ],
+    }
@@ -0,0 +1,5 @@
+"""
+Benchmarks and simulations
+
+Run from apps/api, e.g. ``python -m benchmarks.serialization``.
+"""
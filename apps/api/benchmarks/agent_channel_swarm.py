@@ -0,0 +1,171 @@
+"""
+Agent channel swarm load test
+
+Opens one WebSocket per fake agent against a running API, keeps them idle,
+optionally broadcasts a command and waits for every agent to answer.
+
+    ulimit -n 65536
+    python -m benchmarks.agent_channel_swarm --agents 20000 --server-pid $(pgrep -f "uvicorn main:app")
+
+Agents connect with their command token. One heartbeat per fake agent
+registers it and returns the token; agents that were already registered get
+a new token through the admin API, which needs ``--token``. Heartbeats are
+rate limited per client address, so run the server with
+``RATELIMIT_ENABLED=false`` for large swarms.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+from pathlib import Path
+from typing import Dict, Optional
+
+import httpx
+import websockets
+
+
+def _rss_mb(pid: Optional[int]) -> Optional[float]:
+    if not pid:
+        return None
+    for line in Path(f"/proc/{pid}/status").read_text().splitlines():
+        if line.startswith("VmRSS:"):
+            return int(line.split()[1]) / 1024
+    return None
+
+
+async def _register(base_url: str, hostnames, concurrency: int, admin_token: Optional[str]) -> Dict[str, str]:
+    """Command token of each agent that could be registered."""
+    tokens = {}
+    semaphore = asyncio.Semaphore(concurrency)
+    async with httpx.AsyncClient(base_url=base_url, timeout=30) as client:
+        async def heartbeat(hostname):
+            async with semaphore:
+                response = await client.post(
+                    "/api/v1/agents/heartbeat",
+                    json={"hostname": hostname, "os_type": "linux"},
+                )
+                if response.status_code != 200:
+                    return
+                body = response.json()
+                if body.get("command_token"):
+                    tokens[hostname] = body["command_token"]
+                elif admin_token:
+                    response = await client.post(
+                        f"/api/v1/agents/{body['agent_id']}/command-token",
+                        headers={"Authorization": f"Bearer {admin_token}"},
+                    )
+                    if response.status_code == 200:
+                        tokens[hostname] = response.json()["command_token"]
+        await asyncio.gather(*(heartbeat(h) for h in hostnames))
+    return tokens
+
+
+class FakeAgent:
+    """Idle agent that answers every command immediately."""
+
+    def __init__(self, url: str, hostname: str, command_token: str, answered: asyncio.Queue):
+        self.url = f"{url}?hostname={hostname}"
+        self.headers = {"X-Agent-Token": command_token}
+        self.answered = answered
+        self.connected = asyncio.Event()
+        self.failed = False
+
+    async def run(self):
+        try:
+            async with websockets.connect(
+                self.url, additional_headers=self.headers, ping_interval=None, open_timeout=60
+            ) as ws:
+                self.connected.set()
+                async for raw in ws:
+                    message = json.loads(raw)
+                    if message.get("type") == "command":
+                        await ws.send(json.dumps({
+                            "type": "result",
+                            "id": message["id"],
+                            "status": "ok",
+                            "result": {"echo": message["action"]},
+                        }))
+                        self.answered.put_nowait(time.perf_counter())
+        except Exception:
+            self.failed = True
+            self.connected.set()
+
+
+async def main_async(args) -> int:
+    hostnames = [f"{args.prefix}-{i:06d}" for i in range(args.agents)]
+    http_url = args.url.rstrip("/")
+    ws_url = http_url.replace("http", "ws", 1) + "/api/v1/agents/channel"
+
+    tokens = await _register(http_url, hostnames, args.concurrency, args.token)
+    print(f"registered {len(tokens)}/{args.agents} agents")
+
+    rss_before = _rss_mb(args.server_pid)
+    answered: asyncio.Queue = asyncio.Queue()
+    agents = [FakeAgent(ws_url, hostname, tokens[hostname], answered) for hostname in tokens]
+
+    started = time.perf_counter()
+    tasks = []
+    for i in range(0, len(agents), args.concurrency):
+        batch = agents[i:i + args.concurrency]
+        tasks.extend(asyncio.create_task(agent.run()) for agent in batch)
+        await asyncio.gather(*(agent.connected.wait() for agent in batch))
+    connected = sum(1 for agent in agents if not agent.failed)
+    print(f"connected {connected}/{args.agents} in {time.perf_counter() - started:.1f}s")
+
+    await asyncio.sleep(args.idle)
+    rss_after = _rss_mb(args.server_pid)
+    if rss_before is not None and rss_after is not None:
+        per_connection = (rss_after - rss_before) * 1024 / max(connected, 1)
+        print(f"server RSS {rss_before:.0f} MB -> {rss_after:.0f} MB ({per_connection:.1f} KB/connection)")
+
+    status = 0
+    if args.token:
+        async with httpx.AsyncClient(base_url=http_url, timeout=120) as client:
+            sent = time.perf_counter()
+            response = await client.post(
+                "/api/v1/agents/commands/broadcast",
+                json={"action": "noop", "payload": {}},
+                headers={"Authorization": f"Bearer {args.token}"},
+            )
+            response.raise_for_status()
+            dispatched = response.json()["dispatched"]
+
+        received = 0
+        deadline = sent + args.timeout
+        while received < connected and time.perf_counter() < deadline:
+            try:
+                await asyncio.wait_for(answered.get(), deadline - time.perf_counter())
+                received += 1
+            except asyncio.TimeoutError:
+                break
+        elapsed = time.perf_counter() - sent
+        print(f"broadcast dispatched={dispatched} answered={received} in {elapsed:.2f}s")
+        if received < connected:
+            status = 1
+
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    if connected < args.agents:
+        status = 1
+    return status
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://127.0.0.1:8000")
+    parser.add_argument("--agents", type=int, default=20000)
+    parser.add_argument("--prefix", default="swarm")
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--idle", type=float, default=10.0, help="seconds to hold idle connections")
+    parser.add_argument("--token", help="admin access token to reissue command tokens and broadcast a command")
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--server-pid", type=int)
+    return asyncio.run(main_async(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,99 @@
+"""
+Agent payload encoding benchmark
+
+Compares JSON, MessagePack and CBOR for agent traffic: bytes on the wire,
+decode + validation time and CPU per 10k heartbeats, plus the size and parse
+time of a typical inventory submission.
+
+    python -m benchmarks.agent_payloads --count 10000
+"""
+
+import argparse
+import json
+import random
+import time
+
+from app.core.content import cbor2, msgpack
+from app.models.agent import AgentHeartbeat, AgentInventory
+
+
+def _heartbeats(count: int):
+    rng = random.Random(1)
+    return [
+        {
+            "hostname": f"host-{i:06d}.corp.example.com",
+            "os_type": rng.choice(["windows", "linux"]),
+            "os_version": rng.choice(["Windows 11 23H2", "Ubuntu 22.04.4 LTS", "RHEL 9.3"]),
+            "ip_address": f"10.{i // 65536 % 256}.{i // 256 % 256}.{i % 256}",
+        }
+        for i in range(count)
+    ]
+
+
+def _inventory():
+    rng = random.Random(2)
+    return {
+        "hostname": "host-000001.corp.example.com",
+        "inventory": {
+            "software": [
+                {"name": f"Package {i}", "version": f"{rng.randint(0, 9)}.{rng.randint(0, 20)}.{rng.randint(0, 99)}"}
+                for i in range(800)
+            ],
+            "hardware": {
+                "system": {"manufacturer": "Dell Inc.", "model": "Latitude 7440", "serial_number": "ABC1234"},
+                "network": [{"name": "eth0", "mac_address": "00:11:22:33:44:55"}],
+                "memory_mb": 16384,
+            },
+        },
+    }
+
+
+def _codecs():
+    codecs = {"json": (lambda d: json.dumps(d).encode(), None)}
+    if msgpack is not None:
+        codecs["msgpack"] = (lambda d: msgpack.packb(d, use_bin_type=True), lambda b: msgpack.unpackb(b, raw=False))
+    if cbor2 is not None:
+        codecs["cbor"] = (cbor2.dumps, cbor2.loads)
+    return codecs
+
+
+def _measure(model, payloads, encode, decode):
+    encoded = [encode(p) for p in payloads]
+    wall = time.perf_counter()
+    cpu = time.process_time()
+    for body in encoded:
+        if decode is None:
+            model.model_validate_json(body)
+        else:
+            model.model_validate(decode(body))
+    return (
+        sum(len(b) for b in encoded),
+        time.perf_counter() - wall,
+        time.process_time() - cpu,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--count", type=int, default=10000)
+    args = parser.parse_args()
+
+    heartbeats = _heartbeats(args.count)
+    inventory = [_inventory()] * 20
+
+    print(f"{args.count} heartbeats")
+    print(f"{'codec':<10}{'bytes':>12}{'wall ms':>12}{'cpu ms':>12}")
+    for name, (encode, decode) in _codecs().items():
+        size, wall, cpu = _measure(AgentHeartbeat, heartbeats, encode, decode)
+        print(f"{name:<10}{size:>12}{wall * 1000:>12.1f}{cpu * 1000:>12.1f}")
+
+    print("\ninventory submission (800 packages), per request")
+    print(f"{'codec':<10}{'bytes':>12}{'wall ms':>12}{'cpu ms':>12}")
+    for name, (encode, decode) in _codecs().items():
+        size, wall, cpu = _measure(AgentInventory, inventory, encode, decode)
+        n = len(inventory)
+        print(f"{name:<10}{size // n:>12}{wall * 1000 / n:>12.2f}{cpu * 1000 / n:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,34 @@
+"""
+Benchmark results comparison
+
+Compares a results file written with ``--output`` against a baseline and
+exits with status 1 if any metric regressed beyond the tolerance.
+
+    python -m benchmarks.compare results/micro.json --baseline benchmarks/baselines/micro.json
+"""
+
+import argparse
+import json
+import sys
+
+from benchmarks.harness import baseline_path, compare, load
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("results")
+    parser.add_argument("--baseline", help="default: the stored baseline of the results' suite")
+    parser.add_argument("--tolerance", type=float, default=0.15)
+    args = parser.parse_args()
+
+    with open(args.results, encoding="utf-8") as f:
+        document = json.load(f)
+    baseline = args.baseline or baseline_path(document["meta"]["suite"])
+    regressions = compare(document["results"], load(baseline), args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} metric(s) regressed by more than {args.tolerance:.0%}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
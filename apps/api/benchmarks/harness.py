@@ -0,0 +1,157 @@
+"""
+Benchmark harness
+
+Timing helpers and the results format shared by the micro and load suites.
+A results file maps metric names to ``{"value", "unit", "better"}`` where
+``better`` is ``lower`` (latency) or ``higher`` (throughput), plus a
+``meta`` block describing where it was produced. Comparing against a stored
+baseline flags every metric that moved the wrong way by more than the
+tolerance.
+"""
+
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+
+Results = Dict[str, Dict[str, Any]]
+
+
+def metric(value: float, unit: str, better: str = "lower", **extra) -> Dict[str, Any]:
+    return {"value": round(value, 3), "unit": unit, "better": better, **extra}
+
+
+def measure(
+    func: Callable[[], Any],
+    repeat: int = 5,
+    min_time: float = 0.2,
+) -> Dict[str, Any]:
+    """Time ``func`` like ``timeit``: calibrate a loop count so one run takes
+    at least ``min_time``, then report the median microseconds per call of
+    ``repeat`` runs.
+    """
+    number = 1
+    while True:
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        elapsed = time.perf_counter() - started
+        if elapsed >= min_time or number >= 10_000_000:
+            break
+        number *= 10 if elapsed < min_time / 10 else 2
+
+    runs = [elapsed / number]
+    for _ in range(repeat - 1):
+        started = time.perf_counter()
+        for _ in range(number):
+            func()
+        runs.append((time.perf_counter() - started) / number)
+    runs_us = [run * 1e6 for run in runs]
+    return metric(
+        statistics.median(runs_us),
+        "us",
+        min=round(min(runs_us), 3),
+        loops=number,
+    )
+
+
+def percentile(samples: List[float], fraction: float) -> float:
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def _git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def save(path: str, suite: str, results: Results) -> None:
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    document = {
+        "meta": {
+            "suite": suite,
+            "created_at": datetime.utcnow().isoformat(timespec="seconds") + "Z",
+            "git": _git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(document, f, indent=2, sort_keys=True)
+        f.write("\n")
+
+
+def load(path: str) -> Results:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)["results"]
+
+
+def baseline_path(suite: str) -> str:
+    return os.path.join(BASELINE_DIR, f"{suite}.json")
+
+
+def compare(results: Results, baseline: Results, tolerance: float) -> List[str]:
+    """Print a comparison table; return the names of regressed metrics."""
+    regressions = []
+    print(f"\n{'metric':<44}{'baseline':>12}{'current':>12}{'change':>9}")
+    for name in sorted(results):
+        current = results[name]
+        previous = baseline.get(name)
+        if previous is None or not previous["value"]:
+            print(f"{name:<44}{'-':>12}{current['value']:>12.2f}{'new':>9}")
+            continue
+        change = current["value"] / previous["value"] - 1
+        worse = change > tolerance if current["better"] == "lower" else change < -tolerance
+        flag = "  REGRESSION" if worse else ""
+        print(
+            f"{name:<44}{previous['value']:>12.2f}{current['value']:>12.2f}"
+            f"{change * 100:>+8.1f}%{flag}"
+        )
+        if worse:
+            regressions.append(name)
+    return regressions
+
+
+def finish(suite: str, results: Results, args) -> None:
+    """Write results and compare them with the baseline per the CLI flags.
+
+    Exits with status 1 when a metric regressed beyond ``--tolerance``.
+    """
+    if args.output:
+        save(args.output, suite, results)
+    if args.save_baseline:
+        save(baseline_path(suite), suite, results)
+        print(f"\nBaseline written to {baseline_path(suite)}")
+        return
+
+    path = args.baseline or baseline_path(suite)
+    if not os.path.exists(path):
+        print(f"\nNo baseline at {path}; run with --save-baseline to create one")
+        return
+    regressions = compare(results, load(path), args.tolerance)
+    if regressions:
+        print(f"\n{len(regressions)} metric(s) regressed by more than {args.tolerance:.0%}")
+        sys.exit(1)
+
+
+def add_result_arguments(parser) -> None:
+    parser.add_argument("--output", help="write results to this JSON file")
+    parser.add_argument("--baseline", help="baseline JSON (default: benchmarks/baselines/<suite>.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="store these results as the baseline")
+    parser.add_argument("--tolerance", type=float, default=0.15, help="allowed slowdown before failing (0.15 = 15%%)")
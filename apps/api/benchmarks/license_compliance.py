@@ -0,0 +1,148 @@
+"""
+License compliance benchmark
+
+Seeds a synthetic fleet (default 50k agents, 2M install records) into the
+configured database, then times a cold report build, the cache freshness
+check and a cached read. Seed rows are tagged with ``--prefix`` and removed
+afterwards unless ``--keep`` is given.
+
+    python -m benchmarks.license_compliance --agents 50000 --installs-per-agent 40
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import delete, func, insert, literal, select as sa_select, text
+from sqlalchemy.dialects.postgresql import array
+from sqlmodel import Session, select
+
+from app.core.database import engine
+from app.models.agent import Agent, AgentStatus
+from app.models.asset import Asset, AssetStatus, AssetType
+from app.models.inventory import AgentSoftware
+from app.models.site import Site
+from app.services import license_compliance
+from app.services.asset_reconciliation import get_system_user_id
+
+
+def seed(session: Session, args) -> None:
+    site_ids = [
+        row[0]
+        for row in session.execute(
+            insert(Site).returning(Site.id),
+            [{"name": f"{args.prefix} site {i}"} for i in range(args.sites)],
+        ).all()
+    ]
+
+    series = sa_select(func.generate_series(1, args.agents).label("n")).subquery()
+    hostname = func.concat(args.prefix, "-", series.c.n)
+    session.execute(
+        insert(Agent).from_select(
+            ["name", "hostname", "os_type", "status", "site_id", "inventory_updated_at", "created_at", "updated_at"],
+            sa_select(
+                hostname,
+                hostname,
+                literal("windows"),
+                literal(AgentStatus.ONLINE, Agent.__table__.c.status.type),
+                array(site_ids)[series.c.n % len(site_ids) + 1],
+                func.now(),
+                func.now(),
+                func.now(),
+            ),
+        )
+    )
+
+    slot = sa_select(func.generate_series(1, args.installs_per_agent).label("s")).subquery()
+    product = func.concat(args.prefix, " product ", (Agent.id * 7 + slot.c.s) % args.products)
+    version = func.concat("1.", Agent.id % 5)
+    session.execute(
+        insert(AgentSoftware).from_select(
+            ["agent_id", "name", "version", "version_key"],
+            sa_select(Agent.id, product, version, version)
+            .select_from(Agent)
+            .join(slot, literal(True))
+            .where(Agent.hostname.like(f"{args.prefix}-%")),
+        )
+    )
+
+    # Seats for the first ``--licensed-products`` products at every site
+    user_id = get_system_user_id(session)
+    per_site = args.agents * args.installs_per_agent // args.products // len(site_ids)
+    seats = sa_select(func.generate_series(1, per_site).label("s")).subquery()
+    products = sa_select(func.generate_series(0, args.licensed_products - 1).label("p")).subquery()
+    sites = sa_select(func.unnest(array(site_ids)).label("site_id")).subquery()
+    session.execute(
+        insert(Asset).from_select(
+            ["name", "asset_type", "status", "site_id", "created_by_id", "created_at", "updated_at"],
+            sa_select(
+                func.concat(args.prefix, " product ", products.c.p),
+                literal(AssetType.SOFTWARE, Asset.__table__.c.asset_type.type),
+                literal(AssetStatus.ACTIVE, Asset.__table__.c.status.type),
+                sites.c.site_id,
+                literal(user_id),
+                func.now(),
+                func.now(),
+            )
+            .select_from(sites)
+            .join(products, literal(True))
+            .join(seats, literal(True))
+            # Leave every third product short of seats
+            .where((products.c.p % 3 != 0) | (seats.c.s <= per_site * 9 // 10)),
+        )
+    )
+    session.commit()
+    session.execute(text("ANALYZE agent; ANALYZE agent_software; ANALYZE asset"))
+
+
+def cleanup(session: Session, prefix: str) -> None:
+    agent_ids = select(Agent.id).where(Agent.hostname.like(f"{prefix}-%"))
+    session.execute(delete(AgentSoftware).where(AgentSoftware.agent_id.in_(agent_ids)))
+    session.execute(delete(Agent).where(Agent.hostname.like(f"{prefix}-%")))
+    session.execute(delete(Asset).where(Asset.name.like(f"{prefix} product %")))
+    session.execute(delete(Site).where(Site.name.like(f"{prefix} site %")))
+    session.commit()
+
+
+def _timed(func_, *args):
+    started = time.perf_counter()
+    result = func_(*args)
+    return result, (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--agents", type=int, default=50000)
+    parser.add_argument("--installs-per-agent", type=int, default=40)
+    parser.add_argument("--products", type=int, default=2000)
+    parser.add_argument("--licensed-products", type=int, default=200)
+    parser.add_argument("--sites", type=int, default=20)
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--prefix", default="licbench")
+    parser.add_argument("--keep", action="store_true", help="keep seeded rows")
+    args = parser.parse_args()
+
+    with Session(engine) as session:
+        _, elapsed = _timed(seed, session, args)
+        installs = session.exec(select(func.count(AgentSoftware.id))).one()
+        print(f"seeded {args.agents} agents, {installs} install records in {elapsed / 1000:.1f}s")
+
+        try:
+            for run in range(args.runs):
+                report, elapsed = _timed(license_compliance.build_compliance_report, session)
+                print(f"cold build {run + 1}: {elapsed:.0f} ms ({len(report['items'])} items)")
+
+            _, elapsed = _timed(license_compliance._fingerprint, session)
+            print(f"freshness check: {elapsed:.1f} ms")
+
+            read = lambda: asyncio.run(license_compliance.get_compliance_report(session))
+            read()
+            report, elapsed = _timed(read)
+            print(f"cached read: {elapsed:.1f} ms (cached={report['cached']})")
+        finally:
+            if not args.keep:
+                cleanup(session, args.prefix)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,202 @@
+"""
+HTTP load scenarios
+
+Drives scripted scenarios against the API over HTTP and reports throughput
+and latency percentiles per scenario. With ``--start`` a local uvicorn is
+started on a free port (request rate limits disabled) and stopped
+afterwards; otherwise ``--url`` must point at a running instance. Seed the
+database first with ``benchmarks.seed`` using the same ``--prefix`` and
+``--password``.
+
+    python -m benchmarks.seed --assets 100000 --agents 10000 --audit-rows 100000
+    python -m benchmarks.load --start --duration 20 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from typing import Awaitable, Callable, Dict, List
+
+import httpx
+
+from benchmarks.harness import add_result_arguments, finish, metric, percentile
+
+Scenario = Callable[[httpx.AsyncClient, random.Random], Awaitable[httpx.Response]]
+
+
+def _scenarios(args, tokens: Dict[str, str]) -> Dict[str, Scenario]:
+    admin = {"Authorization": f"Bearer {tokens['admin']}"}
+    viewer = {"Authorization": f"Bearer {tokens['viewer']}"}
+
+    async def heartbeat(client, rng):
+        n = rng.randrange(args.agents)
+        return await client.post("/api/v1/agents/heartbeat", json={
+            "hostname": f"{args.prefix}-{n:07d}",
+            "os_type": "linux",
+            "os_version": "Ubuntu 22.04.4 LTS",
+        })
+
+    async def asset_list(client, rng):
+        skip = rng.randrange(0, max(args.assets - 100, 1), 100)
+        return await client.get("/api/v1/assets", params={"skip": skip, "limit": 100}, headers=viewer)
+
+    async def asset_detail(client, rng):
+        return await client.get(f"/api/v1/assets/{rng.choice(args.asset_ids)}", headers=viewer)
+
+    async def fleet_summary(client, rng):
+        return await client.get("/api/v1/agents/summary", headers=admin)
+
+    async def mixed(client, rng):
+        scenario = rng.choices(
+            [heartbeat, asset_list, asset_detail, fleet_summary], [70, 10, 15, 5]
+        )[0]
+        return await scenario(client, rng)
+
+    return {
+        "heartbeat": heartbeat,
+        "asset_list": asset_list,
+        "asset_detail": asset_detail,
+        "fleet_summary": fleet_summary,
+        "mixed": mixed,
+    }
+
+
+async def _login(client: httpx.AsyncClient, email: str, password: str) -> str:
+    response = await client.post("/api/v1/auth/login", params={"email": email, "password": password})
+    response.raise_for_status()
+    return response.json()["access_token"]
+
+
+async def _run_scenario(client, scenario: Scenario, concurrency: int, duration: float, seed: int):
+    latencies: List[float] = []
+    errors = 0
+    deadline = time.perf_counter() + duration
+
+    async def worker(index: int):
+        nonlocal errors
+        rng = random.Random(seed * 1000 + index)
+        while time.perf_counter() < deadline:
+            started = time.perf_counter()
+            try:
+                response = await scenario(client, rng)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies.append((time.perf_counter() - started) * 1000)
+            errors += failed
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(i) for i in range(concurrency)))
+    return latencies, errors, time.perf_counter() - started
+
+
+async def run(args) -> Dict[str, Dict]:
+    limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+    headers = {"Host": args.host} if args.host else None
+    async with httpx.AsyncClient(base_url=args.url, headers=headers, limits=limits, timeout=30) as client:
+        tokens = {
+            role: await _login(client, f"{args.prefix}-{role}@example.com", args.password)
+            for role in ("admin", "viewer")
+        }
+        listed = await client.get(
+            "/api/v1/assets", params={"limit": 100},
+            headers={"Authorization": f"Bearer {tokens['viewer']}"},
+        )
+        listed.raise_for_status()
+        args.asset_ids = [asset["id"] for asset in listed.json()] or [1]
+
+        scenarios = _scenarios(args, tokens)
+        selected = args.scenario or list(scenarios)
+        results = {}
+        print(f"{'scenario':<16}{'requests':>10}{'errors':>8}{'rps':>10}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+        for name in selected:
+            if args.warmup:
+                await _run_scenario(client, scenarios[name], args.concurrency, args.warmup, args.seed)
+            latencies, errors, elapsed = await _run_scenario(
+                client, scenarios[name], args.concurrency, args.duration, args.seed
+            )
+            rps = len(latencies) / elapsed
+            p50, p95, p99 = (percentile(latencies, f) for f in (0.5, 0.95, 0.99))
+            print(f"{name:<16}{len(latencies):>10}{errors:>8}{rps:>10.0f}{p50:>9.1f}{p95:>9.1f}{p99:>9.1f}")
+            results[f"load.{name}.rps"] = metric(rps, "req/s", "higher")
+            results[f"load.{name}.p50_ms"] = metric(p50, "ms")
+            results[f"load.{name}.p95_ms"] = metric(p95, "ms")
+            results[f"load.{name}.p99_ms"] = metric(p99, "ms")
+            results[f"load.{name}.error_rate"] = metric(errors / max(len(latencies), 1), "ratio")
+        return results
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+@contextmanager
+def local_server(workers: int):
+    """Run the API with uvicorn on a free port until the block exits."""
+    port = _free_port()
+    env = {**os.environ, "RATELIMIT_ENABLED": "false"}
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "main:app", "--host", "127.0.0.1",
+         "--port", str(port), "--workers", str(workers), "--no-access-log", "--log-level", "warning"],
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+        env=env,
+    )
+    url = f"http://localhost:{port}"
+    try:
+        deadline = time.monotonic() + 60
+        while True:
+            try:
+                if httpx.get(f"{url}/health", headers={"Host": "localhost"}, timeout=1).status_code == 200:
+                    break
+            except httpx.HTTPError:
+                pass
+            if process.poll() is not None or time.monotonic() > deadline:
+                raise RuntimeError("API server did not start")
+            time.sleep(0.5)
+        yield url
+    finally:
+        process.terminate()
+        try:
+            process.wait(timeout=30)
+        except subprocess.TimeoutExpired:
+            process.kill()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--host", help="Host header to send (must be in ALLOWED_HOSTS)")
+    parser.add_argument("--start", action="store_true", help="start a local server for the run")
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers with --start")
+    parser.add_argument("--scenario", action="append", help="run only these scenarios (repeatable)")
+    parser.add_argument("--duration", type=float, default=15, help="seconds per scenario")
+    parser.add_argument("--warmup", type=float, default=3, help="unmeasured seconds before each scenario")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--agents", type=int, default=10_000, help="seeded agents to send heartbeats for")
+    parser.add_argument("--assets", type=int, default=100_000, help="seeded assets to page through")
+    parser.add_argument("--prefix", default="bench")
+    parser.add_argument("--password", default="bench-password")
+    parser.add_argument("--seed", type=int, default=1)
+    add_result_arguments(parser)
+    args = parser.parse_args()
+
+    if args.start:
+        with local_server(args.workers) as url:
+            args.url = url
+            args.host = args.host or "localhost"
+            results = asyncio.run(run(args))
+    else:
+        results = asyncio.run(run(args))
+    finish("load", results, args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+"""
+Microbenchmarks
+
+Times hot code paths in-process: JWT verification, permission checks,
+response serialization (the same path FastAPI takes for ``response_model``)
+and the agent heartbeat handler through the full ASGI stack. The heartbeat
+benchmark needs the configured database; it is skipped if that is not
+reachable. Temporary RSA keys are generated when the configured ones are
+missing.
+
+    python -m benchmarks.micro                   # compare with benchmarks/baselines/micro.json
+    python -m benchmarks.micro --save-baseline   # store a new baseline
+"""
+
+import argparse
+import asyncio
+import os
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import List
+
+# Benchmarks must not be throttled by the per-IP request limits
+os.environ.setdefault("RATELIMIT_ENABLED", "false")
+
+from cryptography.hazmat.primitives import serialization  # noqa: E402
+from cryptography.hazmat.primitives.asymmetric import rsa  # noqa: E402
+from fastapi.encoders import jsonable_encoder  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+from sqlalchemy.exc import OperationalError  # noqa: E402
+from sqlmodel import Session, text  # noqa: E402
+
+from app.core import auth  # noqa: E402
+from app.core.database import engine  # noqa: E402
+from app.core.permissions import Permission, has_permission  # noqa: E402
+from app.core.responses import projected_response  # noqa: E402
+from app.models.asset import Asset, AssetResponse, AssetStatus, AssetType  # noqa: E402
+from app.models.user import User, UserRole  # noqa: E402
+from benchmarks.harness import add_result_arguments, finish, measure  # noqa: E402
+
+
+def _ensure_keys() -> None:
+    if auth.PRIVATE_KEY_PATH.exists() and auth.PUBLIC_KEY_PATH.exists():
+        return
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    directory = Path(tempfile.mkdtemp(prefix="faeflux-bench-"))
+    auth.PRIVATE_KEY_PATH = directory / "private.pem"
+    auth.PUBLIC_KEY_PATH = directory / "public.pem"
+    auth.PRIVATE_KEY_PATH.write_bytes(key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ))
+    auth.PUBLIC_KEY_PATH.write_bytes(key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    ))
+
+
+def _assets(count: int) -> List[Asset]:
+    now = datetime.utcnow()
+    return [
+        Asset(
+            id=i,
+            name=f"Asset {i}",
+            asset_type=AssetType.COMPUTER,
+            status=AssetStatus.ACTIVE,
+            serial_number=f"SN{i:08d}",
+            hostname=f"host-{i:06d}",
+            mac_address="00:11:22:33:44:55",
+            model="Latitude 7440",
+            manufacturer="Dell Inc.",
+            purchase_date=now,
+            cost=1299.0,
+            location="Floor 3",
+            site_id=1,
+            created_by_id=1,
+            created_at=now,
+            updated_at=now,
+        )
+        for i in range(count)
+    ]
+
+
+def _serialize(loop, field, content):
+    async def render():
+        body = await serialize_response(field=field, response_content=content)
+        return JSONResponse(body).body
+    return loop.run_until_complete(render())
+
+
+def _database_available() -> bool:
+    try:
+        with Session(engine) as session:
+            session.execute(text("SELECT 1"))
+        return True
+    except OperationalError:
+        return False
+
+
+def _heartbeat_benchmark(loop):
+    import httpx
+    from main import app
+
+    client = httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://localhost")
+    payload = {"hostname": "micro-bench-heartbeat", "os_type": "linux", "os_version": "Ubuntu 22.04.4 LTS"}
+    # First call registers the agent; the benchmark measures updates
+    loop.run_until_complete(client.post("/api/v1/agents/heartbeat", json=payload)).raise_for_status()
+
+    def heartbeat():
+        response = loop.run_until_complete(client.post("/api/v1/agents/heartbeat", json=payload))
+        assert response.status_code == 200, response.text
+
+    return heartbeat
+
+
+def run(args):
+    _ensure_keys()
+    loop = asyncio.new_event_loop()
+    results = {}
+
+    def bench(name, func):
+        results[name] = measure(func, repeat=args.repeat, min_time=args.min_time)
+        print(f"{name:<36}{results[name]['value']:>12.2f} us")
+
+    token = auth.create_access_token({"sub": "1"})
+    bench("micro.auth.create_token", lambda: auth.create_access_token({"sub": "1"}))
+    bench("micro.auth.verify_token", lambda: auth.verify_token(token))
+
+    viewer = User(id=1, email="viewer@example.com", full_name="Viewer", role=UserRole.VIEWER, hashed_password="x")
+    bench("micro.permissions.allowed", lambda: has_permission(viewer, Permission.ASSET_VIEW))
+    bench("micro.permissions.denied", lambda: has_permission(viewer, Permission.SYSTEM_ADMIN))
+
+    field = create_response_field(name="response", type_=List[AssetResponse])
+    assets = _assets(100)
+    bench("micro.serialize.assets_100", lambda: _serialize(loop, field, assets))
+    bench("micro.serialize.jsonable_encoder_100", lambda: jsonable_encoder(assets))
+    bench("micro.serialize.projected_100", lambda: projected_response(AssetResponse, assets).body)
+
+    if _database_available():
+        bench("micro.agents.heartbeat", _heartbeat_benchmark(loop))
+    else:
+        print(f"{'micro.agents.heartbeat':<36}{'skipped (database unavailable)':>12}")
+
+    loop.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per timed run")
+    add_result_arguments(parser)
+    args = parser.parse_args()
+    finish("micro", run(args), args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,261 @@
+"""
+Synthetic data generator
+
+Seeds a realistic volume of data (default 1k sites, 1M assets, 100k agents,
+5M audit rows) into the configured database with PostgreSQL ``COPY``, fed
+by row generators so memory stays flat. Output is reproducible for a given
+``--seed``. Two users are created for the load scenarios:
+``<prefix>-admin@example.com`` and ``<prefix>-viewer@example.com`` with
+``--password``.
+
+Seeded rows are tagged with ``--prefix``; ``--cleanup`` removes them and
+everything that references them, so use a disposable database.
+
+    python -m benchmarks.seed --assets 1000000 --agents 100000 --audit-rows 5000000
+    python -m benchmarks.seed --cleanup
+"""
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta
+from typing import Callable, Iterator, List, Sequence
+
+from sqlalchemy import Table, delete, select as sa_select, text
+from sqlmodel import Session, SQLModel, select
+
+import app.models  # noqa: F401 - registers all tables
+from app.core.auth import get_password_hash
+from app.core.database import engine
+from app.models.agent import Agent, AgentStatus
+from app.models.asset import Asset, AssetStatus, AssetType
+from app.models.audit_log import AuditAction, AuditLog
+from app.models.site import Site
+from app.models.user import User, UserRole
+from app.services.fleet_summary import run_recount
+
+_NULL = r"\N"
+_CITIES = [
+    ("Istanbul", "Turkey"), ("Ankara", "Turkey"), ("Izmir", "Turkey"), ("Berlin", "Germany"),
+    ("Munich", "Germany"), ("London", "United Kingdom"), ("Paris", "France"), ("Madrid", "Spain"),
+    ("Amsterdam", "Netherlands"), ("Warsaw", "Poland"), ("Vienna", "Austria"), ("Dubai", "UAE"),
+]
+_HARDWARE = {
+    AssetType.COMPUTER: [("Dell Inc.", "Latitude 7440"), ("Lenovo", "ThinkPad T14"), ("HP", "EliteBook 840")],
+    AssetType.SERVER: [("Dell Inc.", "PowerEdge R750"), ("HPE", "ProLiant DL380")],
+    AssetType.NETWORK_DEVICE: [("Cisco", "Catalyst 9300"), ("Juniper", "EX4300")],
+    AssetType.PRINTER: [("HP", "LaserJet M507"), ("Brother", "HL-L6400")],
+    AssetType.MOBILE_DEVICE: [("Apple", "iPhone 15"), ("Samsung", "Galaxy S24")],
+    AssetType.SOFTWARE: [("Microsoft", "Office 365"), ("Adobe", "Acrobat Pro")],
+    AssetType.OTHER: [("Generic", "Device")],
+}
+_ASSET_TYPES = (list(_HARDWARE), [60, 10, 10, 5, 10, 3, 2])
+_ASSET_STATUSES = (list(AssetStatus), [80, 8, 7, 5])
+_AUDIT_ACTIONS = (list(AuditAction), [15, 45, 5, 15, 5, 12, 3])
+_AUDIT_RESOURCES = ["asset", "ticket", "agent", "site", "user", "job"]
+_OS = [("windows", "Windows 11 23H2"), ("windows", "Windows Server 2022"), ("linux", "Ubuntu 22.04.4 LTS"), ("linux", "RHEL 9.3")]
+
+
+class _LineReader:
+    """File-like object over generated COPY lines, for ``copy_expert``."""
+
+    def __init__(self, lines: Iterator[str]):
+        self._lines = lines
+        self._rest = ""
+
+    def read(self, size: int = -1) -> str:
+        if size is None or size < 0:
+            size = 1 << 20
+        parts = [self._rest]
+        length = len(self._rest)
+        if length < size:
+            for line in self._lines:
+                parts.append(line)
+                length += len(line)
+                if length >= size:
+                    break
+        data = "".join(parts)
+        self._rest = data[size:]
+        return data[:size]
+
+
+def _value(value) -> str:
+    if value is None:
+        return _NULL
+    if isinstance(value, datetime):
+        return value.isoformat(sep=" ")
+    if isinstance(value, bool):
+        return "t" if value else "f"
+    return str(value)
+
+
+def _copy(session: Session, table: Table, columns: Sequence[str], rows: Iterator[tuple]) -> float:
+    """COPY generated rows into ``table``; returns seconds taken."""
+    lines = ("\t".join(_value(v) for v in row) + "\n" for row in rows)
+    started = time.perf_counter()
+    cursor = session.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY {table.name} ({', '.join(columns)}) FROM STDIN",
+            _LineReader(lines),
+        )
+    finally:
+        cursor.close()
+    return time.perf_counter() - started
+
+
+def _timed_copy(session: Session, model, columns: List[str], count: int, rows: Callable[[], Iterator[tuple]]):
+    seconds = _copy(session, model.__table__, columns, rows())
+    print(f"{model.__tablename__:<12}{count:>12,} rows {seconds:>8.1f}s {count / seconds if seconds else 0:>12,.0f} rows/s")
+
+
+def _users(session: Session, args) -> int:
+    password = get_password_hash(args.password)
+    ids = {}
+    for role in (UserRole.ADMIN, UserRole.VIEWER):
+        email = f"{args.prefix}-{role.value}@example.com"
+        user = session.exec(select(User).where(User.email == email)).first()
+        if user is None:
+            user = User(email=email, full_name=f"Benchmark {role.value}", role=role, hashed_password=password)
+            session.add(user)
+            session.flush()
+        ids[role] = user.id
+    return ids[UserRole.ADMIN]
+
+
+def seed(session: Session, args) -> None:
+    rng = random.Random(args.seed)
+    now = datetime.utcnow().replace(microsecond=0)
+    admin_id = _users(session, args)
+
+    def sites():
+        for i in range(args.sites):
+            city, country = _CITIES[i % len(_CITIES)]
+            yield (f"{args.prefix} site {i:04d}", f"{i} Main Street", city, country, True, now, now)
+
+    _timed_copy(session, Site, ["name", "address", "city", "country", "is_active", "created_at", "updated_at"],
+                args.sites, sites)
+    site_ids = session.exec(
+        select(Site.id).where(Site.name.like(f"{args.prefix} site %")).order_by(Site.id)
+    ).all()
+
+    def assets():
+        for i in range(args.assets):
+            asset_type = rng.choices(*_ASSET_TYPES)[0]
+            manufacturer, model = rng.choice(_HARDWARE[asset_type])
+            networked = asset_type in (AssetType.COMPUTER, AssetType.SERVER)
+            created = now - timedelta(days=rng.randint(0, 1800))
+            yield (
+                f"{args.prefix} asset {i}",
+                asset_type.name,
+                rng.choices(*_ASSET_STATUSES)[0].name,
+                f"{args.prefix}-SN{i:08d}",
+                f"{args.prefix}-{i:07d}" if networked else None,
+                ":".join(f"{(i >> shift) & 0xff:02x}" for shift in (40, 32, 24, 16, 8, 0)) if networked else None,
+                model,
+                manufacturer,
+                created,
+                created + timedelta(days=1095),
+                round(rng.uniform(50, 15000), 2),
+                f"Floor {rng.randint(1, 12)}",
+                rng.choice(site_ids),
+                admin_id,
+                created,
+                created,
+            )
+
+    _timed_copy(session, Asset, [
+        "name", "asset_type", "status", "serial_number", "hostname", "mac_address", "model",
+        "manufacturer", "purchase_date", "warranty_expiry", "cost", "location", "site_id",
+        "created_by_id", "created_at", "updated_at",
+    ], args.assets, assets)
+
+    def agents():
+        for i in range(args.agents):
+            os_type, os_version = rng.choice(_OS)
+            online = rng.random() < 0.85
+            last_heartbeat = now - timedelta(seconds=rng.randint(0, 60) if online else rng.randint(3600, 86400 * 30))
+            hostname = f"{args.prefix}-{i:07d}"
+            yield (
+                hostname, hostname, os_type, os_version,
+                f"10.{i >> 16 & 0xff}.{i >> 8 & 0xff}.{i & 0xff}",
+                (AgentStatus.ONLINE if online else AgentStatus.OFFLINE).name,
+                rng.choice(site_ids), last_heartbeat, now, now,
+            )
+
+    _timed_copy(session, Agent, [
+        "name", "hostname", "os_type", "os_version", "ip_address", "status", "site_id",
+        "last_heartbeat", "created_at", "updated_at",
+    ], args.agents, agents)
+
+    def audit_rows():
+        for _ in range(args.audit_rows):
+            action = rng.choices(*_AUDIT_ACTIONS)[0]
+            resource_type = rng.choice(_AUDIT_RESOURCES)
+            yield (
+                admin_id, action.name, resource_type, rng.randint(1, max(args.assets, 1)),
+                f"{action.value.title()} {resource_type}",
+                f"192.168.{rng.randint(0, 255)}.{rng.randint(1, 254)}",
+                f"{args.prefix}-seed",
+                now - timedelta(seconds=rng.randint(0, 365 * 86400)),
+            )
+
+    _timed_copy(session, AuditLog, [
+        "user_id", "action", "resource_type", "resource_id", "details", "ip_address",
+        "user_agent", "created_at",
+    ], args.audit_rows, audit_rows)
+
+    session.commit()
+    run_recount()
+    for table in ("site", "asset", "agent", "audit_log"):
+        session.execute(text(f"ANALYZE {table}"))
+    session.commit()
+
+
+def _delete_cascade(session: Session, table: Table, condition) -> None:
+    """Delete matching rows after the rows referencing them, depth first."""
+    ids = sa_select(table.c.id).where(condition).scalar_subquery()
+    for child in SQLModel.metadata.sorted_tables:
+        for fk in child.foreign_keys:
+            if fk.column.table is table and child is not table:
+                if "id" in child.c:
+                    _delete_cascade(session, child, fk.parent.in_(ids))
+                else:
+                    session.execute(delete(child).where(fk.parent.in_(ids)))
+    session.execute(delete(table).where(condition))
+
+
+def cleanup(session: Session, prefix: str) -> None:
+    _delete_cascade(session, AuditLog.__table__, AuditLog.user_agent == f"{prefix}-seed")
+    _delete_cascade(session, Agent.__table__, Agent.hostname.like(f"{prefix}-%"))
+    _delete_cascade(session, Asset.__table__, Asset.serial_number.like(f"{prefix}-SN%"))
+    _delete_cascade(session, Site.__table__, Site.name.like(f"{prefix} site %"))
+    _delete_cascade(session, User.__table__, User.email.like(f"{prefix}-%@example.com"))
+    session.commit()
+    run_recount()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sites", type=int, default=1000)
+    parser.add_argument("--assets", type=int, default=1_000_000)
+    parser.add_argument("--agents", type=int, default=100_000)
+    parser.add_argument("--audit-rows", type=int, default=5_000_000)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--prefix", default="bench")
+    parser.add_argument("--password", default="bench-password")
+    parser.add_argument("--cleanup", action="store_true", help="remove seeded rows instead")
+    args = parser.parse_args()
+
+    SQLModel.metadata.create_all(engine)
+    started = time.perf_counter()
+    with Session(engine) as session:
+        if args.cleanup:
+            cleanup(session, args.prefix)
+        else:
+            seed(session, args)
+    print(f"done in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
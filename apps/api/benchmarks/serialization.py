@@ -0,0 +1,177 @@
+"""
+List response serialization throughput
+
+Renders 100-row pages of every list endpoint's response model both ways —
+FastAPI's ``response_model`` path (validate, dump, ``json.dumps``) and
+``app.core.responses.projected_response`` — and reports the time per page
+for each. The rows are shared with ``tests/test_projected_responses.py``,
+which checks that both paths produce byte-identical bodies.
+
+    python -m benchmarks.serialization
+    python -m benchmarks.serialization --save-baseline
+"""
+
+import argparse
+import asyncio
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, NamedTuple
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+from sqlmodel import Session, select
+
+from app.core.database import engine
+from app.core.responses import projected_response
+from app.models.agent import Agent, AgentResponse, AgentStatus
+from app.models.asset import Asset, AssetResponse, AssetStatus, AssetType
+from app.models.inventory import AgentSoftware, AgentSoftwareResponse
+from app.models.job import Job, JobResponse, JobStatus
+from app.models.site import Site, SiteResponse
+from app.models.ticket import Ticket, TicketPriority, TicketResponse, TicketStatus
+from app.models.user import User, UserResponse, UserRole
+from benchmarks.harness import add_result_arguments, finish, measure
+
+_TEXT = ["plain", "Çağrı Öztürk", "tab\tnew\nline", "quote \" back\\slash", "ctl \x01\x1f", "emoji \U0001F600", "sep  "]
+
+
+class _SoftwareRow(NamedTuple):
+    agent_id: int
+    hostname: str
+    name: str
+    version: str
+
+
+def synthetic_rows(count: int) -> Dict[Any, List[Any]]:
+    """Rows per response model covering optional columns left empty, non-ASCII
+    and control characters, integral floats and microsecond timestamps."""
+    base = datetime(2024, 5, 17, 9, 30, 15, 123456)
+
+    def text(i):
+        return _TEXT[i % len(_TEXT)]
+
+    def when(i):
+        return base + timedelta(seconds=i * 37, microseconds=(i * 1000) % 1_000_000)
+
+    def maybe(i, value):
+        return None if i % 3 == 0 else value
+
+    return {
+        AssetResponse: [
+            Asset(
+                id=i, name=f"Asset {text(i)}", asset_type=list(AssetType)[i % len(AssetType)],
+                status=list(AssetStatus)[i % len(AssetStatus)], serial_number=maybe(i, f"SN{i:08d}"),
+                hostname=maybe(i, f"host-{i}"), mac_address=maybe(i, "00:11:22:33:44:55"),
+                model="Latitude 7440", manufacturer=maybe(i + 1, "Dell Inc."),
+                purchase_date=maybe(i, when(i)), warranty_expiry=maybe(i + 1, when(i * 2)),
+                cost=maybe(i, [1299.0, 0.1, 15000.5, 42.0][i % 4]), location=maybe(i, text(i)),
+                notes=maybe(i + 2, text(i + 1)), site_id=maybe(i, i % 7), created_by_id=1,
+                created_at=when(i), updated_at=when(i + 1),
+            )
+            for i in range(count)
+        ],
+        AgentResponse: [
+            Agent(
+                id=i, name=f"agent-{i}", hostname=f"agent-{i}.{text(i)}", os_type="linux",
+                os_version=maybe(i, "Ubuntu 22.04.4 LTS"), ip_address=maybe(i, f"10.0.{i % 256}.{i % 200 + 1}"),
+                status=list(AgentStatus)[i % len(AgentStatus)], site_id=maybe(i, 3), asset_id=maybe(i + 1, i),
+                last_heartbeat=maybe(i, when(i)), created_at=when(i), updated_at=when(i),
+            )
+            for i in range(count)
+        ],
+        SiteResponse: [
+            Site(
+                id=i, name=f"Site {text(i)}", address=maybe(i, f"{i} Main Street"), city=maybe(i, "İzmir"),
+                country=maybe(i, "Turkey"), postal_code=maybe(i, "35000"), phone=maybe(i, "+90 232 000 00 00"),
+                email=maybe(i, f"site{i}@example.com"), is_active=bool(i % 2), created_at=when(i), updated_at=when(i),
+            )
+            for i in range(count)
+        ],
+        TicketResponse: [
+            Ticket(
+                id=i, title=f"Ticket {text(i)}", description=text(i + 3) * 5,
+                status=list(TicketStatus)[i % len(TicketStatus)], priority=list(TicketPriority)[i % len(TicketPriority)],
+                asset_id=maybe(i, i), assigned_to_id=maybe(i + 1, 2), created_by_id=1,
+                created_at=when(i), updated_at=when(i), resolved_at=maybe(i, when(i + 5)),
+            )
+            for i in range(count)
+        ],
+        UserResponse: [
+            User(
+                id=i, email=f"user{i}@example.com", full_name=text(i), is_active=bool(i % 2),
+                role=list(UserRole)[i % len(UserRole)], site_id=maybe(i, 1), hashed_password="x",
+                created_at=when(i), updated_at=when(i), last_login=maybe(i, when(i)),
+            )
+            for i in range(count)
+        ],
+        JobResponse: [
+            Job(
+                id=i, kind="asset_import", status=list(JobStatus)[i % len(JobStatus)],
+                payload={"import_id": i, "name": text(i), "options": {"dry_run": bool(i % 2), "ratio": 0.25}},
+                result=maybe(i, {"created": i, "errors": [], "note": text(i + 1)}), error=maybe(i + 1, text(i)),
+                attempts=i % 3, max_attempts=3, progress=[0.0, 0.5, 1.0, 0.333][i % 4],
+                progress_message=maybe(i, text(i)), run_after=when(i), created_by_id=maybe(i, 1),
+                created_at=when(i), started_at=maybe(i, when(i + 1)), finished_at=maybe(i + 1, when(i + 2)),
+            )
+            for i in range(count)
+        ],
+        AgentSoftwareResponse: [
+            _SoftwareRow(i, f"agent-{i}", "google chrome", f"124.0.{i}.{i % 10}") for i in range(count)
+        ],
+    }
+
+
+def database_rows(count: int) -> Dict[Any, List[Any]]:
+    """The first ``count`` rows of each list endpoint's table."""
+    queries = {
+        AssetResponse: select(Asset),
+        AgentResponse: select(Agent),
+        SiteResponse: select(Site),
+        TicketResponse: select(Ticket),
+        UserResponse: select(User),
+        JobResponse: select(Job),
+        AgentSoftwareResponse: select(
+            AgentSoftware.agent_id, Agent.hostname, AgentSoftware.name, AgentSoftware.version
+        ).join(Agent, Agent.id == AgentSoftware.agent_id),
+    }
+    with Session(engine) as session:
+        return {model: session.exec(query.limit(count)).all() for model, query in queries.items()}
+
+
+def _fastapi_body(loop, field, rows) -> bytes:
+    async def render():
+        return JSONResponse(await serialize_response(field=field, response_content=rows)).body
+    return loop.run_until_complete(render())
+
+
+def run(args):
+    loop = asyncio.new_event_loop()
+    results = {}
+
+    print(f"{'model':<24}{'rows':>6}{'fastapi us':>12}{'projected us':>14}{'speedup':>9}")
+    for model, rows in synthetic_rows(args.rows).items():
+        field = create_response_field(name="response", type_=List[model])
+        name = model.__name__.replace("Response", "").lower()
+        before = measure(lambda: _fastapi_body(loop, field, rows), repeat=args.repeat, min_time=args.min_time)
+        after = measure(lambda: projected_response(model, rows).body, repeat=args.repeat, min_time=args.min_time)
+        results[f"serialization.{name}.fastapi"] = before
+        results[f"serialization.{name}.projected"] = after
+        print(f"{model.__name__:<24}{len(rows):>6}{before['value']:>12.0f}{after['value']:>14.0f}"
+              f"{before['value'] / after['value']:>8.1f}x")
+
+    loop.close()
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--min-time", type=float, default=0.2, help="seconds per timed run")
+    add_result_arguments(parser)
+    args = parser.parse_args()
+    finish("serialization", run(args), args)
+
+
+if __name__ == "__main__":
+    main()
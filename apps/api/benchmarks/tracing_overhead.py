@@ -0,0 +1,88 @@
+"""
+Tracing overhead benchmark
+
+Times span creation and a request through ``TracingMiddleware`` around a
+no-op ASGI app, with sampling off (the default), with tail sampling (every
+trace recorded, none slow enough to export) and with every trace sampled.
+Nothing is exported.
+
+    python -m benchmarks.tracing_overhead --requests 20000 --spans 10
+"""
+
+import argparse
+import asyncio
+import time
+
+from app.core import tracing
+from app.core.config import settings
+
+
+def _modes():
+    return {
+        "off": (0.0, 0),
+        "tail": (0.0, 60000),
+        "sampled": (1.0, 0),
+    }
+
+
+async def _noop_app(scope, receive, send):
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b""})
+
+
+def _spanning_app(spans: int):
+    async def app(scope, receive, send):
+        for _ in range(spans):
+            with tracing.span("db.query") as query_span:
+                if query_span.recording:
+                    query_span.set_attribute("db.statement", "SELECT 1")
+        await _noop_app(scope, receive, send)
+    return app
+
+
+async def _receive():
+    return {"type": "http.request", "body": b"", "more_body": False}
+
+
+async def _send(message):
+    pass
+
+
+async def _run(app, requests: int) -> float:
+    scope = {
+        "type": "http",
+        "method": "GET",
+        "path": "/health",
+        "headers": [(b"user-agent", b"bench")],
+        "query_string": b"",
+    }
+    started = time.perf_counter()
+    for _ in range(requests):
+        await app(dict(scope), _receive, _send)
+    return time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=20000)
+    parser.add_argument("--spans", type=int, default=10, help="child spans per request")
+    args = parser.parse_args()
+
+    inner = _spanning_app(args.spans)
+    baseline = asyncio.run(_run(inner, args.requests))
+    print(f"{args.requests} requests, {args.spans} child spans each")
+    print(f"{'mode':<10}{'us/request':>12}{'overhead us':>14}")
+    print(f"{'untraced':<10}{baseline * 1e6 / args.requests:>12.2f}{0:>14.2f}")
+
+    traced = tracing.TracingMiddleware(inner)
+    for mode, (rate, tail_ms) in _modes().items():
+        settings.TRACE_SAMPLE_RATE = rate
+        settings.TRACE_TAIL_LATENCY_MS = tail_ms
+        elapsed = asyncio.run(_run(traced, args.requests))
+        per_request = elapsed * 1e6 / args.requests
+        overhead = (elapsed - baseline) * 1e6 / args.requests
+        print(f"{mode:<10}{per_request:>12.2f}{overhead:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -6,31 +6,27 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from contextlib import asynccontextmanager
+import asyncio
 import structlog
 
 from app.core.config import settings
 from app.core.security import setup_security_middleware
 from app.core.database import engine, init_db
+from app.core.metrics import MetricsMiddleware, mark_process_dead, metrics_response
+from app.core.query_stats import QueryStatsMiddleware
+from app.core.loop_watchdog import LoopWatchdog
+from app.core.logging import configure_logging
+from app.core.tracing import TracingMiddleware, init_tracing, shutdown_tracing
+from app.core.response_cache import get_cache_backend
 from app.api.v1 import api_router
+from app.core.periodic import run_periodic
+from app.services.fleet_registry import reload_fleet_registry
+from app.services.fleet_summary import run_offline_sweep, run_recount
+from app.services.jobs import JobWorkerPool
+from app.services import job_handlers  # noqa: F401 - registers job handlers
 
 # Configure structured logging
-structlog.configure(
-    processors=[
-        structlog.stdlib.filter_by_level,
-        structlog.stdlib.add_logger_name,
-        structlog.stdlib.add_log_level,
-        structlog.stdlib.PositionalArgumentsFormatter(),
-        structlog.processors.TimeStamper(fmt="iso"),
-        structlog.processors.StackInfoRenderer(),
-        structlog.processors.format_exc_info,
-        structlog.processors.UnicodeDecoder(),
-        structlog.processors.JSONRenderer()
-    ],
-    context_class=dict,
-    logger_factory=structlog.stdlib.LoggerFactory(),
-    wrapper_class=structlog.stdlib.BoundLogger,
-    cache_logger_on_first_use=True,
-)
+configure_logging()
 
 logger = structlog.get_logger()
 
@@ -39,9 +35,48 @@ logger = structlog.get_logger()
 async def lifespan(app: FastAPI):
     """Lifespan context manager for startup/shutdown events."""
     logger.info("Starting Faeflux One API")
+    init_tracing()
+    get_cache_backend()
+    watchdog = LoopWatchdog(settings.LOOP_STALL_THRESHOLD_MS)
+    if settings.LOOP_WATCHDOG_ENABLED:
+        watchdog.start()
     await init_db()
+    reload_fleet_registry()
+    run_recount()
+    background_tasks = [
+        asyncio.create_task(run_periodic(
+            reload_fleet_registry,
+            settings.FLEET_REGISTRY_RECONCILE_SECONDS,
+            "fleet_registry_reconcile",
+        )),
+        asyncio.create_task(run_periodic(
+            lambda: run_offline_sweep(settings.AGENT_OFFLINE_AFTER_SECONDS),
+            settings.AGENT_STATUS_SWEEP_SECONDS,
+            "agent_offline_sweep",
+        )),
+        asyncio.create_task(run_periodic(
+            run_recount,
+            settings.FLEET_COUNTER_RECOUNT_SECONDS,
+            "fleet_counter_recount",
+        )),
+    ]
+    job_workers = JobWorkerPool(
+        workers=settings.JOB_WORKERS,
+        process_workers=settings.JOB_PROCESS_WORKERS,
+        poll_seconds=settings.JOB_POLL_SECONDS,
+        lease_seconds=settings.JOB_LEASE_SECONDS,
+        retry_base_seconds=settings.JOB_RETRY_BASE_SECONDS,
+        retry_max_seconds=settings.JOB_RETRY_MAX_SECONDS,
+    )
+    job_workers.start()
     yield
     logger.info("Shutting down Faeflux One API")
+    await job_workers.stop()
+    await watchdog.stop()
+    for task in background_tasks:
+        task.cancel()
+    shutdown_tracing()
+    mark_process_dead()
 
 
 app = FastAPI(
@@ -66,6 +101,15 @@ app.add_middleware(
     expose_headers=["*"],
 )
 
+# Per-request SQL counts/timing (Server-Timing header, slow query and N+1 logs)
+app.add_middleware(QueryStatsMiddleware)
+
+# Request id and tracing (outside the SQL hooks so statements become spans)
+app.add_middleware(TracingMiddleware)
+
+# Request latency and in-flight metrics (outermost, so it times everything)
+app.add_middleware(MetricsMiddleware)
+
 # Include API router
 app.include_router(api_router, prefix="/api/v1")
 
@@ -84,14 +128,8 @@ async def health_check():
 
 @app.get("/metrics")
 async def metrics():
-    """Metrics endpoint for monitoring."""
-    # TODO: Add Prometheus metrics if needed
-    return JSONResponse(
-        content={
-            "uptime": "running",
-            "service": "faeflux-one-api"
-        }
-    )
+    """Prometheus metrics (aggregated over all workers in multiprocess mode)."""
+    return metrics_response()
 
 
 if __name__ == "__main__":
@@ -0,0 +1,28 @@
+"""
+Compact inventory history
+"""
+
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from sqlmodel import Session
+from app.core.config import settings
+from app.core.database import engine
+from app.services.inventory_history import compact_inventory_history
+
+def compact():
+    """Remove expired inventory versions and unreferenced chunks."""
+    with Session(engine) as session:
+        result = compact_inventory_history(
+            session,
+            keep_versions=settings.INVENTORY_HISTORY_KEEP_VERSIONS,
+            retention_days=settings.INVENTORY_HISTORY_RETENTION_DAYS,
+        )
+    
+    print(f"Deleted {result['versions_deleted']} versions and {result['chunks_deleted']} chunks.")
+
+if __name__ == "__main__":
+    compact()
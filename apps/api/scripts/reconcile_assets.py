@@ -0,0 +1,33 @@
+"""
+Reconcile agent inventory with assets
+"""
+
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR))
+
+from sqlmodel import Session
+from app.core.config import settings
+from app.core.database import engine
+from app.services.asset_reconciliation import reconcile_assets
+
+def reconcile():
+    """Link agents to assets, creating assets where none match."""
+    with Session(engine) as session:
+        result = reconcile_assets(
+            session,
+            batch_size=settings.ASSET_RECONCILE_BATCH_SIZE,
+            time_budget_seconds=settings.ASSET_RECONCILE_TIME_BUDGET_SECONDS,
+        )
+    
+    print(
+        f"Processed {result.get('agents', 0)} agents in {result['elapsed_seconds']}s: "
+        f"{result.get('created', 0)} assets created, {result.get('updated', 0)} updated."
+    )
+    if not result["completed"]:
+        print("Time budget exhausted; run again to continue.")
+
+if __name__ == "__main__":
+    reconcile()
@@ -0,0 +1,71 @@
+"""
+Test Fixtures
+
+Tests run the API in-process against the database in ``DATABASE_URL`` (use
+a disposable one; tests add rows of their own). Tables are created if
+missing. The app's lifespan is not started, so no background workers run and
+statement counts only include what the request under test issues.
+"""
+
+import os
+
+os.environ.setdefault("RATELIMIT_ENABLED", "false")
+os.environ.setdefault("RESPONSE_CACHE_ENABLED", "false")
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel, select
+
+from app.core.auth import get_password_hash
+from app.core.database import engine
+from app.core.query_stats import query_budget as _query_budget
+from app.models.user import User, UserRole
+from main import app
+
+PASSWORD = "pytest-password"
+
+
+@pytest.fixture(scope="session")
+def client() -> TestClient:
+    SQLModel.metadata.create_all(engine)
+    return TestClient(app, base_url="http://localhost")
+
+
+def login(client: TestClient, role: UserRole) -> dict:
+    """Authorization header of a ``pytest-<role>`` user, created on first use."""
+    email = f"pytest-{role.value}@example.com"
+    with Session(engine) as session:
+        if not session.exec(select(User.id).where(User.email == email)).first():
+            session.add(User(
+                email=email,
+                full_name=f"Pytest {role.value.title()}",
+                hashed_password=get_password_hash(PASSWORD),
+                role=role,
+                is_active=True,
+            ))
+            session.commit()
+    response = client.post("/api/v1/auth/login", params={"email": email, "password": PASSWORD})
+    assert response.status_code == 200, response.text
+    return {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+
+@pytest.fixture(scope="session")
+def admin_headers(client):
+    """Authorization header of an admin user."""
+    return login(client, UserRole.ADMIN)
+
+
+@pytest.fixture(scope="session")
+def viewer_headers(client):
+    """Authorization header of a viewer user."""
+    return login(client, UserRole.VIEWER)
+
+
+@pytest.fixture
+def query_budget():
+    """``with query_budget(n):`` fails the test if the block issues more than ``n`` statements.
+
+    The yielded ``QueryStats`` has the count and each statement shape, for
+    finer assertions.
+    """
+    return _query_budget
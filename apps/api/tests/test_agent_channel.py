@@ -0,0 +1,40 @@
+"""
+Agent Command Channel Hub
+"""
+
+from app.services.agent_channel import AgentChannelHub
+
+
+def test_broadcast_skips_agents_that_are_not_connected():
+    hub = AgentChannelHub()
+    hub.connect(1)
+
+    command_ids, skipped = hub.fan_out([1, 2, 3], "ping", {})
+
+    assert list(command_ids) == [1]
+    assert skipped == [2, 3]
+    assert hub.queued_agents == 1
+
+
+def test_broadcast_larger_than_tracking_keeps_every_command():
+    hub = AgentChannelHub(max_tracked=10)
+    for agent_id in range(25):
+        hub.connect(agent_id)
+
+    command_ids, _ = hub.fan_out(range(25), "ping", {})
+
+    assert len(command_ids) == 25
+    assert all(hub.complete(command_ids[agent_id], agent_id, "ok", None) for agent_id in range(25))
+
+
+def test_queue_is_dropped_once_agent_is_gone_and_drained():
+    hub = AgentChannelHub()
+    queue = hub.connect(1)
+    hub.dispatch(1, "ping", {})
+    hub.disconnect(1)
+    assert hub.queued_agents == 1
+
+    hub.connect(1)
+    queue.get_nowait()
+    hub.disconnect(1)
+    assert hub.queued_agents == 0
@@ -0,0 +1,82 @@
+"""
+Asset Import Upload Limits
+
+Oversized uploads are refused before the form parser spools them.
+"""
+
+import asyncio
+import os
+
+import pytest
+
+from app.core.config import settings
+from app.core.security import UploadSizeLimitMiddleware
+from app.services.asset_import import upload_path
+
+IMPORT = "/api/v1/assets/import"
+LIMIT = 4096
+
+
+@pytest.fixture
+def small_limit(monkeypatch):
+    monkeypatch.setattr(settings, "MAX_UPLOAD_SIZE", LIMIT)
+
+
+def test_upload_within_limit_is_accepted(client, admin_headers, small_limit):
+    body = b"name,asset_type\nupload limit test,computer\n"
+    response = client.post(IMPORT, files={"file": ("assets.csv", body)}, headers=admin_headers)
+
+    assert response.status_code == 202, response.text
+    path = upload_path(response.json()["id"], "csv")
+    with open(path, "rb") as stored:
+        assert stored.read() == body
+    os.remove(path)
+
+
+def test_declared_length_over_limit_is_refused_unread(small_limit):
+    received = []
+    sent = []
+
+    async def receive():
+        received.append(None)
+        return {"type": "http.request", "body": b"", "more_body": False}
+
+    async def send(message):
+        sent.append(message)
+
+    async def app(scope, receive, send):
+        raise AssertionError("the request reached the app")
+
+    scope = {
+        "type": "http",
+        "method": "POST",
+        "path": IMPORT,
+        "headers": [
+            (b"content-type", b"multipart/form-data; boundary=limit"),
+            (b"content-length", str(LIMIT + 1024 * 1024).encode()),
+        ],
+    }
+    asyncio.run(UploadSizeLimitMiddleware(app)(scope, receive, send))
+
+    assert sent[0]["status"] == 413
+    assert received == []
+
+
+def test_stream_over_limit_is_cut_off(client, admin_headers, small_limit):
+    def body():
+        yield b"--limit\r\nContent-Disposition: form-data; name=\"file\"; filename=\"a.csv\"\r\n\r\n"
+        for _ in range(200):
+            yield b"x" * 1024
+
+    headers = {**admin_headers, "Content-Type": "multipart/form-data; boundary=limit"}
+    response = client.post(IMPORT, content=body(), headers=headers)
+
+    assert response.status_code == 413
+
+
+def test_file_over_limit_is_refused(client, admin_headers, small_limit):
+    response = client.post(
+        IMPORT, files={"file": ("assets.csv", b"x" * (LIMIT + 1))}, headers=admin_headers
+    )
+
+    assert response.status_code == 413
@@ -0,0 +1,126 @@
+"""
+Inventory to Asset Reconciliation
+
+Placeholder and shared serial numbers must not merge machines into one
+asset, nor create several assets with the same serial.
+"""
+
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import delete
+from sqlmodel import Session, select
+
+from app.core.database import engine
+from app.models.agent import Agent
+from app.models.asset import Asset, AssetType
+from app.models.inventory import AgentHardware
+from app.services.asset_reconciliation import (
+    _reconcile_batch,
+    get_system_user_id,
+    normalize_serial,
+)
+
+
+@pytest.mark.parametrize("serial", [
+    None, "", "   ", "0", "00000000", "To Be Filled By O.E.M.", "Default string", "System Serial Number",
+])
+def test_placeholder_serials_are_ignored(serial):
+    assert normalize_serial(serial) is None
+
+
+def test_real_serials_are_kept():
+    assert normalize_serial(" 5CG1234XYZ ") == "5CG1234XYZ"
+
+
+@pytest.fixture
+def seeded(client):
+    """Helpers to seed agents and assets and to reconcile the seeded agents as one batch."""
+    suffix = uuid4().hex[:8]
+    agent_ids = []
+    asset_ids = []
+
+    with Session(engine) as session:
+        def make(name: str, serial: str) -> int:
+            agent = Agent(
+                name=name,
+                hostname=f"{name}-{suffix}",
+                os_type="linux",
+                inventory_data={},
+            )
+            session.add(agent)
+            session.flush()
+            session.add(AgentHardware(
+                agent_id=agent.id, component="system", attribute="serial_number", value=serial
+            ))
+            session.commit()
+            agent_ids.append(agent.id)
+            return agent.id
+
+        def existing_asset(serial: str) -> int:
+            asset = Asset(
+                name=f"existing-{suffix}",
+                asset_type=AssetType.COMPUTER,
+                serial_number=serial,
+                created_by_id=get_system_user_id(session),
+            )
+            session.add(asset)
+            session.commit()
+            asset_ids.append(asset.id)
+            return asset.id
+
+        def run():
+            agents = session.exec(
+                select(Agent.id, Agent.hostname, Agent.site_id, Agent.asset_id)
+                .where(Agent.id.in_(agent_ids))
+                .order_by(Agent.id)
+            ).all()
+            _reconcile_batch(session, agents, get_system_user_id(session))
+            links = dict(session.exec(
+                select(Agent.id, Agent.asset_id).where(Agent.id.in_(agent_ids))
+            ).all())
+            asset_ids.extend(asset_id for asset_id in links.values() if asset_id)
+            return links
+
+        yield session, make, existing_asset, run, suffix
+
+        session.execute(delete(AgentHardware).where(AgentHardware.agent_id.in_(agent_ids)))
+        session.execute(delete(Agent).where(Agent.id.in_(agent_ids)))
+        session.execute(delete(Asset).where(Asset.id.in_(asset_ids)))
+        session.commit()
+
+
+def test_placeholder_serial_does_not_merge_agents(seeded):
+    session, make, existing_asset, run, _ = seeded
+    placeholder = existing_asset("To Be Filled By O.E.M.")
+    first = make("oem-a", "To Be Filled By O.E.M.")
+    second = make("oem-b", "To Be Filled By O.E.M.")
+
+    links = run()
+
+    assert placeholder not in links.values()
+    assert links[first] != links[second]
+    serials = session.exec(select(Asset.serial_number).where(Asset.id.in_(links.values()))).all()
+    assert serials == [None, None]
+
+
+def test_serial_shared_within_batch_is_not_matched_or_duplicated(seeded):
+    session, make, existing_asset, run, suffix = seeded
+    shared = f"VM-{suffix}"
+    existing = existing_asset(shared)
+    first = make("clone-a", shared)
+    second = make("clone-b", shared)
+
+    links = run()
+
+    assert existing not in links.values()
+    assert links[first] != links[second]
+    assert session.exec(select(Asset.id).where(Asset.serial_number == shared)).all() == [existing]
+
+
+def test_unique_serial_still_matches(seeded):
+    _, make, existing_asset, run, suffix = seeded
+    existing = existing_asset(f"SN-{suffix}")
+    agent_id = make("unique", f"SN-{suffix}")
+
+    assert run()[agent_id] == existing
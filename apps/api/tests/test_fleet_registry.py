@@ -0,0 +1,47 @@
+"""
+Fleet Registry Memory Footprint
+"""
+
+import gc
+import tracemalloc
+
+from app.models.agent import AgentStatus
+from app.services.fleet_registry import FleetRegistry
+
+AGENTS = 100_000
+# Column storage per agent beyond its hostname bytes: hash, slot, name
+# offset, id, status, OS type and site (35 bytes) plus array over-allocation
+MAX_BYTES_PER_AGENT_OVERHEAD = 48
+
+
+def _hostname(i: int) -> str:
+    return f"ws-{i:06d}.branch-{i % 50:02d}.corp.example.com"
+
+
+def _rows():
+    for i in range(1, AGENTS + 1):
+        yield i, _hostname(i), AgentStatus.ONLINE, ("linux", "windows", "macos")[i % 3], i % 50 or None
+
+
+def test_memory_per_agent_within_budget():
+    rows = list(_rows())
+    hostname_bytes = sum(len(row[1]) for row in rows)
+
+    gc.collect()
+    tracemalloc.start()
+    try:
+        registry = FleetRegistry()
+        registry.rebuild(rows)
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    overhead = (retained - hostname_bytes) / AGENTS
+    assert overhead <= MAX_BYTES_PER_AGENT_OVERHEAD, f"{overhead:.1f} bytes per agent"
+    assert retained < 8 * 1024 * 1024
+    assert registry.nbytes() <= retained
+
+    entry = registry.get(_hostname(4242))
+    assert entry.agent_id == 4242 and entry.site_id == 42 and entry.os_type == "linux"
+    assert registry.get("unknown.corp.example.com") is None
@@ -0,0 +1,58 @@
+"""
+Inventory History
+
+Concurrent submissions for one agent get consecutive version numbers.
+"""
+
+import threading
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import delete
+from sqlmodel import Session, select
+
+from app.core.database import engine
+from app.models.agent import Agent
+from app.models.inventory import InventoryVersion, InventoryVersionSection
+from app.services.inventory_history import record_inventory_version
+
+
+@pytest.fixture
+def agent_id(client):
+    with Session(engine) as session:
+        agent = Agent(name="inventory history test", hostname=f"history-{uuid4().hex[:8]}", os_type="linux")
+        session.add(agent)
+        session.commit()
+        agent_id = agent.id
+    yield agent_id
+    with Session(engine) as session:
+        version_ids = select(InventoryVersion.id).where(InventoryVersion.agent_id == agent_id)
+        session.execute(delete(InventoryVersionSection).where(InventoryVersionSection.version_id.in_(version_ids)))
+        session.execute(delete(InventoryVersion).where(InventoryVersion.agent_id == agent_id))
+        session.execute(delete(Agent).where(Agent.id == agent_id))
+        session.commit()
+
+
+def test_concurrent_submissions_get_consecutive_versions(agent_id):
+    first = Session(engine)
+    record_inventory_version(first, agent_id, {"os": {"name": "first"}})
+
+    # Started while the first submission is still uncommitted
+    second_result = []
+    second = threading.Thread(target=lambda: second_result.append(_record(agent_id, {"os": {"name": "second"}})))
+    second.start()
+    second.join(0.5)
+    assert second.is_alive()  # waiting for the first submission's lock
+
+    first.commit()
+    first.close()
+    second.join(5)
+
+    assert second_result == [2]
+
+
+def _record(agent_id: int, inventory) -> int:
+    with Session(engine) as session:
+        version = record_inventory_version(session, agent_id, inventory).version
+        session.commit()
+    return version
@@ -0,0 +1,119 @@
+"""
+Software License Compliance
+
+Builds the report over a small seeded site: two active licenses, one
+retired license, and three agents of which one has two versions installed.
+"""
+
+import asyncio
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import delete
+from sqlmodel import Session, select
+
+from app.core.database import engine
+from app.models.agent import Agent
+from app.models.asset import Asset, AssetStatus, AssetType
+from app.models.inventory import AgentSoftware
+from app.models.site import Site
+from app.services import license_compliance
+from app.services.asset_reconciliation import get_system_user_id
+from app.services.license_compliance import build_compliance_report, get_compliance_report
+
+
+@pytest.fixture
+def seeded(client):
+    """Yields ``(site_id, product)`` of the seeded site."""
+    suffix = uuid4().hex[:8]
+    product = f"pytest office {suffix}"
+    with Session(engine) as session:
+        site = Site(name=f"license compliance {suffix}")
+        session.add(site)
+        session.flush()
+        owner_id = get_system_user_id(session)
+        for status in (AssetStatus.ACTIVE, AssetStatus.ACTIVE, AssetStatus.RETIRED):
+            session.add(Asset(
+                name=f"  Pytest   Office {suffix}",
+                asset_type=AssetType.SOFTWARE,
+                status=status,
+                site_id=site.id,
+                created_by_id=owner_id,
+            ))
+        installs = {"a": ["1.0", "2.0"], "b": ["1.0"], "c": ["2.0"]}
+        for name, versions in installs.items():
+            agent = Agent(name=name, hostname=f"license-{name}-{suffix}", os_type="linux", site_id=site.id)
+            session.add(agent)
+            session.flush()
+            for version in versions:
+                session.add(AgentSoftware(agent_id=agent.id, name=product, version=version))
+        session.commit()
+        site_id = site.id
+
+    yield site_id, product
+
+    with Session(engine) as session:
+        agent_ids = session.exec(select(Agent.id).where(Agent.site_id == site_id)).all()
+        session.execute(delete(AgentSoftware).where(AgentSoftware.agent_id.in_(agent_ids)))
+        session.execute(delete(Agent).where(Agent.id.in_(agent_ids)))
+        session.execute(delete(Asset).where(Asset.site_id == site_id))
+        session.execute(delete(Site).where(Site.id == site_id))
+        session.commit()
+
+
+@pytest.fixture
+def empty_cache(monkeypatch):
+    monkeypatch.setattr(license_compliance, "_cache", {"fingerprint": None, "built_at": 0.0, "report": None})
+    monkeypatch.setattr(license_compliance, "_rebuild", None)
+
+
+def _item(report, site_id):
+    return next(item for item in report["items"] if item["site_id"] == site_id)
+
+
+def test_report_counts_each_agent_once_per_product(seeded):
+    site_id, product = seeded
+    with Session(engine) as session:
+        item = _item(build_compliance_report(session), site_id)
+
+    assert item == {
+        "site_id": site_id,
+        "product": product,
+        "licensed": 2,
+        "installed": 3,
+        "shortfall": 1,
+        "compliant": False,
+        "versions": {"1.0": 2, "2.0": 2},
+    }
+
+
+def test_report_is_cached_until_licenses_change(seeded, empty_cache):
+    site_id, product = seeded
+
+    async def scenario():
+        with Session(engine) as session:
+            first = await get_compliance_report(session)
+            second = await get_compliance_report(session)
+
+            session.add(Asset(
+                name=product,
+                asset_type=AssetType.SOFTWARE,
+                site_id=site_id,
+                created_by_id=get_system_user_id(session),
+            ))
+            session.commit()
+
+            stale = await get_compliance_report(session)
+            await license_compliance._rebuild
+            rebuilt = await get_compliance_report(session)
+        return first, second, stale, rebuilt
+
+    first, second, stale, rebuilt = asyncio.run(scenario())
+
+    assert first["cached"] is False
+    assert second["cached"] is True
+    assert second["generated_at"] == first["generated_at"]
+    # A license was added: served stale while the rebuild runs, then rebuilt
+    assert _item(stale, site_id)["licensed"] == 2
+    assert _item(rebuilt, site_id)["licensed"] == 3
+    assert _item(rebuilt, site_id)["compliant"] is True
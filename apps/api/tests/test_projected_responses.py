@@ -0,0 +1,47 @@
+"""
+Projected List Responses
+
+Golden check: ``projected_response`` must render the same bytes as
+FastAPI's ``response_model`` path for every list endpoint's model, both for
+synthetic edge-case rows and for rows read from the database.
+"""
+
+import asyncio
+from typing import List
+
+import pytest
+from fastapi.responses import JSONResponse
+from fastapi.routing import serialize_response
+from fastapi.utils import create_response_field
+
+from app.core.responses import projected_response
+from benchmarks.serialization import database_rows, synthetic_rows
+
+SYNTHETIC = synthetic_rows(100)
+MODELS = list(SYNTHETIC)
+
+
+def _fastapi_body(model, rows) -> bytes:
+    field = create_response_field(name="response", type_=List[model])
+
+    async def render():
+        return JSONResponse(await serialize_response(field=field, response_content=rows)).body
+
+    return asyncio.run(render())
+
+
+@pytest.fixture(scope="module")
+def stored(client):
+    return database_rows(100)
+
+
+@pytest.mark.parametrize("model", MODELS, ids=lambda model: model.__name__)
+def test_synthetic_rows_render_identically(model):
+    rows = SYNTHETIC[model]
+    assert projected_response(model, rows).body == _fastapi_body(model, rows)
+
+
+@pytest.mark.parametrize("model", MODELS, ids=lambda model: model.__name__)
+def test_database_rows_render_identically(stored, model):
+    rows = stored[model]
+    assert projected_response(model, rows).body == _fastapi_body(model, rows)
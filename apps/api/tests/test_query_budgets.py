@@ -0,0 +1,30 @@
+"""
+Query Budgets
+
+Statements each hot read endpoint may issue: one for authentication, then
+the endpoint's own queries. List pages cost the same whatever their size.
+"""
+
+import pytest
+
+
+@pytest.mark.parametrize(
+    "path, budget",
+    [
+        ("/api/v1/assets?limit=100", 3),  # user, page ETag, page
+        ("/api/v1/tickets?limit=100", 3),
+        ("/api/v1/sites", 3),
+        ("/api/v1/agents?limit=100", 2),  # user, page
+        ("/api/v1/agents/summary", 2),  # user, counters
+    ],
+)
+def test_read_endpoint_query_budget(client, admin_headers, query_budget, path, budget):
+    with query_budget(budget):
+        response = client.get(path, headers=admin_headers)
+    assert response.status_code == 200
+
+
+def test_query_budget_reports_overrun(client, admin_headers, query_budget):
+    with pytest.raises(AssertionError, match="3 queries issued, budget is 1"):
+        with query_budget(1):
+            client.get("/api/v1/assets?limit=100", headers=admin_headers)
@@ -0,0 +1,91 @@
+"""
+Response Cache
+
+Runs the site list against a fresh in-process cache (the suite disables the
+cache by default).
+"""
+
+import pytest
+from prometheus_client import REGISTRY
+from sqlmodel import Session, select
+
+from app.core import response_cache
+from app.core.config import settings
+from app.core.database import engine
+from app.core.response_cache import LocalCacheBackend, invalidate_after_commit, set_backend
+
+SITES = "/api/v1/sites"
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    backend = LocalCacheBackend(max_entries=100)
+    monkeypatch.setattr(settings, "RESPONSE_CACHE_ENABLED", True)
+    set_backend(backend)
+    yield backend
+    set_backend(None)
+
+
+def _lookups(result: str) -> float:
+    return REGISTRY.get_sample_value(
+        "response_cache_lookups_total", {"route": SITES, "result": result}
+    ) or 0.0
+
+
+@pytest.fixture
+def lookups():
+    """Hits and misses counted since the test started."""
+    before = {result: _lookups(result) for result in ("hit", "miss")}
+    return lambda: {result: _lookups(result) - count for result, count in before.items()}
+
+
+def test_second_read_is_a_hit(client, admin_headers, cache, lookups):
+    first = client.get(SITES, headers=admin_headers)
+    second = client.get(SITES, headers=admin_headers)
+
+    assert first.status_code == second.status_code == 200
+    assert second.content == first.content
+    assert second.headers["etag"] == first.headers["etag"]
+    assert lookups() == {"hit": 1, "miss": 1}
+
+
+def test_roles_do_not_share_entries(client, admin_headers, viewer_headers, cache, lookups):
+    client.get(SITES, headers=admin_headers)
+    client.get(SITES, headers=viewer_headers)
+    assert lookups() == {"hit": 0, "miss": 2}
+
+    client.get(SITES, headers=viewer_headers)
+    assert lookups() == {"hit": 1, "miss": 2}
+
+
+def test_write_invalidates_after_commit(client, admin_headers, cache, lookups):
+    client.get(SITES, headers=admin_headers)
+    site_id = client.post(SITES, json={"name": "response cache test"}, headers=admin_headers).json()["id"]
+    client.get(SITES, headers=admin_headers)
+    client.delete(f"{SITES}/{site_id}", headers=admin_headers)
+
+    assert lookups() == {"hit": 0, "miss": 2}
+    assert cache.versions(["sites"]) == [2]  # create and delete
+
+
+def test_commit_bumps_tag_version(cache):
+    with Session(engine) as session:
+        session.exec(select(1))
+        invalidate_after_commit(session, "sites")
+        assert cache.versions(["sites"]) == [0]
+        session.commit()
+
+    assert cache.versions(["sites"]) == [1]
+
+
+def test_rollback_does_not_invalidate(cache):
+    with Session(engine) as session:
+        session.exec(select(1))
+        invalidate_after_commit(session, "sites")
+        session.rollback()
+        assert response_cache._PENDING_TAGS not in session.info
+
+        session.exec(select(1))
+        session.commit()
+
+    assert cache.versions(["sites"]) == [0]
@@ -0,0 +1,113 @@
+"""
+Request Coalescing
+
+Concurrent identical list requests share one page query; requests in
+another permission scope or for another page version do not.
+"""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+from fastapi import Request
+from prometheus_client import REGISTRY
+from sqlmodel import Session, select
+
+from app.api.v1 import tickets
+from app.core.database import engine
+from app.core.singleflight import coalesce
+from app.models.user import User
+from main import app
+
+TICKETS = "/api/v1/tickets"
+N = 8
+
+
+def _requests(result: str) -> float:
+    return REGISTRY.get_sample_value(
+        "singleflight_requests_total", {"route": TICKETS, "result": result}
+    ) or 0.0
+
+
+@pytest.fixture
+def ticket(client, admin_headers):
+    ticket_id = client.post(
+        TICKETS,
+        json={"title": "singleflight test", "description": "coalesced page"},
+        headers=admin_headers,
+    ).json()["id"]
+    yield ticket_id
+    client.delete(f"{TICKETS}/{ticket_id}", headers=admin_headers)
+
+
+@pytest.fixture
+def held_loads(monkeypatch):
+    """Keep page loads in flight until all ``N`` requests have reached ``coalesce``."""
+    arrived = _requests("executed") + _requests("coalesced")
+    render = tickets.projected_json
+
+    def held(*args):
+        deadline = time.monotonic() + 5
+        while _requests("executed") + _requests("coalesced") - arrived < N and time.monotonic() < deadline:
+            time.sleep(0.01)
+        return render(*args)
+
+    monkeypatch.setattr(tickets, "projected_json", held)
+
+
+def _page_queries(stats) -> int:
+    return sum(n for shape, n in stats.shapes.items() if "LIMIT" in shape and "ticket.title" in shape)
+
+
+def _get_concurrently(headers):
+    async def run():
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://localhost") as http:
+            return await asyncio.gather(*(http.get(TICKETS, headers=h) for h in headers))
+    return asyncio.run(run())
+
+
+def test_identical_requests_share_one_query(ticket, admin_headers, held_loads, query_budget):
+    coalesced = _requests("coalesced")
+
+    with query_budget(2 * N + 1) as stats:  # user and page ETag per request, one page query
+        responses = _get_concurrently([admin_headers] * N)
+
+    assert all(response.status_code == 200 for response in responses)
+    assert len({response.content for response in responses}) == 1
+    assert ticket in [item["id"] for item in responses[0].json()]
+    assert _page_queries(stats) == 1
+    assert _requests("coalesced") - coalesced == N - 1
+
+
+def test_roles_do_not_share_a_flight(ticket, admin_headers, viewer_headers, held_loads, query_budget):
+    with query_budget(2 * N + 2) as stats:
+        _get_concurrently([admin_headers, viewer_headers] * (N // 2))
+
+    assert _page_queries(stats) == 2
+
+
+def test_page_versions_do_not_share_a_flight(ticket, admin_headers, held_loads, monkeypatch, query_budget):
+    page_etag = tickets.page_etag
+    calls = []
+
+    def alternating_etag(*args):
+        calls.append(None)
+        return f'{page_etag(*args)[:-1]}-{len(calls) % 2}"'
+
+    monkeypatch.setattr(tickets, "page_etag", alternating_etag)
+    with query_budget(2 * N + 2) as stats:
+        _get_concurrently([admin_headers] * N)
+
+    assert _page_queries(stats) == 2
+
+
+def test_caller_objects_stay_loaded(client, admin_headers, query_budget):
+    request = Request({"type": "http", "method": "GET", "path": TICKETS, "query_string": b"", "headers": []})
+    with Session(engine) as session:
+        user = session.exec(select(User)).first()
+        asyncio.run(coalesce(request, session, None, lambda flight_session: None))
+
+        with query_budget(0):
+            assert user.email
@@ -0,0 +1,67 @@
+"""
+Request-Scoped Unit of Work
+
+A write commits once, with its audit row, and is answered without reading
+the entity back.
+"""
+
+import pytest
+from sqlalchemy import event
+
+from app.core.database import engine
+
+
+@pytest.fixture
+def commits():
+    """Commits issued on the engine while the test runs."""
+    issued = []
+
+    def record(conn):
+        issued.append(conn)
+
+    event.listen(engine, "commit", record)
+    yield issued
+    event.remove(engine, "commit", record)
+
+
+def _reads_after_write(stats, verb: str):
+    shapes = list(stats.shapes)
+    write = next(i for i, shape in enumerate(shapes) if shape.startswith(verb))
+    return [shape for shape in shapes[write + 1:] if shape.startswith("SELECT")]
+
+
+def test_create_commits_once_without_refresh(client, admin_headers, query_budget, commits):
+    with query_budget(3) as stats:  # user, asset insert, audit insert
+        response = client.post(
+            "/api/v1/assets",
+            json={"name": "unit of work create", "asset_type": "computer"},
+            headers=admin_headers,
+        )
+    assert response.status_code == 200, response.text
+    assert response.json()["id"]
+    assert len(commits) == 1
+    assert _reads_after_write(stats, "INSERT INTO asset") == []
+
+    client.delete(f"/api/v1/assets/{response.json()['id']}", headers=admin_headers)
+
+
+def test_update_commits_once_without_refresh(client, admin_headers, query_budget, commits):
+    asset_id = client.post(
+        "/api/v1/assets",
+        json={"name": "unit of work update", "asset_type": "computer"},
+        headers=admin_headers,
+    ).json()["id"]
+    commits.clear()
+
+    with query_budget(4) as stats:  # user, asset load, update, audit insert
+        response = client.put(
+            f"/api/v1/assets/{asset_id}",
+            json={"name": "unit of work updated"},
+            headers=admin_headers,
+        )
+    assert response.status_code == 200, response.text
+    assert response.json()["name"] == "unit of work updated"
+    assert len(commits) == 1
+    assert _reads_after_write(stats, "UPDATE asset") == []
+
+    client.delete(f"/api/v1/assets/{asset_id}", headers=admin_headers)